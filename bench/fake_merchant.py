@@ -0,0 +1,393 @@
+"""Local stand-in for the Merchant API: gRPC services plus a REST endpoint.
+
+Every unary RPC of every client in tools._common._CLIENT_SPECS is served.
+The method table is read from the generated grpc_asyncio transports, so new
+client methods are picked up automatically. Products, reports, account issues
+and shipping settings return realistic data:
+
+  * ProductsService.ListProducts / GetProduct — a synthetic catalog
+  * ReportService.Search — one product_performance_view row per (day, offer)
+  * AccountIssueService.ListAccountIssues (0-5 issues, varying by account),
+    ShippingSettingsService
+  * IssueResolutionService.RenderProductIssues — one rendered issue per
+    item-level issue of the catalog product
+  * AccountsService.ListSubAccounts — --sub-accounts synthetic sub-accounts
+
+Other RPCs echo the resource in the request, or return an empty response.
+The REST side answers the collections, recommendations and return-policy
+paths used by rest_request.
+
+Usage:
+    python bench/fake_merchant.py [--catalog-size 2000] [--max-page-size 250]
+        [--latency-ms 5] [--jitter-ms 0] [--report-offers 200] [--quota-qps 0]
+        [--sub-accounts 300]
+        [--tls-cert cert.pem --tls-key key.pem]
+
+Prints one JSON line {"grpcPort": ..., "httpPort": ..., "tls": ...} once
+both servers listen, then serves until terminated. With --quota-qps, calls
+above that rate get RESOURCE_EXHAUSTED (gRPC) or 429 + Retry-After (REST).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import importlib
+import json
+import os
+import random
+import re
+import ssl
+import sys
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GMC_MERCHANT_ID", "0")
+
+import grpc  # noqa: E402
+
+_TRANSPORT_ATTRS = {"grpc_channel", "host", "kind", "operations_client"}
+_DATE_RANGE_RE = re.compile(r"BETWEEN\s+'([\d-]+)'\s+AND\s+'([\d-]+)'", re.IGNORECASE)
+
+
+def rpc_table() -> Dict[str, Tuple[Any, Any]]:
+    """gRPC method path -> (request, response) protobuf classes for all client stubs."""
+    from tools._common import _CLIENT_SPECS
+
+    channel = grpc.aio.insecure_channel("localhost:1")  # never connected
+    table: Dict[str, Tuple[Any, Any]] = {}
+    for module_name, class_name in _CLIENT_SPECS.values():
+        client_cls = getattr(importlib.import_module(module_name), class_name)
+        transport_cls = client_cls.get_transport_class("grpc_asyncio")
+        transport = transport_cls(channel=channel)
+        for name in dir(transport_cls):
+            if name.startswith("_") or name in _TRANSPORT_ATTRS:
+                continue
+            if not isinstance(getattr(transport_cls, name), property):
+                continue
+            stub = getattr(transport, name)
+            if not isinstance(stub, grpc.aio.UnaryUnaryMultiCallable):
+                continue
+            request_cls = _pb_class(getattr(stub._request_serializer, "__self__", None))
+            response_cls = _pb_class(getattr(stub._response_deserializer, "__self__", None))
+            if request_cls is not None and response_cls is not None:
+                table[stub._method.decode()] = (request_cls, response_cls)
+    return table
+
+
+def _pb_class(cls: Any) -> Any:
+    """Raw protobuf class for a proto-plus message class or a plain one (Empty)."""
+    if hasattr(cls, "pb"):
+        return cls.pb()
+    return cls if hasattr(cls, "DESCRIPTOR") else None
+
+
+class Quota:
+    """Server-side token bucket; calls beyond *qps* are rejected."""
+
+    def __init__(self, qps: float):
+        self.qps = qps
+        self.tokens = qps
+        self.updated = time.monotonic()
+        self.admitted = 0
+        self.rejected = 0
+
+    def admit(self) -> bool:
+        if self.qps <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.qps, self.tokens + (now - self.updated) * self.qps)
+        self.updated = now
+        if self.tokens < 1:
+            self.rejected += 1
+            return False
+        self.tokens -= 1
+        self.admitted += 1
+        return True
+
+
+class FakeMerchant:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.quota = Quota(args.quota_qps)
+        self.products = [self._product(i) for i in range(args.catalog_size)]
+        self.by_name = {p.name: p for p in self.products}
+        self._report_rows: Dict[Tuple[str, str], list] = {}
+        self.handlers: Dict[str, Callable[[Any], Any]] = {
+            "/google.shopping.merchant.products.v1.ProductsService/ListProducts": self.list_products,
+            "/google.shopping.merchant.products.v1.ProductsService/GetProduct": self.get_product,
+            "/google.shopping.merchant.reports.v1beta.ReportService/Search": self.search,
+            "/google.shopping.merchant.accounts.v1beta.AccountIssueService/ListAccountIssues": self.account_issues,
+            "/google.shopping.merchant.accounts.v1beta.ShippingSettingsService/GetShippingSettings": self.shipping,
+            "/google.shopping.merchant.accounts.v1beta.AccountsService/ListSubAccounts": self.sub_accounts,
+            "/google.shopping.merchant.issueresolution.v1beta.IssueResolutionService/RenderProductIssues":
+                self.product_issues,
+        }
+
+    # -- data ---------------------------------------------------------------
+
+    @staticmethod
+    def _product(i: int) -> Any:
+        from google.shopping import merchant_products_v1
+
+        product = merchant_products_v1.Product(
+            name=f"accounts/0/products/en~US~SKU{i}",
+            offer_id=f"SKU{i}",
+            content_language="en",
+            feed_label="US",
+            product_attributes={
+                "title": f"Product {i} — stainless steel kitchen item",
+                "description": "A realistic product description. " * 8,
+                "brand": f"Brand{i % 25}",
+                "link": f"https://shop.example.com/p/{i}",
+                "image_link": f"https://shop.example.com/i/{i}.jpg",
+                "additional_image_links": [f"https://shop.example.com/i/{i}-{k}.jpg" for k in range(3)],
+                "availability": "IN_STOCK" if i % 5 else "OUT_OF_STOCK",
+                "price": {"amount_micros": 9_990_000 + 10_000 * (i % 500), "currency_code": "USD"},
+                "gtins": [f"{4006381333931 + i}"],
+                "product_types": ["Home > Kitchen > Cookware"],
+            },
+            product_status={
+                "destination_statuses": [
+                    {"reporting_context": "SHOPPING_ADS", "approved_countries": ["US"],
+                     "disapproved_countries": ["CA"] if i % 7 == 0 else []},
+                    {"reporting_context": "FREE_LISTINGS", "approved_countries": ["US", "CA"]},
+                ],
+                "item_level_issues": [
+                    {"code": "missing_gtin" if i % 2 else "image_too_small", "severity": "DEMOTED",
+                     "reporting_context": "SHOPPING_ADS", "applicable_countries": ["CA"],
+                     "description": "Issue description"}
+                ] if i % 7 == 0 else [],
+            },
+        )
+        return type(product).pb(product)
+
+    def _rows(self, lo: str, hi: str) -> list:
+        key = (lo, hi)
+        if key not in self._report_rows:
+            from google.shopping import merchant_reports_v1beta
+
+            row_pb = merchant_reports_v1beta.ReportRow.pb()
+            start, end = datetime.date.fromisoformat(lo), datetime.date.fromisoformat(hi)
+            rows = []
+            day = start
+            while day <= end:
+                for o in range(self.args.report_offers):
+                    row = row_pb()
+                    view = row.product_performance_view
+                    view.date.year, view.date.month, view.date.day = day.year, day.month, day.day
+                    view.offer_id = f"SKU{o}"
+                    view.brand = f"Brand{o % 25}"
+                    view.marketing_method = 1 + o % 2
+                    view.clicks = (o * 7 + day.toordinal()) % 40
+                    view.impressions = 500 + (o * 13 + day.toordinal()) % 2000
+                    view.click_through_rate = view.clicks / view.impressions
+                    view.conversion_value.amount_micros = 1_000_000 * (o % 17)
+                    view.conversion_value.currency_code = "USD"
+                    rows.append(row)
+                day += datetime.timedelta(days=1)
+            if len(self._report_rows) > 64:
+                self._report_rows.clear()
+            self._report_rows[key] = rows
+        return self._report_rows[key]
+
+    # -- handlers -----------------------------------------------------------
+
+    def _page(self, items: list, request: Any) -> Tuple[list, str]:
+        size = min(request.page_size or 25, self.args.max_page_size)
+        start = int(request.page_token or 0)
+        end = start + size
+        return items[start:end], str(end) if end < len(items) else ""
+
+    def list_products(self, request: Any, response_cls: Any) -> Any:
+        page, token = self._page(self.products, request)
+        return response_cls(products=page, next_page_token=token)
+
+    def get_product(self, request: Any, response_cls: Any) -> Any:
+        product = self.by_name.get(request.name)
+        if product is None:
+            product = response_cls(name=request.name, offer_id=request.name.rsplit("~", 1)[-1])
+        return product
+
+    def search(self, request: Any, response_cls: Any) -> Any:
+        match = _DATE_RANGE_RE.search(request.query)
+        lo, hi = match.groups() if match else ("2026-01-01", "2026-01-30")
+        page, token = self._page(self._rows(lo, hi), request)
+        return response_cls(results=page, next_page_token=token)
+
+    def account_issues(self, request: Any, response_cls: Any) -> Any:
+        account = request.parent.rsplit("/", 1)[-1]
+        count = int(account) % 6 if account.isdigit() and int(account) % 6 else 5
+        issues = [
+            {"name": f"{request.parent}/issues/{k}", "title": f"Account issue {k}", "severity": 1 + k % 3,
+             "documentation_uri": "https://support.google.com/merchants"}
+            for k in range(count)
+        ]
+        from google.protobuf import json_format
+        return json_format.ParseDict({"accountIssues": [
+            {"name": i["name"], "title": i["title"], "severity": i["severity"],
+             "documentationUri": i["documentation_uri"]} for i in issues
+        ]}, response_cls())
+
+    def product_issues(self, request: Any, response_cls: Any) -> Any:
+        product = self.by_name.get(request.name)
+        issues = product.product_status.item_level_issues if product is not None else []
+        return response_cls(rendered_issues=[
+            {
+                "title": issue.code.replace("_", " ").capitalize().replace("gtin", "GTIN"),
+                "prerendered_content": f"<p>{issue.description}</p>" * 4,
+                "impact": {
+                    "message": "Limited visibility",
+                    "severity": 2,
+                    "breakdowns": [{
+                        "regions": [{"code": c, "name": c} for c in issue.applicable_countries],
+                        "details": [issue.description],
+                    }],
+                },
+            }
+            for issue in issues
+        ])
+
+    def sub_accounts(self, request: Any, response_cls: Any) -> Any:
+        accounts = [
+            {"name": f"accounts/{1000 + k}", "account_id": 1000 + k, "account_name": f"Store {k}"}
+            for k in range(self.args.sub_accounts)
+        ]
+        page, token = self._page(accounts, request)
+        return response_cls(accounts=page, next_page_token=token)
+
+    def shipping(self, request: Any, response_cls: Any) -> Any:
+        from serialization import make_shipping_settings
+
+        settings = make_shipping_settings(0)
+        settings.name = request.name
+        return type(settings).pb(settings)
+
+    @staticmethod
+    def default(request: Any, response_cls: Any) -> Any:
+        """Echo the request's resource of the response type, or an empty response."""
+        for field in request.DESCRIPTOR.fields:
+            if field.message_type is response_cls.DESCRIPTOR and request.HasField(field.name):
+                response = response_cls()
+                response.CopyFrom(getattr(request, field.name))
+                return response
+        response = response_cls()
+        if "name" in response_cls.DESCRIPTOR.fields_by_name and "name" in request.DESCRIPTOR.fields_by_name:
+            response.name = request.name
+        return response
+
+    # -- servers ------------------------------------------------------------
+
+    async def _delay(self) -> None:
+        latency = self.args.latency_ms + random.uniform(0, self.args.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    def grpc_handlers(self) -> list:
+        services: Dict[str, Dict[str, Any]] = {}
+        for path, (request_cls, response_cls) in rpc_table().items():
+            service, method = path.lstrip("/").rsplit("/", 1)
+            handler = self.handlers.get(path, self.default)
+
+            async def call(request: Any, context: Any, handler=handler, response_cls=response_cls) -> Any:
+                if not self.quota.admit():
+                    await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "Quota exceeded (fake)")
+                await self._delay()
+                return handler(request, response_cls)
+
+            services.setdefault(service, {})[method] = grpc.unary_unary_rpc_method_handler(
+                call,
+                request_deserializer=request_cls.FromString,
+                response_serializer=response_cls.SerializeToString,
+            )
+        return [grpc.method_handlers_generic_handler(s, m) for s, m in services.items()]
+
+    def rest_response(self, method: str, path: str, body: Optional[dict]) -> Tuple[int, dict]:
+        path = path.split("?", 1)[0].strip("/")
+        if path.endswith(":generate"):
+            return 200, {"recommendations": [
+                {"type": t, "title": f"Improve {t.lower()}", "impact": "HIGH"}
+                for t in ("TITLE", "GTIN", "PRICE", "IMAGE")
+            ]}
+        if method == "POST":
+            return 200, {"name": f"{path}/{random.randrange(10**9)}", **(body or {})}
+        if method == "DELETE":
+            return 200, {}
+        if path.endswith("/collections"):
+            return 200, {"collections": [
+                {"name": f"{path}/c{k}", "headline": [f"Collection {k}"], "link": f"https://shop.example.com/c/{k}"}
+                for k in range(10)
+            ]}
+        return 200, {"name": path}
+
+    async def serve_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                raw = await reader.readexactly(length) if length else b""
+                if not self.quota.admit():
+                    status, payload, extra = 429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}, "Retry-After: 1\r\n"
+                else:
+                    await self._delay()
+                    status, payload = self.rest_response(method, target, json.loads(raw) if raw else None)
+                    extra = ""
+                data = json.dumps(payload).encode()
+                head = (
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Too Many Requests'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n{extra}\r\n"
+                ).encode()
+                writer.write(head + data)  # one send: no delayed-ACK stall on small responses
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grpc-port", type=int, default=0)
+    parser.add_argument("--http-port", type=int, default=0)
+    parser.add_argument("--catalog-size", type=int, default=2000)
+    parser.add_argument("--max-page-size", type=int, default=250)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--report-offers", type=int, default=200)
+    parser.add_argument("--quota-qps", type=float, default=0.0)
+    parser.add_argument("--sub-accounts", type=int, default=300)
+    parser.add_argument("--tls-cert")
+    parser.add_argument("--tls-key")
+    args = parser.parse_args()
+
+    fake = FakeMerchant(args)
+    server = grpc.aio.server()
+    server.add_generic_rpc_handlers(fake.grpc_handlers())
+    grpc_port = server.add_insecure_port(f"127.0.0.1:{args.grpc_port}")
+    await server.start()
+
+    ssl_context = None
+    if args.tls_cert:
+        ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        ssl_context.load_cert_chain(args.tls_cert, args.tls_key)
+    http = await asyncio.start_server(fake.serve_http, "127.0.0.1", args.http_port, ssl=ssl_context)
+    http_port = http.sockets[0].getsockname()[1]
+    print(json.dumps({"grpcPort": grpc_port, "httpPort": http_port, "tls": bool(ssl_context)}), flush=True)
+    try:
+        await server.wait_for_termination()
+    finally:
+        http.close()
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+"""Benchmark: streaming feed readers in tools/feeds.py (TSV, CSV, RSS XML).
+
+Writes synthetic Google-format feeds with realistic rows (prices, several
+image links, shipping, GTINs, custom columns) to a temporary directory and
+times tools.feeds.iter_feed over each. Memory is checked separately with
+tracemalloc on a quarter of the rows and on all of them: a streaming reader
+has about the same peak for both.
+
+Usage:
+    python bench/feeds.py [--rows 20000]
+
+Prints one JSON document with rows per second, MB per second and the
+tracemalloc peaks per format.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from xml.sax.saxutils import escape
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+os.environ.setdefault("GMC_MERCHANT_ID", "0")
+
+COLUMNS = (
+    "id", "title", "description", "link", "image_link", "additional_image_link", "availability",
+    "price", "sale_price", "brand", "gtin", "condition", "product_type", "shipping",
+    "shipping_weight", "custom_label_0", "color",
+)
+
+
+def row(i: int) -> dict:
+    return {
+        "id": f"SKU{i}",
+        "title": f"Product {i} — stainless steel kitchen item",
+        "description": "A realistic product description, with commas. " * 6,
+        "link": f"https://shop.example.com/p/{i}",
+        "image_link": f"https://shop.example.com/i/{i}.jpg",
+        "additional_image_link": ",".join(f"https://shop.example.com/i/{i}-{k}.jpg" for k in range(3)),
+        "availability": "in stock" if i % 5 else "out of stock",
+        "price": f"{9.99 + i % 500:.2f} EUR",
+        "sale_price": f"{7.99 + i % 500:.2f} EUR" if i % 3 == 0 else "",
+        "brand": f"Brand{i % 25}",
+        "gtin": f"{4006381333931 + i}",
+        "condition": "new",
+        "product_type": "Home > Kitchen > Cookware",
+        "shipping": "DE::Standard:4.95 EUR",
+        "shipping_weight": "1.2 kg",
+        "custom_label_0": f"season-{i % 4}",
+        "color": "silver",
+    }
+
+
+def write_delimited(path: str, rows: int, delimiter: str) -> None:
+    import csv
+
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, delimiter=delimiter)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            r = row(i)
+            writer.writerow([r[c] for c in COLUMNS])
+
+
+def write_xml(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0"><channel>\n'
+                 "<title>Bench feed</title>\n")
+        for i in range(rows):
+            r = row(i)
+            fh.write("<item>")
+            for c in COLUMNS:
+                if not r[c]:
+                    continue
+                if c == "additional_image_link":
+                    fh.write("".join(f"<g:{c}>{escape(v)}</g:{c}>" for v in r[c].split(",")))
+                elif c == "shipping":
+                    country, _, service, price = r[c].split(":")
+                    fh.write(f"<g:shipping><g:country>{country}</g:country><g:service>{service}</g:service>"
+                             f"<g:price>{price}</g:price></g:shipping>")
+                else:
+                    fh.write(f"<g:{c}>{escape(r[c])}</g:{c}>")
+            fh.write("</item>\n")
+        fh.write("</channel></rss>\n")
+
+
+def consume(path: str, limit: int = 0) -> int:
+    from tools.feeds import iter_feed
+
+    n = 0
+    for _ in iter_feed(path, content_language="de", feed_label="DE"):
+        n += 1
+        if n == limit:
+            break
+    return n
+
+
+def peak_kb(path: str, limit: int = 0) -> float:
+    tracemalloc.start()
+    try:
+        consume(path, limit)
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def run(rows: int = 20000) -> dict:
+    """Write one feed per format, verify the mapping and time the readers."""
+    from tools.feeds import iter_feed
+
+    work = tempfile.mkdtemp(prefix="gmc-feeds-")
+    results = {}
+    try:
+        files = {"tsv": os.path.join(work, "feed.tsv"), "csv": os.path.join(work, "feed.csv"),
+                 "xml": os.path.join(work, "feed.xml")}
+        write_delimited(files["tsv"], rows, "\t")
+        write_delimited(files["csv"], rows, ",")
+        write_xml(files["xml"], rows)
+        reference = None
+        for kind, path in files.items():
+            first = next(iter_feed(path, content_language="de", feed_label="DE"))
+            if reference is None:
+                reference = first
+            elif first != reference:
+                raise SystemExit(f"{kind}: first record differs from the TSV mapping")
+            consume(path, 100)  # warm imports and enum tables
+            started = time.perf_counter()
+            n = consume(path)
+            elapsed = time.perf_counter() - started
+            if n != rows:
+                raise SystemExit(f"{kind}: read {n} of {rows} rows")
+            size_mb = os.path.getsize(path) / 1e6
+            results[kind] = {
+                "fileMb": round(size_mb, 1),
+                "rowsPerSecond": round(rows / elapsed),
+                "mbPerSecond": round(size_mb / elapsed, 1),
+                "peakKbQuarter": peak_kb(path, rows // 4),
+                "peakKbFull": peak_kb(path),
+            }
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return {"benchmark": "feeds", "rows": rows, "formats": results, "sample": reference}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
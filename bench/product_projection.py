@@ -0,0 +1,112 @@
+"""Microbenchmark: per-product conversion cost of field projection vs. full to_dict.
+
+Builds synthetic Products with a large attribute set (no network, no
+credentials) and times, per product:
+
+  * to_dict   — type(product).to_dict(product), what get_product returns
+  * summary   — the list_products projection (13 summary keys)
+  * fields    — a narrow projection, e.g. offerId + title + price
+
+Usage:
+    python bench/product_projection.py [--products 2000] [--fields offerId,title,price]
+
+Prints one JSON document with microseconds per product for each variant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GMC_MERCHANT_ID", "0")
+
+
+def make_product(i: int):
+    from google.shopping import merchant_products_v1
+
+    return merchant_products_v1.Product(
+        name=f"accounts/0/products/en~US~SKU{i}",
+        offer_id=f"SKU{i}",
+        content_language="en",
+        feed_label="US",
+        product_attributes={
+            "title": f"Product {i} " + "x" * 120,
+            "description": "lorem ipsum " * 200,
+            "brand": f"Brand{i % 20}",
+            "link": f"https://example.com/p/{i}",
+            "image_link": f"https://example.com/i/{i}.jpg",
+            "additional_image_links": [f"https://example.com/i/{i}-{k}.jpg" for k in range(10)],
+            "availability": "IN_STOCK",
+            "price": {"amount_micros": 19_990_000 + i, "currency_code": "USD"},
+            "gtins": [f"{4000000000000 + i + k}" for k in range(3)],
+            "product_types": [f"Home > Kitchen > Type {k}" for k in range(5)],
+            "product_highlights": [f"highlight {k}" for k in range(6)],
+            "product_details": [
+                {"section_name": "General", "attribute_name": f"attr{k}", "attribute_value": f"value{k}"}
+                for k in range(20)
+            ],
+            "shipping": [
+                {"country": c, "service": "Standard", "price": {"amount_micros": 4_990_000, "currency_code": "USD"}}
+                for c in ("US", "CA", "GB", "DE", "FR")
+            ],
+        },
+        product_status={
+            "destination_statuses": [
+                {"reporting_context": "SHOPPING_ADS", "approved_countries": ["US", "CA"], "disapproved_countries": ["GB"]},
+                {"reporting_context": "FREE_LISTINGS", "approved_countries": ["US", "CA", "GB"]},
+            ],
+            "item_level_issues": [
+                {"code": f"issue_{k}", "severity": "NOT_IMPACTED", "applicable_countries": ["US"],
+                 "description": "d" * 80, "detail": "e" * 120}
+                for k in range(5)
+            ],
+        },
+    )
+
+
+def per_product_us(fn, products, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for p in products:
+            fn(p)
+        best = min(best, time.perf_counter() - started)
+    return round(best / len(products) * 1e6, 2)
+
+
+def run(products: int = 2000, fields: str = "offerId,title,price", repeat: int = 3) -> dict:
+    """Time the three conversion paths; returns the result document."""
+    from tools.products import _product_summary, _projector
+
+    items = [make_product(i) for i in range(products)]
+    field_list = [f for f in fields.split(",") if f]
+    narrow = _projector(field_list)
+    results = {
+        "to_dict": per_product_us(lambda p: type(p).to_dict(p), items, repeat),
+        "summary": per_product_us(_product_summary, items, repeat),
+        "fields": per_product_us(narrow, items, repeat),
+    }
+    return {
+        "benchmark": "product_projection",
+        "products": products,
+        "fields": field_list,
+        "usPerProduct": results,
+        "speedupVsToDict": {k: round(results["to_dict"] / v, 1) for k, v in results.items() if v},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--fields", default="offerId,title,price")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.products, args.fields, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,595 @@
+"""Offline benchmark suite: every MCP tool against a local fake Merchant API.
+
+Starts bench/fake_merchant.py in a subprocess, points the server at it
+(GMC_API_ENDPOINT + GMC_API_INSECURE for gRPC, GMC_REST_BASE_URL for REST,
+temporary export / SQLite paths) and drives the registered tools through
+FastMCP's real dispatch over an in-memory client session. No Google
+credentials or network access are needed.
+
+Scenarios:
+  tools          per-tool p50/p99 latency, first-call latency, errors and
+                 upstream RPCs per call (from get_metrics)
+  concurrency    get_product serialized vs. concurrent (async clients)
+  sync           N concurrent get_product calls: the pre-async sync tool on a
+                 blocking ProductsServiceClient vs. the async tool
+  rest           pooled rest_request vs. a fresh urllib connection per call
+                 (over HTTPS when openssl is available)
+  throttle       bulk insert against a fake that enforces a qps quota
+  fanout         sweep_account_health over 300 sub-accounts, one at a
+                 time vs. 16 in flight
+  projection     bench/product_projection.py
+  feeds          bench/feeds.py (TSV / CSV / XML feed reader rows per second)
+  serialization  bench/serialization.py
+
+Usage:
+    python bench/run.py [--scenarios tools,concurrency,...] [--iterations 20]
+        [--latency-ms 5] [--catalog-size 2000] [--out results.json]
+        [--baseline previous.json] [--regression 1.25]
+
+Results (plus peak RSS and environment) are written as JSON, by default to
+bench/results/<timestamp>.json. With --baseline, per-tool p50 and scenario
+throughput are compared and the exit status is 1 when anything regressed
+by more than the --regression factor.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+ALL_SCENARIOS = (
+    "tools", "concurrency", "sync", "rest", "throttle", "fanout", "projection", "serialization", "feeds",
+)
+ACCOUNT = "accounts/0"
+
+
+# ---------------------------------------------------------------------------
+# Fake server and environment
+# ---------------------------------------------------------------------------
+
+@contextlib.contextmanager
+def fake_merchant(*args: str, tls: Optional[tuple] = None):
+    """Run fake_merchant.py; yields its {"grpcPort", "httpPort", "tls"} line."""
+    cmd = [sys.executable, os.path.join(HERE, "fake_merchant.py"), *args]
+    if tls:
+        cmd += ["--tls-cert", tls[0], "--tls-key", tls[1]]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    try:
+        line = proc.stdout.readline()
+        if not line:
+            raise SystemExit("fake_merchant.py exited before listening")
+        yield json.loads(line)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def self_signed_cert(directory: str) -> Optional[tuple]:
+    """(cert, key) for localhost via openssl, or None when openssl is missing."""
+    if shutil.which("openssl") is None:
+        return None
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+         "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def point_at(ports: Dict[str, Any], cert: Optional[str]) -> None:
+    os.environ["GMC_API_ENDPOINT"] = f"127.0.0.1:{ports['grpcPort']}"
+    os.environ["GMC_API_INSECURE"] = "1"
+    scheme = "https" if ports["tls"] else "http"
+    os.environ["GMC_REST_BASE_URL"] = f"{scheme}://127.0.0.1:{ports['httpPort']}"
+    if cert:
+        os.environ["GMC_REST_CA_BUNDLE"] = cert
+
+
+def reset_server_state() -> None:
+    """Fresh scheduler buckets, response cache and coalescing counters."""
+    from tools._cache import response_cache, singleflight
+    from tools._scheduler import scheduler
+
+    scheduler.buckets.clear()
+    response_cache.invalidate()
+    singleflight.leaders = singleflight.coalesced = 0
+
+
+@contextlib.asynccontextmanager
+async def session():
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from tools import mcp
+
+    async with create_connected_server_and_client_session(mcp) as client:
+        yield client
+
+
+async def call(client: Any, name: str, arguments: Dict[str, Any]) -> tuple:
+    """(seconds, is_error, response_bytes) for one tool call through dispatch."""
+    started = time.perf_counter()
+    result = await client.call_tool(name, arguments)
+    elapsed = time.perf_counter() - started
+    size = sum(len(getattr(c, "text", "") or "") for c in result.content)
+    return elapsed, bool(result.isError), size
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# ---------------------------------------------------------------------------
+# Tool arguments
+# ---------------------------------------------------------------------------
+
+class Inputs:
+    """Temporary input files and state shared by the tool argument builders."""
+
+    def __init__(self, directory: str):
+        self.dir = directory
+        self.dataset_id: Optional[str] = None
+        self.products = os.path.join(directory, "products.ndjson")
+        with open(self.products, "w") as fh:
+            for i in range(200):
+                fh.write(json.dumps(product_input(i)) + "\n")
+        from feeds import write_delimited
+
+        self.feed = os.path.join(directory, "feed.tsv")
+        write_delimited(self.feed, 200, "\t")
+        self.stock = os.path.join(directory, "stock.csv")
+        with open(self.stock, "w") as fh:
+            fh.write("product_name,store_code,quantity,price\n")
+            for i in range(200):
+                fh.write(f"{ACCOUNT}/products/en~US~SKU{i},store{i % 5},{i % 30},{9.99 + i % 10:.2f}\n")
+
+    def path(self, name: str, i: int) -> str:
+        return os.path.join(self.dir, f"{i}-{name}")
+
+
+def product_input(i: int) -> Dict[str, Any]:
+    return {
+        "offerId": f"SKU{i}",
+        "contentLanguage": "en",
+        "feedLabel": "US",
+        "productAttributes": {
+            "title": f"Product {i}",
+            "link": f"https://shop.example.com/p/{i}",
+            "imageLink": f"https://shop.example.com/i/{i}.jpg",
+            "availability": "IN_STOCK",
+            "price": {"amountMicros": "19990000", "currencyCode": "USD"},
+        },
+    }
+
+
+def _today(offset: int = 0) -> str:
+    return (datetime.date.today() + datetime.timedelta(days=offset)).isoformat()
+
+
+def report_query(days: int) -> str:
+    return (
+        "SELECT date, offer_id, brand, marketing_method, clicks, impressions, "
+        "click_through_rate, conversion_value FROM product_performance_view "
+        f"WHERE date BETWEEN '{_today(-days)}' AND '{_today(-1)}'"
+    )
+
+
+# name -> builder(inputs, iteration) returning the call arguments.
+TOOL_ARGS: Dict[str, Callable[[Inputs, int], Dict[str, Any]]] = {
+    "get_data_source": lambda s, i: {"data_source_id": "123"},
+    "fetch_data_source": lambda s, i: {"data_source_id": "123"},
+    "get_data_source_file_upload": lambda s, i: {"data_source_id": "123"},
+    "get_program": lambda s, i: {"program_id": "FREE_LISTINGS"},
+    "enable_program": lambda s, i: {"program_id": "FREE_LISTINGS"},
+    "list_products": lambda s, i: {"page_size": 250},
+    "export_products": lambda s, i: {"path": s.path("products.ndjson", i)},
+    "get_product": lambda s, i: {"product_name": f"{ACCOUNT}/products/en~US~SKU{i}"},
+    "insert_product_input": lambda s, i: {"data_source_id": "123", "product_input": product_input(i)},
+    "bulk_insert_product_inputs": lambda s, i: {
+        "data_source_id": "123", "file_path": s.products, "concurrency": 16, "max_per_second": 1000},
+    "sync_product_inputs": lambda s, i: {
+        "data_source_id": "123", "file_path": s.products, "concurrency": 16, "max_per_second": 1000},
+    "validate_feed": lambda s, i: {"file_path": s.feed, "content_language": "de", "feed_label": "DE"},
+    "delete_product_input": lambda s, i: {
+        "product_input_name": f"{ACCOUNT}/productInputs/en~US~SKU{i}", "data_source_id": "123"},
+    "render_product_issues": lambda s, i: {"product_name": f"{ACCOUNT}/products/en~US~SKU{i}"},
+    "render_product_issues_batch": lambda s, i: {"refresh": i == 1},
+    "find_products_by_issue": lambda s, i: {"issue": "missing gtin", "country": "CA"},
+    "trigger_issue_action": lambda s, i: {"action_id": "request_review"},
+    "reports_search": lambda s, i: {"query": report_query(7)},
+    "get_product_performance": lambda s, i: {
+        "start_date": _today(-30), "end_date": _today(-1), "use_cache": i > 0},
+    "reports_export": lambda s, i: {"query": report_query(7), "path": s.path("report.ndjson", i)},
+    "insert_local_inventory": lambda s, i: {
+        "product_name": f"{ACCOUNT}/products/en~US~SKU{i}", "store_code": "store1",
+        "quantity": 5, "price_amount_micros": "9990000"},
+    "insert_regional_inventory": lambda s, i: {
+        "product_name": f"{ACCOUNT}/products/en~US~SKU{i}", "region": "west",
+        "price_amount_micros": "9990000"},
+    "bulk_update_inventory": lambda s, i: {
+        "file_path": s.stock, "checkpoint_path": s.path("stock.checkpoint.json", i),
+        "concurrency": 16, "max_per_second": 1000},
+    "get_promotion": lambda s, i: {"promotion_name": f"{ACCOUNT}/promotions/promo{i}"},
+    "create_promotion": lambda s, i: {
+        "promotion_id": f"promo{i}", "content_language": "en", "target_country": "US",
+        "redemption_channel": ["ONLINE"], "data_source_id": "123",
+        "attributes": {"promotionDisplayDates": {}, "longTitle": "10% off"}},
+    "update_shipping_settings": lambda s, i: {"shipping_settings": {"etag": "etag-0", "services": []}},
+    "get_return_policy": lambda s, i: {"return_policy_name": f"{ACCOUNT}/onlineReturnPolicies/p{i}"},
+    "create_return_policy": lambda s, i: {"label": f"policy{i}", "countries": ["US"]},
+    "delete_return_policy": lambda s, i: {"return_policy_name": f"{ACCOUNT}/onlineReturnPolicies/p{i}"},
+    "get_collection": lambda s, i: {"collection_id": f"c{i}"},
+    "create_collection": lambda s, i: {
+        "collection_id": f"c{i}", "headline": "Summer", "link": "https://shop.example.com/c",
+        "image_link": "https://shop.example.com/c.jpg"},
+    "load_report": lambda s, i: {"query": report_query(30), "use_cache": i > 0},
+    "fan_out": lambda s, i: {
+        "tool": "count_products_by_status", "accounts": [str(1000 + k) for k in range(4)]},
+    "analyze_report": lambda s, i: {
+        "dataset_id": s.dataset_id, "metrics": ["sum(clicks)", "sum(impressions)", "ratio(clicks,impressions)"],
+        "group_by": ["brand"]},
+}
+
+# Run after their dependencies: query_catalog reads the mirror, analyze_report a dataset,
+# find_products_by_issue the index render_product_issues_batch builds.
+_RUN_LAST = ("sync_catalog", "query_catalog", "load_report", "analyze_report",
+             "render_product_issues_batch", "find_products_by_issue")
+
+
+async def scenario_tools(iterations: int) -> Dict[str, Any]:
+    from tools import mcp
+
+    names = [t.name for t in await mcp.list_tools()]
+    names = [n for n in names if n not in _RUN_LAST] + [n for n in _RUN_LAST if n in names]
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = Inputs(directory)
+        async with session() as client:
+            for name in names:
+                build = TOOL_ARGS.get(name, lambda s, i: {})
+                timings, errors, sizes, first_error = [], 0, [], None
+                started = time.perf_counter()
+                for i in range(iterations):
+                    elapsed, is_error, size = await call(client, name, build(inputs, i))
+                    timings.append(elapsed)
+                    sizes.append(size)
+                    errors += is_error
+                    if is_error and first_error is None:
+                        first_error = (await client.call_tool(name, build(inputs, i))).content[0].text[:300]
+                    if name == "load_report" and not is_error and inputs.dataset_id is None:
+                        result = await client.call_tool(name, build(inputs, i + 1))
+                        inputs.dataset_id = json.loads(result.content[0].text)["datasetId"]
+                wall = time.perf_counter() - started
+                steady = timings[1:] or timings
+                results[name] = {
+                    "calls": iterations,
+                    "errors": errors,
+                    "firstCallMs": ms(timings[0]),
+                    "p50Ms": ms(percentile(steady, 50)),
+                    "p99Ms": ms(percentile(steady, 99)),
+                    "meanMs": ms(statistics.fmean(steady)),
+                    "callsPerSecond": round(iterations / wall, 1),
+                    "responseBytes": int(statistics.median(sizes)),
+                }
+                if first_error:
+                    results[name]["firstError"] = first_error
+            server = json.loads((await client.call_tool("get_metrics", {})).content[0].text)
+    for name, entry in server["tools"].items():
+        if name in results:
+            results[name]["rpcsPerCall"] = entry["rpcsPerCall"]
+            results[name]["upstreamRpcs"] = entry["upstreamRpcs"]
+    return results
+
+
+async def scenario_concurrency(calls: int) -> Dict[str, Any]:
+    """get_product over distinct names: one at a time vs. all in flight."""
+    async with session() as client:
+        await call(client, "get_product", {"product_name": f"{ACCOUNT}/products/en~US~SKU0"})
+        started = time.perf_counter()
+        for i in range(calls):
+            await call(client, "get_product", {"product_name": f"{ACCOUNT}/products/en~US~SKU{i}"})
+        serial = time.perf_counter() - started
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            call(client, "get_product", {"product_name": f"{ACCOUNT}/products/en~US~SKU{calls + i}"})
+            for i in range(calls)
+        ))
+        concurrent = time.perf_counter() - started
+    return {
+        "calls": calls,
+        "serializedCallsPerSecond": round(calls / serial, 1),
+        "concurrentCallsPerSecond": round(calls / concurrent, 1),
+        "speedup": round(serial / concurrent, 1),
+    }
+
+
+def _sync_baseline_server() -> Any:
+    """A FastMCP with get_product as it was before the async clients: a sync
+    tool on the blocking ProductsServiceClient, run inline by dispatch."""
+    import grpc
+    from google.shopping import merchant_products_v1
+    from mcp.server.fastmcp import FastMCP
+
+    transport = merchant_products_v1.ProductsServiceClient.get_transport_class("grpc")(
+        channel=grpc.insecure_channel(os.environ["GMC_API_ENDPOINT"])
+    )
+    client = merchant_products_v1.ProductsServiceClient(transport=transport)
+    server = FastMCP("sync-baseline")
+
+    @server.tool()
+    def get_product(product_name: str) -> Dict[str, Any]:
+        product = client.get_product(request=merchant_products_v1.GetProductRequest(name=product_name))
+        return type(product).to_dict(product)
+
+    return server
+
+
+async def scenario_sync(calls: int) -> Dict[str, Any]:
+    """*calls* concurrent get_product calls: blocking sync tool vs. async tool."""
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    async def burst(client: Any, offset: int) -> float:
+        await call(client, "get_product", {"product_name": f"{ACCOUNT}/products/en~US~SKU{offset}"})
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            call(client, "get_product", {"product_name": f"{ACCOUNT}/products/en~US~SKU{offset + 1 + i}"})
+            for i in range(calls)
+        ))
+        return time.perf_counter() - started
+
+    async with create_connected_server_and_client_session(_sync_baseline_server()) as client:
+        sync_seconds = await burst(client, 0)
+    async with session() as client:
+        async_seconds = await burst(client, calls + 1)
+    return {
+        "calls": calls,
+        "syncCallsPerSecond": round(calls / sync_seconds, 1),
+        "asyncCallsPerSecond": round(calls / async_seconds, 1),
+        "speedup": round(sync_seconds / async_seconds, 1),
+    }
+
+
+async def scenario_fanout(concurrency: int) -> Dict[str, Any]:
+    """sweep_account_health across every fake sub-account: serial vs. concurrent."""
+    timings = {}
+    async with session() as client:
+        await call(client, "list_sub_accounts", {})
+        for label, n in (("serial", 1), ("concurrent", concurrency)):
+            timings[label], _, _ = await call(client, "sweep_account_health", {"concurrency": n})
+        swept = await client.call_tool("sweep_account_health", {"concurrency": concurrency})
+    result = json.loads(swept.content[0].text)
+    return {
+        "accounts": result["accounts"],
+        "failed": len(result["errors"]),
+        "concurrency": concurrency,
+        "serialMs": ms(timings["serial"]),
+        "concurrentMs": ms(timings["concurrent"]),
+        "speedup": round(timings["serial"] / timings["concurrent"], 1),
+    }
+
+
+async def scenario_rest(calls: int) -> Dict[str, Any]:
+    """list_collections' REST call: pooled httpx client vs. a new connection per call."""
+    from tools._common import rest_base_url, rest_request
+
+    path = f"collections/v1beta/{ACCOUNT}/collections"
+    context = None
+    if rest_base_url().startswith("https"):
+        context = ssl.create_default_context(cafile=os.environ.get("GMC_REST_CA_BUNDLE"))
+
+    def fresh() -> bytes:
+        with urllib.request.urlopen(f"{rest_base_url()}/{path}", context=context, timeout=30) as resp:
+            return resp.read()
+
+    await rest_request("GET", path)  # open the pool
+    pooled, per_call = [], []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await rest_request("GET", path)
+        pooled.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        await asyncio.to_thread(fresh)
+        per_call.append(time.perf_counter() - started)
+    return {
+        "calls": calls,
+        "https": context is not None,
+        "pooledP50Ms": ms(percentile(pooled, 50)),
+        "pooledP99Ms": ms(percentile(pooled, 99)),
+        "perCallConnectionP50Ms": ms(percentile(per_call, 50)),
+        "perCallConnectionP99Ms": ms(percentile(per_call, 99)),
+    }
+
+
+async def scenario_throttle(items: int, quota_qps: float) -> Dict[str, Any]:
+    """bulk_insert_product_inputs against a quota; the scheduler should adapt."""
+    from tools._scheduler import scheduler
+
+    async with session() as client:
+        started = time.perf_counter()
+        result = await client.call_tool("bulk_insert_product_inputs", {
+            "data_source_id": "123",
+            "product_inputs": [product_input(i) for i in range(items)],
+            "concurrency": 16,
+            "max_per_second": quota_qps * 4,
+        })
+        wall = time.perf_counter() - started
+    summary = json.loads(result.content[0].text) if not result.isError else {}
+    bucket = scheduler.stats().get("product_inputs", {})
+    return {
+        "items": items,
+        "quotaQps": quota_qps,
+        "succeeded": summary.get("succeeded"),
+        "failed": summary.get("failed"),
+        "itemsPerSecond": round(items / wall, 1),
+        "throttled": bucket.get("throttled"),
+        "retries": bucket.get("retries"),
+        "finalRate": bucket.get("rate"),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+# scenario -> (metric, higher_is_better)
+_SCENARIO_METRICS = {
+    "concurrency": ("concurrentCallsPerSecond", True),
+    "sync": ("asyncCallsPerSecond", True),
+    "rest": ("pooledP50Ms", False),
+    "throttle": ("itemsPerSecond", True),
+    "fanout": ("concurrentMs", False),
+}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], factor: float) -> List[Dict[str, Any]]:
+    """Metrics that got worse than *factor* relative to the baseline run."""
+    regressions = []
+    for name, now in current.get("tools", {}).items():
+        before = baseline.get("tools", {}).get(name)
+        if before and before["p50Ms"] > 0 and now["p50Ms"] > before["p50Ms"] * factor:
+            regressions.append({"metric": f"tools.{name}.p50Ms", "baseline": before["p50Ms"],
+                                "current": now["p50Ms"]})
+    for scenario, (metric, higher) in _SCENARIO_METRICS.items():
+        now = current.get(scenario, {}).get(metric)
+        before = baseline.get(scenario, {}).get(metric)
+        if not now or not before:
+            continue
+        worse = now * factor < before if higher else now > before * factor
+        if worse:
+            regressions.append({"metric": f"{scenario}.{metric}", "baseline": before, "current": now})
+    for kind, now in current.get("feeds", {}).get("formats", {}).items():
+        before = baseline.get("feeds", {}).get("formats", {}).get(kind)
+        if before and now["rowsPerSecond"] * factor < before["rowsPerSecond"]:
+            regressions.append({"metric": f"feeds.{kind}.rowsPerSecond", "baseline": before["rowsPerSecond"],
+                                "current": now["rowsPerSecond"]})
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default=",".join(ALL_SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=20, help="calls per tool")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--catalog-size", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=250, help="largest page the fake returns")
+    parser.add_argument("--quota-qps", type=float, default=60.0, help="throttle scenario quota")
+    parser.add_argument("--out")
+    parser.add_argument("--baseline")
+    parser.add_argument("--regression", type=float, default=1.25)
+    args = parser.parse_args()
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(ALL_SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {sorted(unknown)}")
+
+    os.environ.setdefault("GMC_MERCHANT_ID", "0")
+    os.environ.setdefault("FASTMCP_LOG_LEVEL", "WARNING")  # no per-request log line on stderr
+    work = tempfile.mkdtemp(prefix="gmc-bench-")
+    os.environ.update({
+        "GMC_EXPORT_DIR": os.path.join(work, "exports"),
+        "GMC_CATALOG_DB": os.path.join(work, "catalog.sqlite3"),
+        "GMC_REPORT_CACHE_DB": os.path.join(work, "report_cache.sqlite3"),
+        "GMC_INPUT_INDEX_DB": os.path.join(work, "input_index.sqlite3"),
+        "GMC_QPS": "1000",
+        "GMC_QPS_MAX": "1000",
+    })
+    fake_args = [
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--catalog-size", str(args.catalog_size), "--max-page-size", str(args.page_size),
+    ]
+    tls = self_signed_cert(work)
+    results: Dict[str, Any] = {
+        "startedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fake": {"latencyMs": args.latency_ms, "jitterMs": args.jitter_ms,
+                 "catalogSize": args.catalog_size, "maxPageSize": args.page_size},
+    }
+    try:
+        with fake_merchant(*fake_args, tls=tls) as ports:
+            point_at(ports, tls and tls[0])
+            import tools  # noqa: F401  (register every tool)
+
+            for name, run in (
+                ("tools", lambda: scenario_tools(args.iterations)),
+                ("concurrency", lambda: scenario_concurrency(50)),
+                ("sync", lambda: scenario_sync(50)),
+                ("rest", lambda: scenario_rest(50)),
+                ("fanout", lambda: scenario_fanout(16)),
+            ):
+                if name in scenarios:
+                    reset_server_state()
+                    results[name] = asyncio.run(run())
+                    print(f"{name}: done (peak RSS {peak_rss_mb()} MB)", file=sys.stderr)
+        if "throttle" in scenarios:
+            with fake_merchant(*fake_args, "--quota-qps", str(args.quota_qps)) as ports:
+                point_at(ports, None)
+                os.environ.update({"GMC_QPS": "10", "GMC_QPS_MAX": "100"})
+                reset_server_state()
+                results["throttle"] = asyncio.run(scenario_throttle(600, args.quota_qps))
+        if "projection" in scenarios:
+            from product_projection import run as run_projection
+            results["projection"] = run_projection(products=500)
+        if "serialization" in scenarios:
+            from serialization import run as run_serialization
+            results["serialization"] = run_serialization(messages=200)
+        if "feeds" in scenarios:
+            from feeds import run as run_feeds
+            results["feeds"] = run_feeds(rows=10000)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    results["peakRssMb"] = peak_rss_mb()
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(results, json.load(fh), args.regression)
+        results["regressions"] = regressions
+        status = 1 if regressions else 0
+
+    out = args.out or os.path.join(
+        HERE, "results", datetime.datetime.now().strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as fh:
+        json.dump(results, fh, indent=2)
+    print(json.dumps({k: v for k, v in results.items() if k != "tools"}, indent=2))
+    print(f"wrote {out}", file=sys.stderr)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
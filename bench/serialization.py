@@ -0,0 +1,143 @@
+"""Benchmark: proto-plus to_dict vs. the cached converters in tools._common.
+
+Times realistic Product, ShippingSettings and report-row messages (no
+network, no credentials) through:
+
+  * to_dict          — type(m).to_dict(m), the previous tool path
+  * message_to_dict  — tools._common.message_to_dict (same dict)
+  * +render          — either of the above plus FastMCP's text rendering
+                       (pydantic_core.to_json, indent=2)
+  * to_json          — tools._common.to_json compact bytes (orjson if installed)
+
+Usage:
+    python bench/serialization.py [--messages 500]
+
+Verifies both paths produce identical output, then prints one JSON document
+with microseconds per message.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+os.environ.setdefault("GMC_MERCHANT_ID", "0")
+
+
+def make_shipping_settings(i: int):
+    from google.shopping import merchant_accounts_v1beta
+
+    countries = ["US", "CA", "GB", "DE", "FR", "IT", "ES", "NL"]
+    return merchant_accounts_v1beta.ShippingSettings(
+        name="accounts/0/shippingSettings",
+        etag=f"etag-{i}",
+        services=[
+            {
+                "service_name": f"Service {s}",
+                "active": True,
+                "delivery_countries": countries,
+                "currency_code": "USD",
+                "delivery_time": {"min_transit_days": 1, "max_transit_days": 5,
+                                  "min_handling_days": 0, "max_handling_days": 1},
+                "rate_groups": [
+                    {
+                        "name": f"group {g}",
+                        "applicable_shipping_labels": [f"label{g}"],
+                        "main_table": {
+                            "rows": [
+                                {"cells": [{"flat_rate": {"amount_micros": 1_000_000 * (r + c), "currency_code": "USD"}}
+                                           for c in range(4)]}
+                                for r in range(6)
+                            ],
+                        },
+                    }
+                    for g in range(3)
+                ],
+            }
+            for s in range(4)
+        ],
+    )
+
+
+def make_report_row(i: int):
+    from google.shopping import merchant_reports_v1beta
+
+    return merchant_reports_v1beta.ReportRow(product_performance_view={
+        "date": {"year": 2026, "month": 1 + i % 12, "day": 1 + i % 28},
+        "marketing_method": "ADS",
+        "offer_id": f"SKU{i}",
+        "title": f"Product {i}",
+        "brand": f"Brand{i % 20}",
+        "category_l1": "Home",
+        "category_l2": "Kitchen",
+        "product_type_l1": "Cookware",
+        "clicks": i % 97,
+        "impressions": 1000 + i,
+        "click_through_rate": (i % 97) / (1000 + i),
+        "conversions": 1.5,
+        "conversion_value": {"amount_micros": 49_990_000, "currency_code": "USD"},
+        "conversion_rate": 0.015,
+    })
+
+
+def per_message_us(fn, messages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for m in messages:
+            fn(m)
+        best = min(best, time.perf_counter() - started)
+    return round(best / len(messages) * 1e6, 2)
+
+
+def run(messages: int = 500, repeat: int = 3) -> dict:
+    """Verify and time every conversion path; returns the result document."""
+    import pydantic_core
+
+    from product_projection import make_product
+    from tools import _common
+
+    def render(d):
+        return pydantic_core.to_json(d, fallback=str, indent=2)
+
+    results = {}
+    for kind, factory in (("Product", make_product), ("ShippingSettings", make_shipping_settings),
+                          ("ReportRow", make_report_row)):
+        items = [factory(i) for i in range(messages)]
+        for m in items[:50]:
+            if json.dumps(type(m).to_dict(m)) != json.dumps(_common.message_to_dict(m)):
+                raise SystemExit(f"{kind}: message_to_dict output differs from to_dict")
+        timings = {
+            "to_dict": per_message_us(lambda m: type(m).to_dict(m), items, repeat),
+            "message_to_dict": per_message_us(_common.message_to_dict, items, repeat),
+            "to_dict+render": per_message_us(lambda m: render(type(m).to_dict(m)), items, repeat),
+            "message_to_dict+render": per_message_us(
+                lambda m: render(_common.message_to_dict(m)), items, repeat),
+            "to_json": per_message_us(_common.to_json, items, repeat),
+        }
+        timings["speedup"] = round(timings["to_dict+render"] / timings["message_to_dict+render"], 1)
+        results[kind] = timings
+    return {
+        "benchmark": "serialization",
+        "messages": messages,
+        "orjson": _common._orjson is not None,
+        "usPerMessage": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.messages, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
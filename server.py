@@ -2,17 +2,27 @@
 """Google Merchant Center MCP Server — entry point.
 
 All tool implementations live under tools/.
-Run: python server.py
+Run: python server.py [--warmup]
+
+--warmup (or GMC_WARMUP=1) imports and connects every Merchant API sub-service
+client in the background while the MCP handshake runs, so the first real tool
+call is as fast as later ones. See the get_startup_report tool for timings.
 """
 
 from __future__ import annotations
 
 import logging
+import os
+import sys
 
 logging.basicConfig(level=logging.INFO)
+logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per REST call
 
-# Import mcp instance (triggers registration of all 34 tools via tools/__init__.py)
+# Import mcp instance (triggers registration of every tool via tools/__init__.py)
 from tools import mcp  # noqa: F401
+from tools._common import enable_warmup
 
 if __name__ == "__main__":
+    if "--warmup" in sys.argv[1:] or os.environ.get("GMC_WARMUP", "").strip() in ("1", "true", "yes"):
+        enable_warmup()
     mcp.run()
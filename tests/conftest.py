@@ -0,0 +1,7 @@
+"""Shared test setup: import the server package from the repo root, offline."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GMC_MERCHANT_ID", "0")
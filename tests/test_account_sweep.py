@@ -0,0 +1,43 @@
+"""sweep_account_health over fake per-account issue lists."""
+
+import asyncio
+
+from google.shopping import merchant_accounts_v1beta
+
+from tools import account
+from tools._common import merchant_id
+
+Severity = merchant_accounts_v1beta.AccountIssue.Severity
+
+_ISSUES = {
+    "111": [Severity.SUGGESTION],
+    "222": [Severity.ERROR, Severity.CRITICAL, Severity.ERROR],
+    "333": [],
+}
+
+
+class FakeIssuesClient:
+    async def list_account_issues(self, request=None):
+        severities = _ISSUES[merchant_id()]
+
+        async def pages():
+            for i, severity in enumerate(severities):
+                yield merchant_accounts_v1beta.AccountIssue(title=f"issue {i}", severity=severity)
+
+        return pages()
+
+
+def test_sweep_reports_critical_accounts_first(monkeypatch):
+    monkeypatch.setattr(account, "get_accounts_issues_client", FakeIssuesClient)
+    result = asyncio.run(account.sweep_account_health(accounts=list(_ISSUES)))
+
+    assert result["errors"] == {}
+    assert result["withCriticalIssues"] == 1
+    assert result["withIssues"] == 2
+    first = result["health"][0]
+    assert first["accountId"] == "222"
+    assert first["hasCriticalIssue"] is True
+    assert first["bySeverity"] == {"ERROR": 2, "CRITICAL": 1}
+    by_account = {s["accountId"]: s for s in result["health"]}
+    assert by_account["111"]["bySeverity"] == {"SUGGESTION": 1}
+    assert by_account["111"]["hasCriticalIssue"] is False
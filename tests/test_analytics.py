@@ -0,0 +1,46 @@
+"""Vectorized group statistics in tools/analytics.py against plain NumPy."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from tools import analytics
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(7)
+    n = 5000
+    clicks = rng.poisson(4, n).astype(np.float64)
+    clicks[rng.random(n) < 0.05] = np.nan
+    offers = np.array([f"SKU{i}" for i in rng.integers(0, 40, n)], dtype=object)
+    dates = np.array([str(np.datetime64("2026-01-01") + int(d)) for d in rng.integers(0, 60, n)], dtype=object)
+    columns = {"offer_id": offers, "date": dates, "clicks": clicks}
+    return columns, analytics._store(columns, "test")["datasetId"]
+
+
+@pytest.mark.parametrize("metric, q", [("min", 0), ("max", 100), ("median", 50), ("p90", 90), ("p5", 5)])
+def test_order_statistics_match_numpy(dataset, metric, q):
+    columns, dataset_id = dataset
+    result = asyncio.run(analytics.analyze_report(dataset_id, [f"{metric}(clicks)"], ["offer_id"], top_n=100))
+    assert result["groups"] == 40
+    for row in result["rows"]:
+        values = columns["clicks"][columns["offer_id"] == row["offer_id"]]
+        expected = np.percentile(values[~np.isnan(values)], q)
+        assert row[f"{metric}(clicks)"] == pytest.approx(expected)
+
+
+def test_time_grain_buckets_distinct_values(dataset):
+    columns, dataset_id = dataset
+    result = asyncio.run(analytics.analyze_report(dataset_id, ["count()"], ["date:month"]))
+    counts = {row["date:month"]: row["count()"] for row in result["rows"]}
+    months = np.array([d[:7] for d in columns["date"]])
+    assert counts == {m: int((months == m).sum()) for m in np.unique(months)}
+
+
+def test_compare_on_unknown_column_lists_columns(dataset):
+    _, dataset_id = dataset
+    compare = {"column": "day", "current": ["2026-02-01", "2026-02-28"], "previous": ["2026-01-01", "2026-01-31"]}
+    with pytest.raises(ValueError, match=r"Unknown column 'day'; have \['clicks', 'date', 'offer_id'\]"):
+        asyncio.run(analytics.analyze_report(dataset_id, ["sum(clicks)"], compare=compare))
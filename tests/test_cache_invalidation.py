@@ -0,0 +1,176 @@
+"""Writes drop the cached reads of their resource, for their own account only."""
+
+import asyncio
+
+import pytest
+from google.shopping import merchant_accounts_v1beta, merchant_promotions_v1
+
+from tools import promotions, returnpolicy, shipping
+from tools._cache import response_cache
+from tools._common import use_account
+
+
+class AsyncPage:
+    """Async iterable standing in for a list_* pager."""
+
+    def __init__(self, items):
+        self._items = list(items)
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for item in self._items:
+            yield item
+
+
+class FakeShippingClient:
+    def __init__(self):
+        self.reads = 0
+        self.writes = []
+
+    async def get_shipping_settings(self, request):
+        self.reads += 1
+        return merchant_accounts_v1beta.ShippingSettings(name=request.name, etag=f"v{self.reads}")
+
+    async def insert_shipping_settings(self, request):
+        self.writes.append(request)
+        return request.shipping_setting
+
+
+class FakePromotionsClient:
+    def __init__(self):
+        self.reads = 0
+        self.writes = []
+
+    async def list_promotions(self, request):
+        self.reads += 1
+        return AsyncPage([merchant_promotions_v1.Promotion(promotion_id=f"promo-{self.reads}")])
+
+    async def insert_promotion(self, request):
+        self.writes.append(request)
+        return request.promotion
+
+
+class FakeReturnPolicyClient:
+    def __init__(self):
+        self.reads = 0
+        self.deleted = []
+
+    async def list_online_return_policies(self, request):
+        self.reads += 1
+        return AsyncPage([merchant_accounts_v1beta.OnlineReturnPolicy(label=f"policy-{self.reads}")])
+
+    async def delete_online_return_policy(self, request):
+        self.deleted.append(request.name)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.delenv("GMC_CACHE_DISABLED", raising=False)
+    response_cache.invalidate()
+    yield
+    response_cache.invalidate()
+
+
+def _read_write_read(read, write, account="111"):
+    """Return the (first, second, after-write) read results for *account*."""
+
+    async def main():
+        with use_account(account):
+            first = await read()
+            second = await read()
+            await write()
+            return first, second, await read()
+
+    return asyncio.run(main())
+
+
+def _assert_invalidated(client, first, second, after):
+    assert first["_cache"]["hit"] is False
+    assert second["_cache"]["hit"] is True
+    assert after["_cache"]["hit"] is False
+    assert client.reads == 2
+
+
+def test_update_shipping_settings_invalidates_get_shipping_settings(monkeypatch):
+    client = FakeShippingClient()
+    monkeypatch.setattr(shipping, "get_shipping_client", lambda: client)
+
+    first, second, after = _read_write_read(
+        shipping.get_shipping_settings,
+        lambda: shipping.update_shipping_settings({"etag": "new", "warehouses": []}),
+    )
+
+    _assert_invalidated(client, first, second, after)
+    assert first["etag"] == second["etag"] == "v1"
+    assert after["etag"] == "v2"
+    assert client.writes[0].shipping_setting.etag == "new"
+
+
+def test_create_promotion_invalidates_list_promotions(monkeypatch):
+    client = FakePromotionsClient()
+    monkeypatch.setattr(promotions, "get_promotions_client", lambda: client)
+
+    first, second, after = _read_write_read(
+        promotions.list_promotions,
+        lambda: promotions.create_promotion(
+            "summer-10", "de", "DE", ["ONLINE"], {"offerType": "NO_CODE"}, "42"
+        ),
+    )
+
+    _assert_invalidated(client, first, second, after)
+    assert after["promotions"][0]["promotion_id"] == "promo-2"
+    request = client.writes[0]
+    assert request.promotion.promotion_id == "summer-10"
+    assert request.data_source == "accounts/111/dataSources/42"
+
+
+def test_return_policy_writes_invalidate_list_return_policies(monkeypatch):
+    client = FakeReturnPolicyClient()
+    posted = []
+
+    async def fake_rest_request(method, path, json_body=None, **kwargs):
+        posted.append((method, path, json_body))
+        return {"label": json_body["label"]}
+
+    monkeypatch.setattr(returnpolicy, "get_return_policy_client", lambda: client)
+    monkeypatch.setattr(returnpolicy, "rest_request", fake_rest_request)
+
+    first, second, after = _read_write_read(
+        returnpolicy.list_return_policies,
+        lambda: returnpolicy.create_return_policy("EU", ["DE"]),
+    )
+    _assert_invalidated(client, first, second, after)
+    assert posted[0][:2] == ("POST", "accounts/v1beta/accounts/111/onlineReturnPolicies")
+
+    async def delete_then_read():
+        with use_account("111"):
+            await returnpolicy.delete_return_policy("accounts/111/onlineReturnPolicies/p1")
+            return await returnpolicy.list_return_policies()
+
+    assert asyncio.run(delete_then_read())["_cache"]["hit"] is False
+    assert client.reads == 3
+
+
+def test_write_leaves_other_accounts_cached(monkeypatch):
+    client = FakeShippingClient()
+    monkeypatch.setattr(shipping, "get_shipping_client", lambda: client)
+
+    async def main():
+        with use_account("222"):
+            await shipping.get_shipping_settings()
+        with use_account("111"):
+            await shipping.get_shipping_settings()
+            await shipping.update_shipping_settings({"etag": "new"})
+            own = await shipping.get_shipping_settings()
+        with use_account("222"):
+            other = await shipping.get_shipping_settings()
+        return own, other
+
+    own, other = asyncio.run(main())
+
+    assert own["_cache"]["hit"] is False
+    assert other["_cache"]["hit"] is True
+    assert other["name"] == "accounts/222/shippingSettings"
+    assert client.reads == 3
@@ -0,0 +1,72 @@
+"""Incremental sync_catalog counts against a fake product listing."""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+from google.shopping import merchant_products_v1
+
+from tools import catalog
+
+
+def _product(offer_id, title="Kettle", gtin="4006381333931"):
+    return merchant_products_v1.Product.pb()(
+        name=f"accounts/0/products/en~US~{offer_id}",
+        offer_id=offer_id,
+        product_attributes={"title": title, "gtins": [gtin]},
+    )
+
+
+@pytest.fixture
+def listing(monkeypatch, tmp_path):
+    monkeypatch.setenv("GMC_CATALOG_DB", str(tmp_path / "catalog.sqlite3"))
+    products = {}
+
+    async def fake_iter_products(page_size=250, raw=False):
+        for product in list(products.values()):
+            yield product
+
+    monkeypatch.setattr(catalog, "_iter_products", fake_iter_products)
+    return products
+
+
+def _sync(**kwargs):
+    result = asyncio.run(catalog.sync_catalog(**kwargs))
+    return {key: result[key] for key in ("inserted", "updated", "unchanged", "deleted")}
+
+
+def _rows():
+    conn = sqlite3.connect(catalog.catalog_path())
+    try:
+        return {name: json.loads(data) for name, data in conn.execute("SELECT name, data FROM products")}
+    finally:
+        conn.close()
+
+
+def test_insert_update_unchanged_delete(listing):
+    for offer_id in ("A", "B", "C"):
+        listing[offer_id] = _product(offer_id)
+    assert _sync(page_size=2) == {"inserted": 3, "updated": 0, "unchanged": 0, "deleted": 0}
+
+    listing["B"] = _product("B", title="Kettle 2")
+    del listing["C"]
+    listing["D"] = _product("D")
+    assert _sync(page_size=2) == {"inserted": 1, "updated": 1, "unchanged": 1, "deleted": 1}
+    assert sorted(row["offerId"] for row in _rows().values()) == ["A", "B", "D"]
+
+    assert _sync(page_size=2) == {"inserted": 0, "updated": 0, "unchanged": 3, "deleted": 0}
+
+
+def test_changing_fields_rewrites_rows(listing):
+    listing["A"] = _product("A")
+    listing["B"] = _product("B")
+    _sync()
+
+    fields = ["product_attributes.gtins"]
+    assert _sync(fields=fields) == {"inserted": 0, "updated": 2, "unchanged": 0, "deleted": 0}
+    assert all(row["product_attributes.gtins"] == ["4006381333931"] for row in _rows().values())
+    assert _sync(fields=fields) == {"inserted": 0, "updated": 0, "unchanged": 2, "deleted": 0}
+
+    assert _sync() == {"inserted": 0, "updated": 2, "unchanged": 0, "deleted": 0}
+    assert all("product_attributes.gtins" not in row for row in _rows().values())
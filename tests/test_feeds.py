@@ -0,0 +1,229 @@
+"""tools/feeds.py: TSV / CSV / XML parsing, value coercion and row errors."""
+
+import gzip
+
+import pytest
+
+from tools.feeds import FeedError, _to_product_input, iter_feed
+
+_HEADER = "id\ttitle\tlink\timage_link\tavailability\tprice"
+_ROW = "SKU-1\tMug\thttps://shop.example/mug\thttps://shop.example/mug.jpg\tin stock\t15.00 EUR"
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _fields(**overrides):
+    fields = {
+        "id": ["SKU-1"],
+        "title": ["Mug"],
+        "link": ["https://shop.example/mug"],
+        "image_link": ["https://shop.example/mug.jpg"],
+        "availability": ["in stock"],
+        "price": ["15.00 EUR"],
+    }
+    fields.update({k: [v] if isinstance(v, str) else v for k, v in overrides.items()})
+    return fields
+
+
+def test_tsv_row_maps_onto_product_input(tmp_path):
+    path = _write(tmp_path, "feed.tsv", f"{_HEADER}\tgtin\tcolour\n{_ROW}\t111, 222\tblue\n")
+
+    [product] = iter_feed(path, content_language="de", feed_label="DE")
+
+    assert product["offerId"] == "SKU-1"
+    assert (product["contentLanguage"], product["feedLabel"]) == ("de", "DE")
+    attributes = product["productAttributes"]
+    assert attributes["title"] == "Mug"
+    assert attributes["imageLink"] == "https://shop.example/mug.jpg"
+    assert attributes["availability"] == "IN_STOCK"
+    assert attributes["price"] == {"amountMicros": "15000000", "currencyCode": "EUR"}
+    assert attributes["gtins"] == ["111", "222"]
+    assert product["customAttributes"] == [{"name": "colour", "value": "blue"}]
+
+
+def test_txt_sniffs_tab_delimiter_and_gz_is_decompressed(tmp_path):
+    path = tmp_path / "feed.txt.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        fh.write(f"{_HEADER}\n{_ROW}\n")
+
+    [product] = iter_feed(str(path), content_language="de", feed_label="DE")
+
+    assert product["offerId"] == "SKU-1"
+
+
+def test_csv_with_quoted_cells_and_row_level_language(tmp_path):
+    path = _write(
+        tmp_path,
+        "feed.csv",
+        "\ufeffid,Title,link,image_link,availability,price,content_language,feed_label\n"
+        'SKU-2,"Mug, large",https://shop.example/l,https://shop.example/l.jpg,'
+        "out-of-stock,9.5,fr,FR\n"
+        "\n",
+    )
+
+    [product] = iter_feed(path, content_language="de", feed_label="DE", currency="EUR")
+
+    assert product["offerId"] == "SKU-2"
+    assert (product["contentLanguage"], product["feedLabel"]) == ("fr", "FR")
+    assert product["productAttributes"]["title"] == "Mug, large"
+    assert product["productAttributes"]["availability"] == "OUT_OF_STOCK"
+    assert product["productAttributes"]["price"] == {"amountMicros": "9500000", "currencyCode": "EUR"}
+
+
+def test_rss_and_atom_items(tmp_path):
+    rss = _write(
+        tmp_path,
+        "rss.xml",
+        """<?xml version="1.0"?>
+<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0"><channel>
+  <title>Shop</title>
+  <item>
+    <g:id>SKU-1</g:id><title>Mug</title><link>https://shop.example/mug</link>
+    <g:image_link>https://shop.example/mug.jpg</g:image_link>
+    <g:availability>in stock</g:availability><g:price>15.00 EUR</g:price>
+    <g:shipping><g:country>DE</g:country><g:service>Standard</g:service>
+      <g:price>4.95 EUR</g:price></g:shipping>
+    <guid>ignored</guid>
+  </item>
+  <item>
+    <g:id>SKU-2</g:id><title>Cup</title><link>https://shop.example/cup</link>
+    <g:image_link>https://shop.example/cup.jpg</g:image_link>
+    <g:availability>preorder</g:availability><g:price>7.00 EUR</g:price>
+  </item>
+</channel></rss>
+""",
+    )
+    atom = _write(
+        tmp_path,
+        "atom.xml",
+        """<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:g="http://base.google.com/ns/1.0">
+  <id>feed-id</id>
+  <entry>
+    <g:id>SKU-3</g:id><title>Bowl</title><link href="https://shop.example/bowl"/>
+    <g:image_link>https://shop.example/bowl.jpg</g:image_link>
+    <g:availability>in stock</g:availability><g:price>3 EUR</g:price>
+  </entry>
+</feed>
+""",
+    )
+
+    first, second = iter_feed(rss, content_language="de", feed_label="DE")
+    [entry] = iter_feed(atom, content_language="de", feed_label="DE")
+
+    assert first["offerId"] == "SKU-1"
+    assert first["productAttributes"]["shipping"] == [
+        {"country": "DE", "service": "Standard", "price": {"amountMicros": "4950000", "currencyCode": "EUR"}}
+    ]
+    assert "customAttributes" not in first
+    assert second["productAttributes"]["availability"] == "PREORDER"
+    assert entry["offerId"] == "SKU-3"
+    assert entry["productAttributes"]["link"] == "https://shop.example/bowl"
+
+
+@pytest.mark.parametrize(
+    ("attribute", "value", "key", "expected"),
+    [
+        ("availability", "In Stock", "availability", "IN_STOCK"),
+        ("availability", "backorder", "availability", "BACKORDER"),
+        ("condition", "refurbished", "condition", "REFURBISHED"),
+        ("age_group", "adult", "ageGroup", "ADULT"),
+    ],
+)
+def test_enum_values_become_api_names(attribute, value, key, expected):
+    product = _to_product_input(_fields(**{attribute: value}), "de", "DE", None)
+
+    assert product["productAttributes"][key] == expected
+
+
+def test_repeated_enum_values_are_coerced_each():
+    product = _to_product_input(
+        _fields(included_destination=["shopping ads", "free-listings"]), "de", "DE", None
+    )
+
+    assert product["productAttributes"]["includedDestinations"] == ["SHOPPING_ADS", "FREE_LISTINGS"]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("yes", True), ("TRUE", True), ("1", True), ("no", False), ("False", False), ("0", False)],
+)
+def test_bool_values(value, expected):
+    product = _to_product_input(_fields(identifier_exists=value, adult=value), "de", "DE", None)
+
+    assert product["productAttributes"]["identifierExists"] is expected
+    assert product["productAttributes"]["adult"] is expected
+
+
+@pytest.mark.parametrize(
+    ("overrides", "message"),
+    [
+        ({"availability": "sometimes"}, "invalid availability 'sometimes'"),
+        ({"is_bundle": "maybe"}, "invalid is_bundle 'maybe'"),
+    ],
+)
+def test_invalid_enum_or_bool_raises_value_error(overrides, message):
+    with pytest.raises(ValueError, match=message):
+        _to_product_input(_fields(**overrides), "de", "DE", None)
+
+
+def test_missing_fields_are_listed():
+    fields = _fields()
+    del fields["price"]
+
+    with pytest.raises(ValueError, match="missing feedLabel, price"):
+        _to_product_input(fields, "de", None, None)
+
+
+def test_feed_error_reports_file_row_and_offer_id(tmp_path):
+    path = _write(
+        tmp_path,
+        "feed.tsv",
+        f"{_HEADER}\n"
+        f"{_ROW}\n"
+        "SKU-2\tCup\thttps://shop.example/cup\thttps://shop.example/cup.jpg\tsometimes\t7.00 EUR\n"
+        "\tBowl\thttps://shop.example/bowl\thttps://shop.example/bowl.jpg\tin stock\t3 EUR\n",
+    )
+
+    with pytest.raises(FeedError) as raised:
+        list(iter_feed(path, content_language="de", feed_label="DE"))
+    assert raised.value.row == 3
+    assert raised.value.offer_id == "SKU-2"
+    assert str(raised.value) == "row 3: invalid availability 'sometimes'"
+
+    errors = []
+    products = list(iter_feed(path, content_language="de", feed_label="DE", on_error=errors.append))
+
+    assert [p["offerId"] for p in products] == ["SKU-1"]
+    assert [(e.row, e.offer_id, e.reason) for e in errors] == [
+        (3, "SKU-2", "invalid availability 'sometimes'"),
+        (4, None, "missing offerId"),
+    ]
+
+
+def test_xml_feed_error_counts_items(tmp_path):
+    path = _write(
+        tmp_path,
+        "feed.xml",
+        """<rss xmlns:g="http://base.google.com/ns/1.0"><channel>
+  <item><g:id>SKU-1</g:id><title>Mug</title></item>
+</channel></rss>
+""",
+    )
+    errors = []
+
+    assert list(iter_feed(path, "de", "DE", on_error=errors.append)) == []
+    assert [(e.row, e.offer_id, e.reason) for e in errors] == [
+        (1, "SKU-1", "missing link, imageLink, availability, price"),
+    ]
+
+
+def test_unsupported_extension(tmp_path):
+    path = _write(tmp_path, "feed.json", "{}")
+
+    with pytest.raises(ValueError, match="unsupported feed type"):
+        list(iter_feed(path))
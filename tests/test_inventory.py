@@ -0,0 +1,102 @@
+"""bulk_update_inventory checkpoint resume and catalog offerId lookup."""
+
+import asyncio
+
+import pytest
+
+from tools import catalog, inventory
+
+
+class FakeLocalInventory:
+    """Records product names; fails or hangs for the given offer ids."""
+
+    def __init__(self, fail=(), hang=()):
+        self.fail, self.hang = set(fail), set(hang)
+        self.written = []
+
+    async def insert_local_inventory(self, request=None):
+        offer_id = request.parent.rsplit("~", 1)[-1]
+        if offer_id in self.hang:
+            await asyncio.Event().wait()
+        if offer_id in self.fail:
+            raise RuntimeError("rejected")
+        self.written.append(offer_id)
+
+
+def _run(monkeypatch, client, path, timeout=None):
+    monkeypatch.setattr(inventory, "get_local_inventory_client", lambda: client)
+    monkeypatch.setattr(inventory, "get_regional_inventory_client", lambda: None)
+    call = inventory.bulk_update_inventory(
+        str(path), content_language="en", feed_label="US", concurrency=1, max_per_second=1000,
+    )
+    return asyncio.run(asyncio.wait_for(call, timeout))
+
+
+def test_interrupted_run_resumes_and_retries_failed_rows(monkeypatch, tmp_path):
+    path = tmp_path / "stock.csv"
+    path.write_text("offerId,storeCode,quantity\n" + "".join(f"SKU{i},S1,{i}\n" for i in range(6)))
+
+    first = FakeLocalInventory(fail={"SKU1"}, hang={"SKU3"})
+    with pytest.raises(asyncio.TimeoutError):
+        _run(monkeypatch, first, path, timeout=0.5)
+    assert first.written == ["SKU0", "SKU2"]
+
+    second = FakeLocalInventory()
+    result = _run(monkeypatch, second, path)
+    assert second.written == ["SKU1", "SKU3", "SKU4", "SKU5"]
+    assert result["resumedFromRow"] == 3
+    assert result["retriedFailedRows"] == 1
+    assert (result["succeeded"], result["failed"], result["completedRows"]) == (4, 0, 6)
+
+    third = FakeLocalInventory()
+    result = _run(monkeypatch, third, path)
+    assert third.written == []
+    assert result["resumedFromRow"] == 6
+
+
+def test_failed_rows_stay_in_checkpoint_until_they_succeed(monkeypatch, tmp_path):
+    path = tmp_path / "stock.csv"
+    path.write_text("offerId,storeCode\nSKU0,S1\nSKU1,S1\nSKU2,S1\n")
+
+    result = _run(monkeypatch, FakeLocalInventory(fail={"SKU1"}), path)
+    assert (result["succeeded"], result["failed"], result["completedRows"]) == (2, 1, 3)
+
+    retry = FakeLocalInventory(fail={"SKU1"})
+    result = _run(monkeypatch, retry, path)
+    assert result["retriedFailedRows"] == 1 and result["failed"] == 1
+
+    healed = FakeLocalInventory()
+    result = _run(monkeypatch, healed, path)
+    assert healed.written == ["SKU1"]
+    assert result["retriedFailedRows"] == 1 and result["failed"] == 0
+
+
+@pytest.fixture
+def mirror(monkeypatch, tmp_path):
+    monkeypatch.setenv("GMC_CATALOG_DB", str(tmp_path / "catalog.sqlite3"))
+    conn = catalog.connect()
+    conn.executemany(
+        "INSERT INTO products (name, offer_id, content_language, feed_label, content_hash, sync_id, data) "
+        "VALUES (?, ?, ?, ?, '', 1, '{}')",
+        [
+            ("accounts/0/products/en~US~SKU1", "SKU1", "en", "US"),
+            ("accounts/0/products/de~DE~SKU1", "SKU1", "de", "DE"),
+            ("accounts/0/products/en~GB~SKU1", "SKU1", "en", "GB"),
+            ("accounts/0/products/en~US~SKU2", "SKU2", "en", "US"),
+        ],
+    )
+    yield conn
+    conn.close()
+
+
+def test_lookup_narrows_by_language_and_feed_label(mirror):
+    assert catalog.lookup_product_name(mirror, "SKU2") == "accounts/0/products/en~US~SKU2"
+    assert catalog.lookup_product_name(mirror, "SKU1", "de") == "accounts/0/products/de~DE~SKU1"
+    assert catalog.lookup_product_name(mirror, "SKU1", feed_label="GB") == "accounts/0/products/en~GB~SKU1"
+    assert catalog.lookup_product_name(mirror, "SKU1", "fr") is None
+
+
+def test_lookup_rejects_ambiguous_offer_ids(mirror):
+    with pytest.raises(ValueError, match="matches several products") as info:
+        catalog.lookup_product_name(mirror, "SKU1", "en")
+    assert "en~GB~SKU1" in str(info.value) and "en~US~SKU1" in str(info.value)
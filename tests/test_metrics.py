@@ -0,0 +1,22 @@
+"""Tool metrics record the size of the response FastMCP rendered."""
+
+import asyncio
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from tools import mcp
+from tools._metrics import metrics
+
+
+def test_response_size_comes_from_rendered_content():
+    stats = metrics.tool("get_scheduler_stats")
+    calls, total = stats.size.count, stats.size.sum
+
+    async def main():
+        async with create_connected_server_and_client_session(mcp) as client:
+            return await client.call_tool("get_scheduler_stats", {})
+
+    result = asyncio.run(main())
+    sent = sum(len(c.text.encode("utf-8")) for c in result.content)
+    assert stats.size.count == calls + 1
+    assert stats.size.sum - total == sent
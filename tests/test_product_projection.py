@@ -0,0 +1,41 @@
+"""get_product(fields=...) projections agree with the full get_product response."""
+
+from google.shopping import merchant_products_v1
+
+from tools._common import message_to_dict
+from tools.products import _projector
+
+
+def _product():
+    return merchant_products_v1.Product(
+        name="accounts/0/products/en~US~SKU1",
+        offer_id="SKU1",
+        product_attributes=merchant_products_v1.ProductAttributes(
+            title="Kettle",
+            gtins=["4006381333931"],
+            availability=merchant_products_v1.Availability.IN_STOCK,
+            price={"amount_micros": 19_990_000, "currency_code": "EUR"},
+        ),
+        product_status=merchant_products_v1.ProductStatus(item_level_issues=[
+            merchant_products_v1.ProductStatus.ItemLevelIssue(
+                code="missing_image", severity=merchant_products_v1.ProductStatus.ItemLevelIssue.Severity.DISAPPROVED,
+            ),
+        ]),
+    )
+
+
+def test_field_paths_use_full_response_names_and_enums():
+    product = _product()
+    full = message_to_dict(product)
+    paths = ["product_attributes.availability", "product_attributes.price", "product_status.item_level_issues"]
+    projected = _projector(paths)(product)
+    for path in paths:
+        parent, leaf = path.split(".")
+        assert projected[path] == full[parent][leaf]
+
+
+def test_camel_case_paths_read_the_same_values():
+    product = _product()
+    snake = _projector(["product_attributes.gtins", "product_status.item_level_issues"])(product)
+    camel = _projector(["productAttributes.gtins", "productStatus.itemLevelIssues"])(product)
+    assert list(snake.values()) == list(camel.values())
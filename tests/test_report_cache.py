@@ -0,0 +1,68 @@
+"""Settle-window boundaries of tools/_report_cache.py with a frozen clock."""
+
+import datetime
+import types
+
+import pytest
+
+from tools import _report_cache
+from tools._report_cache import ReportCache, is_closed
+
+TODAY = datetime.date(2026, 3, 10)
+
+
+def _at(day, hour=0, minute=0, second=0):
+    """Local timestamp of *day* at the given time."""
+    return datetime.datetime.combine(day, datetime.time(hour, minute, second)).timestamp()
+
+
+@pytest.fixture(autouse=True)
+def settle_three_days(monkeypatch):
+    monkeypatch.setenv("GMC_REPORT_SETTLE_DAYS", "3")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    frozen = types.SimpleNamespace(now=_at(TODAY))
+    monkeypatch.setattr(_report_cache, "time", types.SimpleNamespace(time=lambda: frozen.now))
+    return frozen
+
+
+@pytest.fixture
+def cache(clock, tmp_path):
+    store = ReportCache(str(tmp_path / "reports.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_day_at_the_settle_edge_is_closed():
+    assert is_closed(datetime.date(2026, 3, 7), TODAY)
+    assert not is_closed(datetime.date(2026, 3, 8), TODAY)
+    assert not is_closed(TODAY, TODAY)
+
+
+def test_today_defaults_to_the_system_date(monkeypatch):
+    class FrozenDate(datetime.date):
+        @classmethod
+        def today(cls):
+            return TODAY
+
+    monkeypatch.setattr(_report_cache.datetime, "date", FrozenDate)
+    assert is_closed(datetime.date(2026, 3, 7))
+    assert not is_closed(datetime.date(2026, 3, 8))
+
+
+def test_rows_fetched_before_the_day_settled_are_not_served(cache, clock):
+    day = datetime.date(2026, 3, 7)  # settles at local midnight of 2026-03-10
+    clock.now = _at(datetime.date(2026, 3, 9), 23, 59, 59)
+    cache.put("accounts/0", "q", day, [])
+    assert cache.get("accounts/0", "q", day) is None
+
+
+def test_rows_fetched_once_the_day_settled_are_served(cache, clock):
+    day = datetime.date(2026, 3, 7)
+    clock.now = _at(TODAY)
+    cache.put("accounts/0", "q", day, [])
+    assert cache.get("accounts/0", "q", day) == []
+    assert cache.get("accounts/1", "q", day) is None
+    assert cache.get("accounts/0", "other", day) is None
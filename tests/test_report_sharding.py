@@ -0,0 +1,146 @@
+"""Sharded reports_search re-applies ORDER BY / LIMIT like the unsharded query."""
+
+import asyncio
+import datetime
+import re
+
+import pytest
+from google.shopping import merchant_reports_v1beta
+
+from tools import reports
+from tools._common import use_account
+
+START = datetime.date(2026, 1, 1)
+# offer_id, clicks per day; clicks are distinct so the expected order has no ties.
+CLICKS = {
+    START + datetime.timedelta(days=d): {f"SKU-{o}": 100 - 7 * d - 3 * o for o in range(3)}
+    for d in range(10)
+}
+CLICKS[START + datetime.timedelta(days=4)]["SKU-9"] = None  # row without clicks
+
+_RANGE_RE = re.compile(r"BETWEEN '(\S+)' AND '(\S+)'")
+_ORDER_RE = re.compile(r"ORDER BY (\w+)(?: (ASC|DESC))?", re.I)
+_LIMIT_RE = re.compile(r"LIMIT (\d+)", re.I)
+
+
+def _row(day, offer_id, clicks):
+    view = {"date": {"year": day.year, "month": day.month, "day": day.day}, "offer_id": offer_id}
+    if clicks is not None:
+        view["clicks"] = clicks
+    return merchant_reports_v1beta.ReportRow(product_performance_view=view)
+
+
+class FakePager:
+    """Answers both the single-page and the all-pages access patterns."""
+
+    def __init__(self, rows, page_size):
+        self._pages = [
+            merchant_reports_v1beta.SearchResponse(results=rows[i:i + page_size])
+            for i in range(0, len(rows), page_size)
+        ] or [merchant_reports_v1beta.SearchResponse()]
+        self.results = self._pages[0].results
+        self.next_page_token = "next" if len(self._pages) > 1 else ""
+
+    @property
+    def pages(self):
+        return self._iter_pages()
+
+    async def _iter_pages(self):
+        for page in self._pages:
+            yield page
+
+
+class FakeReportsClient:
+    """Evaluates date BETWEEN, ORDER BY and LIMIT over CLICKS like the API would."""
+
+    def __init__(self):
+        self.queries = []
+
+    async def search(self, request):
+        query = request.query
+        self.queries.append(query)
+        start, end = (datetime.date.fromisoformat(d) for d in _RANGE_RE.search(query).groups())
+        rows = [
+            (day, offer_id, clicks)
+            for day, offers in sorted(CLICKS.items()) if start <= day <= end
+            for offer_id, clicks in offers.items()
+        ]
+        order = _ORDER_RE.search(query)
+        if order:
+            descending = (order.group(2) or "ASC").upper() == "DESC"
+            present = [r for r in rows if r[2] is not None]
+            missing = [r for r in rows if r[2] is None]
+            rows = sorted(present, key=lambda r: r[2], reverse=descending) + missing
+        limit = _LIMIT_RE.search(query)
+        if limit:
+            rows = rows[:int(limit.group(1))]
+        return FakePager([_row(*r) for r in rows], request.page_size)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeReportsClient()
+    monkeypatch.setattr(reports, "get_reports_client", lambda: fake)
+    return fake
+
+
+def _query(tail=""):
+    return (
+        "SELECT date, offer_id, clicks FROM product_performance_view "
+        f"WHERE date BETWEEN '2026-01-01' AND '2026-01-10' {tail}"
+    ).strip()
+
+
+def _search(query, **kwargs):
+    async def main():
+        with use_account("111"):
+            return await reports.reports_search(query, **kwargs)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "tail",
+    [
+        "ORDER BY clicks DESC LIMIT 5",
+        "ORDER BY clicks ASC LIMIT 7",
+        "ORDER BY clicks LIMIT 40",
+        "ORDER BY clicks DESC",
+        "LIMIT 4",
+    ],
+)
+@pytest.mark.parametrize("shard_by", ["day", "week"])
+def test_sharded_rows_match_unsharded(client, tail, shard_by):
+    unsharded = _search(_query(tail))
+    sharded = _search(_query(tail), shard_by=shard_by, max_in_flight=3)
+
+    assert sharded["results"] == unsharded["results"]
+    assert sharded["shards"] == (10 if shard_by == "day" else 2)
+
+
+def test_order_by_desc_keeps_rows_without_a_value_last(client):
+    sharded = _search(_query("ORDER BY clicks DESC"), shard_by="week")["results"]
+
+    clicks = [r["product_performance_view"].get("clicks") for r in sharded]
+    assert clicks[-1] is None
+    values = [int(c) for c in clicks[:-1]]  # int64 renders as a JSON string
+    assert values == sorted(values, reverse=True)
+    assert len(clicks) == 31
+
+
+def test_each_shard_fetches_every_page_before_the_limit_is_applied(client):
+    query = _query("ORDER BY clicks DESC LIMIT 5")
+    rows, stats = asyncio.run(reports._run_sharded(query, "week", 2, page_size=2))
+
+    key, descending, limit = reports._merge_order(query)
+    assert (descending, limit) == (True, 5)
+    assert [key(r) for r in rows] == [100, 97, 94, 93, 90]
+    assert stats == {"shards": 2}
+    assert sorted(_RANGE_RE.search(q).groups() for q in client.queries) == [
+        ("2026-01-01", "2026-01-07"),
+        ("2026-01-08", "2026-01-10"),
+    ]
+
+
+def test_merge_order_without_order_by_or_limit():
+    assert reports._merge_order(_query()) == (None, False, None)
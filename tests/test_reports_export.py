@@ -0,0 +1,78 @@
+"""reports_export row limit: truncated only when rows beyond max_rows exist."""
+
+import asyncio
+import csv
+
+import pytest
+from google.shopping import merchant_reports_v1beta
+
+from tools import reports
+
+QUERY = (
+    "SELECT date, offer_id, clicks FROM product_performance_view "
+    "WHERE date BETWEEN '2026-01-01' AND '2026-01-01'"
+)
+
+
+class FakePager:
+    def __init__(self, pages):
+        self._pages = pages
+
+    @property
+    def pages(self):
+        return self._iter_pages()
+
+    async def _iter_pages(self):
+        for page in self._pages:
+            yield page
+
+
+class FakeReportsClient:
+    """Serves *total* rows in pages of *page_size*."""
+
+    def __init__(self, total, page_size):
+        rows = [
+            merchant_reports_v1beta.ReportRow(product_performance_view={
+                "date": {"year": 2026, "month": 1, "day": 1},
+                "offer_id": f"SKU-{i}",
+                "clicks": i,
+            })
+            for i in range(total)
+        ]
+        self.pages = [
+            merchant_reports_v1beta.SearchResponse(results=rows[i:i + page_size])
+            for i in range(0, total, page_size)
+        ]
+
+    async def search(self, request):
+        return FakePager(self.pages)
+
+
+def _export(monkeypatch, tmp_path, total, max_rows, page_size=3):
+    client = FakeReportsClient(total, page_size)
+    monkeypatch.setattr(reports, "get_reports_client", lambda: client)
+    path = str(tmp_path / "out.csv")
+    result = asyncio.run(reports.reports_export(QUERY, format="csv", path=path, max_rows=max_rows))
+    with open(path, newline="", encoding="utf-8") as fh:
+        written = list(csv.DictReader(fh))
+    return result, written
+
+
+@pytest.mark.parametrize(
+    ("total", "max_rows", "rows", "truncated"),
+    [
+        (6, None, 6, False),
+        (6, 6, 6, False),  # limit equals the row count, at a page boundary
+        (5, 5, 5, False),  # limit equals the row count, inside a page
+        (6, 10, 6, False),
+        (7, 6, 6, True),  # the extra row is on the next page
+        (6, 4, 4, True),
+        (6, 0, 0, True),
+    ],
+)
+def test_truncated_only_when_more_rows_exist(monkeypatch, tmp_path, total, max_rows, rows, truncated):
+    result, written = _export(monkeypatch, tmp_path, total, max_rows)
+
+    assert result["rowCount"] == len(written) == rows
+    assert result["truncated"] is truncated
+    assert [r["offer_id"] for r in written] == [f"SKU-{i}" for i in range(rows)]
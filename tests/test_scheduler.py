@@ -0,0 +1,115 @@
+"""Retry behaviour of tools/_scheduler.py against a throttling fake client."""
+
+import asyncio
+
+import httpx
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from tools import _scheduler
+from tools._scheduler import ScheduledClient, Scheduler
+
+
+class ThrottlingClient:
+    """Async client whose methods fail with the queued errors, then succeed."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = []
+
+    async def _call(self, name):
+        self.calls.append(name)
+        if self.errors:
+            raise self.errors.pop(0)
+        return name
+
+    async def get_product(self, request=None):
+        return await self._call("get_product")
+
+    async def insert_product_input(self, request=None):
+        return await self._call("insert_product_input")
+
+    async def insert_promotion(self, request=None):
+        return await self._call("insert_promotion")
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setenv("GMC_QPS", "1000")
+    monkeypatch.setenv("GMC_RETRY_ATTEMPTS", "3")
+    monkeypatch.delenv("GMC_SCHEDULER_DISABLED", raising=False)
+    monkeypatch.setattr(_scheduler, "_BACKOFF_BASE", 0.0)
+    fresh = Scheduler()
+    monkeypatch.setattr(_scheduler, "scheduler", fresh)
+    return fresh
+
+
+def _http_error(status, retry_after=None):
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    request = httpx.Request("POST", "http://fake/")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError("throttled", request=request, response=response)
+
+
+def test_read_is_retried_until_it_succeeds(scheduler):
+    fake = ThrottlingClient(api_exceptions.ResourceExhausted("quota"),
+                            api_exceptions.ServiceUnavailable("busy"))
+    client = ScheduledClient(fake, "products")
+    assert asyncio.run(client.get_product()) == "get_product"
+    assert len(fake.calls) == 3
+    stats = scheduler.stats()["products"]
+    assert (stats["throttled"], stats["retries"], stats["gaveUp"]) == (2, 2, 0)
+
+
+def test_gives_up_after_retry_attempts(scheduler):
+    fake = ThrottlingClient(*[api_exceptions.ResourceExhausted("quota")] * 5)
+    client = ScheduledClient(fake, "products")
+    with pytest.raises(api_exceptions.ResourceExhausted):
+        asyncio.run(client.get_product())
+    assert len(fake.calls) == 3
+    assert scheduler.stats()["products"]["gaveUp"] == 1
+
+
+def test_resource_exhausted_write_is_retried(scheduler):
+    fake = ThrottlingClient(api_exceptions.ResourceExhausted("quota"))
+    client = ScheduledClient(fake, "promotions")
+    assert asyncio.run(client.insert_promotion()) == "insert_promotion"
+    assert len(fake.calls) == 2
+
+
+def test_unavailable_create_is_not_retried(scheduler):
+    fake = ThrottlingClient(api_exceptions.ServiceUnavailable("busy"))
+    client = ScheduledClient(fake, "promotions")
+    with pytest.raises(api_exceptions.ServiceUnavailable):
+        asyncio.run(client.insert_promotion())
+    assert len(fake.calls) == 1
+    stats = scheduler.stats()["promotions"]
+    assert (stats["throttled"], stats["retries"]) == (1, 0)
+
+
+def test_unavailable_upsert_is_retried(scheduler):
+    fake = ThrottlingClient(api_exceptions.ServiceUnavailable("busy"))
+    client = ScheduledClient(fake, "products")
+    assert asyncio.run(client.insert_product_input()) == "insert_product_input"
+    assert len(fake.calls) == 2
+
+
+def test_rest_post_503_is_not_retried(scheduler):
+    fake = ThrottlingClient(_http_error(503))
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scheduler.call("rest", lambda: fake._call("post"), read=False))
+    assert len(fake.calls) == 1
+
+
+def test_rest_429_honours_retry_after(scheduler):
+    fake = ThrottlingClient(_http_error(429, "0.2"))
+    elapsed = asyncio.run(_timed(scheduler.call("rest", lambda: fake._call("post"), read=False)))
+    assert len(fake.calls) == 2
+    assert elapsed >= 0.2
+
+
+async def _timed(coro):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await coro
+    return loop.time() - started
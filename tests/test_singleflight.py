@@ -0,0 +1,128 @@
+"""Sharing, error fan-out and cancellation in tools/_cache.py coalescing."""
+
+import asyncio
+
+import pytest
+
+from tools._cache import SingleFlight, coalesced, singleflight
+from tools._common import use_account
+
+
+class Upstream:
+    """Async call that blocks until released, counting invocations."""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.release = None
+
+    async def __call__(self, value=0):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {"value": value, "call": self.calls}
+
+
+def _run(main):
+    return asyncio.run(main())
+
+
+def test_concurrent_identical_calls_share_one_upstream_call():
+    upstream = Upstream()
+    flight = SingleFlight()
+
+    async def main():
+        upstream.release = asyncio.Event()
+        callers = [asyncio.ensure_future(flight.do(("k",), upstream)) for _ in range(5)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        return await asyncio.gather(*callers)
+
+    results = _run(main)
+    assert upstream.calls == 1
+    assert results == [{"value": 0, "call": 1}] * 5
+    assert flight.stats()["upstreamCalls"] == 1 and flight.stats()["coalesced"] == 4
+    assert flight.stats()["inFlight"] == 0
+
+
+def test_different_keys_and_later_calls_are_not_shared():
+    upstream = Upstream()
+    flight = SingleFlight()
+
+    async def main():
+        upstream.release = asyncio.Event()
+        upstream.release.set()
+        first = await asyncio.gather(flight.do(("a",), upstream), flight.do(("b",), upstream))
+        later = await flight.do(("a",), upstream)
+        return first, later
+
+    _run(main)
+    assert upstream.calls == 3
+
+
+def test_exception_reaches_every_waiter():
+    upstream = Upstream(error=RuntimeError("upstream down"))
+    flight = SingleFlight()
+
+    async def main():
+        upstream.release = asyncio.Event()
+        callers = [asyncio.ensure_future(flight.do(("k",), upstream)) for _ in range(3)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = _run(main)
+    assert upstream.calls == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "upstream down" for r in results)
+    assert flight.stats()["inFlight"] == 0
+
+
+def test_cancelling_one_waiter_keeps_the_shared_call_running():
+    upstream = Upstream()
+    flight = SingleFlight()
+
+    async def main():
+        upstream.release = asyncio.Event()
+        impatient = asyncio.ensure_future(flight.do(("k",), upstream))
+        patient = asyncio.ensure_future(flight.do(("k",), upstream))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert _run(main) == {"value": 0, "call": 1}
+    assert upstream.calls == 1
+
+
+def test_coalesced_keys_include_arguments_and_account():
+    upstream = Upstream()
+
+    @coalesced
+    async def read(value=0):
+        return await upstream(value)
+
+    async def under(account, value):
+        with use_account(account):
+            return await read(value)
+
+    async def main():
+        upstream.release = asyncio.Event()
+        callers = [
+            asyncio.ensure_future(under("1", 7)),
+            asyncio.ensure_future(under("1", 7)),
+            asyncio.ensure_future(under("2", 7)),
+            asyncio.ensure_future(under("1", 8)),
+        ]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        return await asyncio.gather(*callers)
+
+    leaders = singleflight.leaders
+    results = _run(main)
+    assert upstream.calls == 3
+    assert singleflight.leaders - leaders == 3
+    assert results[0] == results[1]
@@ -0,0 +1,90 @@
+"""sync_product_inputs pushes only new and changed inputs (tools/_input_index.py)."""
+
+import asyncio
+import json
+
+import pytest
+
+from tools import products
+
+
+class FakeProductInputs:
+    """Records inserted offer ids and deleted input names; can reject offer ids."""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.inserted = []
+        self.deleted = []
+
+    async def insert_product_input(self, request=None):
+        offer_id = request.product_input.offer_id
+        if offer_id in self.reject:
+            raise RuntimeError("rejected")
+        self.inserted.append(offer_id)
+        return request.product_input
+
+    async def delete_product_input(self, request=None):
+        self.deleted.append(request.name.rsplit("/", 1)[-1])
+
+
+@pytest.fixture
+def feed(monkeypatch, tmp_path):
+    monkeypatch.setenv("GMC_INPUT_INDEX_DB", str(tmp_path / "inputs.sqlite3"))
+    path = tmp_path / "feed.ndjson"
+
+    def write(*records):
+        path.write_text("".join(json.dumps(r) + "\n" for r in records))
+        return str(path)
+
+    return write
+
+
+def _sync(monkeypatch, client, path, **kwargs):
+    monkeypatch.setattr(products, "get_product_inputs_client", lambda: client)
+    return asyncio.run(products.sync_product_inputs("123", path, max_per_second=1000, **kwargs))
+
+
+def _input(offer_id, title, snake=False):
+    if snake:
+        return {"product_attributes": {"title": title}, "feed_label": "US",
+                "content_language": "en", "offer_id": offer_id}
+    return {"offerId": offer_id, "contentLanguage": "en", "feedLabel": "US",
+            "productAttributes": {"title": title}}
+
+
+def test_only_new_and_changed_inputs_are_pushed(monkeypatch, feed):
+    first = FakeProductInputs()
+    result = _sync(monkeypatch, first, feed(_input("A", "Kettle"), _input("B", "Toaster")))
+    assert sorted(first.inserted) == ["A", "B"]
+    assert (result["new"], result["pushed"], result["indexedInputs"]) == (2, 2, 2)
+
+    # Same content with other key order and snake_case names is unchanged.
+    second = FakeProductInputs()
+    result = _sync(monkeypatch, second, feed(_input("A", "Kettle", snake=True), _input("B", "Toaster 2")))
+    assert second.inserted == ["B"]
+    assert (result["unchanged"], result["changed"], result["new"]) == (1, 1, 0)
+
+
+def test_inputs_missing_from_the_feed_are_deleted_and_forgotten(monkeypatch, feed):
+    _sync(monkeypatch, FakeProductInputs(), feed(_input("A", "Kettle"), _input("B", "Toaster")))
+
+    client = FakeProductInputs()
+    result = _sync(monkeypatch, client, feed(_input("A", "Kettle")))
+    assert client.deleted == ["en~US~B"]
+    assert (result["deleted"], result["indexedInputs"]) == (1, 1)
+
+    # B comes back: it is new again, not unchanged.
+    client = FakeProductInputs()
+    result = _sync(monkeypatch, client, feed(_input("A", "Kettle"), _input("B", "Toaster")))
+    assert client.inserted == ["B"] and result["new"] == 1
+
+
+def test_failed_push_is_not_recorded(monkeypatch, feed):
+    path = feed(_input("A", "Kettle"), _input("B", "Toaster"))
+    result = _sync(monkeypatch, FakeProductInputs(reject={"B"}), path)
+    assert (result["pushed"], result["failed"], result["indexedInputs"]) == (1, 1, 1)
+
+    retry = FakeProductInputs()
+    result = _sync(monkeypatch, retry, path)
+    assert retry.inserted == ["B"]
+    assert (result["unchanged"], result["new"]) == (1, 1)
@@ -13,28 +13,38 @@ from tools.account import (  # noqa: F401
     list_programs,
     get_program,
     enable_program,
+    list_sub_accounts,
+    fan_out,
+    sweep_account_health,
 )
 from tools.products import (  # noqa: F401
     list_products,
     get_product,
+    export_products,
     insert_product_input,
+    bulk_insert_product_inputs,
+    sync_product_inputs,
     delete_product_input,
     count_products_by_status,
 )
 from tools.support import (  # noqa: F401
     render_account_issues,
     render_product_issues,
+    render_product_issues_batch,
+    find_products_by_issue,
     trigger_issue_action,
 )
 from tools.reports import (  # noqa: F401
     reports_search,
     get_product_performance,
+    reports_export,
 )
 
 # --- P1: Operations ---
 from tools.inventory import (  # noqa: F401
     insert_local_inventory,
     insert_regional_inventory,
+    bulk_update_inventory,
 )
 from tools.promotions import (  # noqa: F401
     list_promotions,
@@ -57,3 +67,29 @@ from tools.collections import (  # noqa: F401
     create_collection,
 )
 from tools.recommendations import get_recommendations  # noqa: F401
+
+# --- Local feed files ---
+from tools.feeds import validate_feed  # noqa: F401
+
+# --- P2: Local catalog mirror ---
+from tools.catalog import (  # noqa: F401
+    sync_catalog,
+    query_catalog,
+)
+
+# --- Local report analytics ---
+from tools.analytics import (  # noqa: F401
+    load_report,
+    analyze_report,
+)
+
+# --- Diagnostics ---
+from tools.diagnostics import (  # noqa: F401
+    get_auth_stats,
+    get_startup_report,
+    get_cache_stats,
+    get_scheduler_stats,
+    get_metrics,
+    get_slowest_calls,
+    clear_cache,
+)
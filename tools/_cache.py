@@ -0,0 +1,202 @@
+"""In-process response cache for read-mostly account configuration tools.
+
+Reads are decorated with ``@cached(resource)`` and the matching writes with
+``@invalidates(resource)``. Entries expire after a per-resource TTL and the
+cache is LRU-bounded. Cached responses carry a ``_cache`` block
+(hit, ageSeconds, ttlSeconds) so agents can judge freshness.
+
+TTLs can be overridden with GMC_CACHE_TTL_<RESOURCE> (seconds);
+GMC_CACHE_DISABLED=1 turns caching off.
+
+Reads that are too fresh-sensitive to cache can still be ``@coalesced``:
+concurrent identical calls share one in-flight upstream request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from tools._common import account_name
+
+_DEFAULT_TTLS: Dict[str, float] = {
+    "account": 600.0,
+    "programs": 600.0,
+    "datasources": 300.0,
+    "shipping": 600.0,
+    "return_policies": 600.0,
+    "promotions": 300.0,
+}
+_MAX_ENTRIES = 256
+
+
+def _ttl(resource: str) -> float:
+    override = os.environ.get(f"GMC_CACHE_TTL_{resource.upper()}", "").strip()
+    return float(override) if override else _DEFAULT_TTLS.get(resource, 300.0)
+
+
+def _disabled() -> bool:
+    return os.environ.get("GMC_CACHE_DISABLED", "").strip() in ("1", "true", "yes")
+
+
+def call_key(fn: Callable, args: tuple, kwargs: dict) -> str:
+    """Normalized identity of a tool call: name + bound arguments incl. defaults."""
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return f"{fn.__name__}:" + json.dumps(bound.arguments, sort_keys=True, default=str)
+
+
+class ResponseCache:
+    """LRU cache of tool responses with per-entry expiry."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Tuple[float, float, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, ttl, _ = entry
+        if time.monotonic() - stored_at > ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Tuple[str, str, str], ttl: float, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, resource: Optional[str] = None, account: Optional[str] = None) -> int:
+        """Drop entries for *resource* (all resources if None) of *account* (all if None)."""
+        doomed = [
+            k for k in self._entries
+            if (resource is None or k[0] == resource) and (account is None or k[1] == account)
+        ]
+        for k in doomed:
+            del self._entries[k]
+        self.invalidations += len(doomed)
+        return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        by_resource: Dict[str, int] = {}
+        for resource, _, _ in self._entries:
+            by_resource[resource] = by_resource.get(resource, 0) + 1
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "byResource": by_resource,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else None,
+            "invalidations": self.invalidations,
+            "ttlSeconds": {r: _ttl(r) for r in _DEFAULT_TTLS},
+        }
+
+
+response_cache = ResponseCache()
+
+
+def cached(resource: str) -> Callable:
+    """Cache an async tool's dict response under *resource* for its TTL."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            if _disabled():
+                return await fn(*args, **kwargs)
+            key = (resource, account_name(), call_key(fn, args, kwargs))
+            entry = response_cache.get(key)
+            if entry is not None:
+                response_cache.hits += 1
+                stored_at, ttl, value = entry
+                age = time.monotonic() - stored_at
+                return {**value, "_cache": {"hit": True, "ageSeconds": round(age, 1), "ttlSeconds": ttl}}
+            response_cache.misses += 1
+            value = await fn(*args, **kwargs)
+            ttl = _ttl(resource)
+            response_cache.put(key, ttl, value)
+            return {**value, "_cache": {"hit": False, "ageSeconds": 0.0, "ttlSeconds": ttl}}
+
+        return wrapper
+
+    return decorator
+
+
+class SingleFlight:
+    """In-flight deduplication: identical concurrent calls await one shared task."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Tuple[Any, ...], fn: Callable[[], Any]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            # A separate task, so one caller being cancelled does not cancel the others.
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+
+            def done(t: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if not t.cancelled():
+                    t.exception()  # retrieved here in case every caller went away
+
+            task.add_done_callback(done)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "inFlight": len(self._inflight),
+            "upstreamCalls": self.leaders,
+            "coalesced": self.coalesced,
+            "coalescedRate": round(self.coalesced / calls, 3) if calls else None,
+        }
+
+
+singleflight = SingleFlight()
+
+
+def coalesced(fn: Callable) -> Callable:
+    """Share one upstream call among concurrent identical calls of an async tool."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (id(asyncio.get_running_loop()), account_name(), call_key(fn, args, kwargs))
+        return await singleflight.do(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
+
+
+def invalidates(*resources: str) -> Callable:
+    """Drop cached *resources* for the current account after a successful write."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await fn(*args, **kwargs)
+            for resource in resources:
+                response_cache.invalidate(resource, account_name())
+            return result
+
+        return wrapper
+
+    return decorator
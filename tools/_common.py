@@ -1,18 +1,49 @@
 """Shared client factories for the new Google Merchant API.
 
-Each sub-service has its own typed gRPC-backed client.
+Each sub-service has its own typed gRPC-backed async client.
 All resources are addressed as: accounts/{merchant_id}/...
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import functools
+import importlib
+import inspect
+import json
+import logging
 import os
-from typing import Any
+import threading
+import time
+import typing
+import weakref
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
 
 import google.auth
 
+from tools._metrics import instrument, metrics, start_prometheus
+from tools._profiling import profiler, timed_phase
+from tools._scheduler import PRIORITY_BULK, ScheduledClient, scheduler, write_priority
+
 _MERCHANT_SCOPE = "https://www.googleapis.com/auth/content"
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # Config helpers
@@ -26,9 +57,43 @@ def _require_env(name: str) -> str:
     return val
 
 
+# Account the current tool call acts on when it passed ``account``; see use_account.
+_account: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("gmc_account", default=None)
+
+
 def merchant_id() -> str:
-    """Return the GMC numeric Merchant ID from env."""
-    return _require_env("GMC_MERCHANT_ID")
+    """Return the numeric Merchant ID: the call's ``account`` argument, else GMC_MERCHANT_ID."""
+    return _account.get() or _require_env("GMC_MERCHANT_ID")
+
+
+def account_override() -> Optional[str]:
+    """The account selected for this call, or None when it uses GMC_MERCHANT_ID."""
+    return _account.get()
+
+
+def normalize_account(account: str) -> str:
+    """Accept '123' or 'accounts/123' and return the numeric ID."""
+    value = str(account).strip().removeprefix("accounts/")
+    if not value.isdigit():
+        raise ValueError(f"Invalid account {account!r}: expected a numeric ID or 'accounts/<id>'.")
+    return value
+
+
+@contextlib.contextmanager
+def use_account(account: Optional[str]) -> Iterator[None]:
+    """Run the block against *account* (sub-account ID); None keeps the current one.
+
+    Clients, the scheduler and caches are shared: gRPC channels do not depend
+    on the account and every cache key already includes account_name().
+    """
+    if account is None:
+        yield
+        return
+    token = _account.set(normalize_account(account))
+    try:
+        yield
+    finally:
+        _account.reset(token)
 
 
 def account_name() -> str:
@@ -36,155 +101,710 @@ def account_name() -> str:
     return f"accounts/{merchant_id()}"
 
 
+def api_endpoint() -> Optional[str]:
+    """gRPC endpoint override (GMC_API_ENDPOINT, e.g. 'localhost:50051') for proxies and emulators."""
+    return os.environ.get("GMC_API_ENDPOINT", "").strip() or None
+
+
+def insecure_api() -> bool:
+    """GMC_API_INSECURE=1: plaintext channel to GMC_API_ENDPOINT, no OAuth (local emulators only)."""
+    return bool(api_endpoint()) and os.environ.get("GMC_API_INSECURE", "").strip() in ("1", "true", "yes")
+
+
+def export_dir() -> str:
+    """Return the local directory for export files (GMC_EXPORT_DIR, default ./exports)."""
+    path = os.environ.get("GMC_EXPORT_DIR", "").strip() or "exports"
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class TokenManager:
+    """One set of OAuth credentials shared by the gRPC clients and REST paths.
+
+    The access token is cached and refreshed on a background timer shortly
+    before it expires, so callers almost never wait on the token endpoint.
+    """
+
+    def __init__(self, refresh_margin: float = 300.0, retry_delay: float = 30.0):
+        self.refresh_margin = refresh_margin
+        self.retry_delay = retry_delay
+        self.refreshes = 0
+        self.refreshes_avoided = 0
+        self.refresh_failures = 0
+        self._credentials: Any = None
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def credentials(self) -> Any:
+        if self._credentials is None:
+            with self._lock:
+                if self._credentials is None and insecure_api():
+                    from google.auth.credentials import AnonymousCredentials
+                    self._credentials = AnonymousCredentials()
+                elif self._credentials is None:
+                    self._credentials, _ = google.auth.default(scopes=[_MERCHANT_SCOPE])
+        return self._credentials
+
+    def _seconds_left(self) -> float:
+        expiry = self._credentials.expiry  # naive UTC datetime, or None
+        if expiry is None:
+            return float("inf") if self._credentials.token else 0.0
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return (expiry - now).total_seconds()
+
+    def token(self) -> str:
+        """Return a valid access token, refreshing only if it is about to expire."""
+        creds = self.credentials
+        if insecure_api():
+            return ""
+        with self._lock:
+            if creds.token and self._seconds_left() > self.refresh_margin:
+                self.refreshes_avoided += 1
+            else:
+                self._refresh_locked()
+            return creds.token
+
+    def _refresh_locked(self) -> None:
+        import google.auth.transport.requests
+        self._credentials.refresh(google.auth.transport.requests.Request())
+        self.refreshes += 1
+        self._schedule(self._seconds_left() - self.refresh_margin)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        if delay == float("inf"):
+            return
+        self._timer = threading.Timer(max(delay, 1.0), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self) -> None:
+        with self._lock:
+            try:
+                self._refresh_locked()
+            except Exception:
+                self.refresh_failures += 1
+                logger.warning("Background token refresh failed; retrying in %ss",
+                               self.retry_delay, exc_info=True)
+                self._schedule(self.retry_delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "refreshes": self.refreshes,
+            "refreshesAvoided": self.refreshes_avoided,
+            "refreshFailures": self.refresh_failures,
+            "secondsUntilExpiry": (
+                round(self._seconds_left()) if self._credentials is not None
+                and self._credentials.expiry else None
+            ),
+        }
+
+
+token_manager = TokenManager()
+
+
 def _get_credentials() -> Any:
-    credentials, _ = google.auth.default(scopes=[_MERCHANT_SCOPE])
-    return credentials
-
-
-def _get_credentials_and_token() -> str:
-    """Return a fresh OAuth2 Bearer token string for REST requests."""
-    import google.auth.transport.requests
-    from google.oauth2 import service_account
-    import os
-    sa_file = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-    if sa_file:
-        creds = service_account.Credentials.from_service_account_file(
-            sa_file, scopes=[_MERCHANT_SCOPE]
-        )
-    else:
-        creds, _ = google.auth.default(scopes=[_MERCHANT_SCOPE])
-    creds.refresh(google.auth.transport.requests.Request())
-    return creds.token
+    """Shared credentials; google-auth reuses their cached token on every RPC."""
+    return token_manager.credentials
+
+
+def get_access_token() -> str:
+    """Return a cached OAuth2 Bearer token string for REST requests."""
+    return token_manager.token()
 
 
 # ---------------------------------------------------------------------------
 # Per-sub-service client singletons
 # ---------------------------------------------------------------------------
-
-_clients: dict[str, Any] = {}
-
-
-def _get_client(key: str, factory_fn) -> Any:
-    if key not in _clients:
-        _clients[key] = factory_fn(_get_credentials())
-    return _clients[key]
+#
+# Tools are ``async def`` and run on the MCP server's event loop, so every
+# getter returns the ``*ServiceAsyncClient`` variant. grpc.aio channels are
+# bound to the loop they were created on, hence one client cache per loop.
+
+_CLIENT_SPECS: dict[str, tuple[str, str]] = {
+    "products": ("google.shopping.merchant_products_v1", "ProductsServiceAsyncClient"),
+    "product_inputs": ("google.shopping.merchant_products_v1", "ProductInputsServiceAsyncClient"),
+    "datasources": ("google.shopping.merchant_datasources_v1", "DataSourcesServiceAsyncClient"),
+    "reports": ("google.shopping.merchant_reports_v1beta", "ReportServiceAsyncClient"),
+    "accounts": ("google.shopping.merchant_accounts_v1beta", "AccountsServiceAsyncClient"),
+    "account_issues": ("google.shopping.merchant_accounts_v1beta", "AccountIssueServiceAsyncClient"),
+    "programs": ("google.shopping.merchant_accounts_v1beta", "ProgramsServiceAsyncClient"),
+    "shipping": ("google.shopping.merchant_accounts_v1beta", "ShippingSettingsServiceAsyncClient"),
+    "return_policy": ("google.shopping.merchant_accounts_v1beta", "OnlineReturnPolicyServiceAsyncClient"),
+    "local_inventory": ("google.shopping.merchant_inventories_v1beta", "LocalInventoryServiceAsyncClient"),
+    "regional_inventory": ("google.shopping.merchant_inventories_v1beta", "RegionalInventoryServiceAsyncClient"),
+    "promotions": ("google.shopping.merchant_promotions_v1", "PromotionsServiceAsyncClient"),
+    "issueresolution": ("google.shopping.merchant_issueresolution_v1beta", "IssueResolutionServiceAsyncClient"),
+}
+
+_import_module = importlib.import_module
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_client(key: str) -> Any:
+    """Return the async client for *key*, built once per running event loop.
+
+    Calls go through the shared scheduler (pacing, priority, retry on quota
+    errors); see tools/_scheduler.py.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    if key not in clients:
+        module_name, class_name = _CLIENT_SPECS[key]
+        client_cls = getattr(_import_module(module_name), class_name)
+        endpoint = api_endpoint()
+        if endpoint and insecure_api():
+            import grpc
+            transport = client_cls.get_transport_class("grpc_asyncio")(
+                channel=grpc.aio.insecure_channel(endpoint)
+            )
+            clients[key] = client_cls(transport=transport)
+        elif endpoint:
+            clients[key] = client_cls(
+                credentials=_get_credentials(), client_options={"api_endpoint": endpoint}
+            )
+        else:
+            clients[key] = client_cls(credentials=_get_credentials())
+    return ScheduledClient(clients[key], key)
 
 
 def get_products_client():
-    """Products read client (ProductsServiceClient)."""
-    from google.shopping import merchant_products_v1
-    return _get_client(
-        "products",
-        lambda creds: merchant_products_v1.ProductsServiceClient(credentials=creds),
-    )
+    """Products read client (ProductsServiceAsyncClient)."""
+    return _get_client("products")
 
 
 def get_product_inputs_client():
-    """Product inputs write client (ProductInputsServiceClient)."""
-    from google.shopping import merchant_products_v1
-    return _get_client(
-        "product_inputs",
-        lambda creds: merchant_products_v1.ProductInputsServiceClient(credentials=creds),
-    )
+    """Product inputs write client (ProductInputsServiceAsyncClient)."""
+    return _get_client("product_inputs")
 
 
 def get_datasources_client():
-    """Data sources client (DataSourcesServiceClient)."""
-    from google.shopping import merchant_datasources_v1
-    return _get_client(
-        "datasources",
-        lambda creds: merchant_datasources_v1.DataSourcesServiceClient(credentials=creds),
-    )
+    """Data sources client (DataSourcesServiceAsyncClient)."""
+    return _get_client("datasources")
 
 
 def get_reports_client():
-    """Reports client (ReportServiceClient)."""
-    from google.shopping import merchant_reports_v1beta
-    return _get_client(
-        "reports",
-        lambda creds: merchant_reports_v1beta.ReportServiceClient(credentials=creds),
-    )
+    """Reports client (ReportServiceAsyncClient)."""
+    return _get_client("reports")
 
 
 def get_accounts_client():
-    """Accounts client (AccountsServiceClient)."""
-    from google.shopping import merchant_accounts_v1beta
-    return _get_client(
-        "accounts",
-        lambda creds: merchant_accounts_v1beta.AccountsServiceClient(credentials=creds),
-    )
+    """Accounts client (AccountsServiceAsyncClient)."""
+    return _get_client("accounts")
 
 
 def get_accounts_issues_client():
-    """Account issues client (AccountIssueServiceClient)."""
-    from google.shopping import merchant_accounts_v1beta
-    return _get_client(
-        "account_issues",
-        lambda creds: merchant_accounts_v1beta.AccountIssueServiceClient(credentials=creds),
-    )
+    """Account issues client (AccountIssueServiceAsyncClient)."""
+    return _get_client("account_issues")
 
 
 def get_programs_client():
-    """Programs client (ProgramsServiceClient) — Shopping Ads, Free Listings."""
-    from google.shopping import merchant_accounts_v1beta
-    return _get_client(
-        "programs",
-        lambda creds: merchant_accounts_v1beta.ProgramsServiceClient(credentials=creds),
-    )
+    """Programs client (ProgramsServiceAsyncClient) — Shopping Ads, Free Listings."""
+    return _get_client("programs")
 
 
 def get_shipping_client():
     """Shipping settings client."""
-    from google.shopping import merchant_accounts_v1beta
-    return _get_client(
-        "shipping",
-        lambda creds: merchant_accounts_v1beta.ShippingSettingsServiceClient(credentials=creds),
-    )
+    return _get_client("shipping")
 
 
 def get_return_policy_client():
     """Online return policy client."""
-    from google.shopping import merchant_accounts_v1beta
-    return _get_client(
-        "return_policy",
-        lambda creds: merchant_accounts_v1beta.OnlineReturnPolicyServiceClient(credentials=creds),
-    )
+    return _get_client("return_policy")
 
 
 def get_local_inventory_client():
     """Local inventory client."""
-    from google.shopping import merchant_inventories_v1beta
-    return _get_client(
-        "local_inventory",
-        lambda creds: merchant_inventories_v1beta.LocalInventoryServiceClient(credentials=creds),
-    )
+    return _get_client("local_inventory")
 
 
 def get_regional_inventory_client():
     """Regional inventory client."""
-    from google.shopping import merchant_inventories_v1beta
-    return _get_client(
-        "regional_inventory",
-        lambda creds: merchant_inventories_v1beta.RegionalInventoryServiceClient(credentials=creds),
-    )
+    return _get_client("regional_inventory")
 
 
 def get_promotions_client():
     """Promotions client."""
-    from google.shopping import merchant_promotions_v1
-    return _get_client(
-        "promotions",
-        lambda creds: merchant_promotions_v1.PromotionsServiceClient(credentials=creds),
-    )
+    return _get_client("promotions")
 
 
 def get_issueresolution_client():
     """Issue resolution client (render issues + trigger actions)."""
-    from google.shopping import merchant_issueresolution_v1beta
-    return _get_client(
-        "issueresolution",
-        lambda creds: merchant_issueresolution_v1beta.IssueResolutionServiceClient(credentials=creds),
+    return _get_client("issueresolution")
+
+
+def to_message(message_cls: Any, value: Any) -> Any:
+    """Build a proto-plus message from an API-shaped dict.
+
+    Accepts both JSON (camelCase) and proto (snake_case) field names, so the
+    dict shapes documented on the tools can be passed straight through.
+    """
+    if not isinstance(value, dict):
+        return value
+    from google.protobuf import json_format
+    return message_cls.wrap(json_format.ParseDict(value, message_cls.pb()()))
+
+
+def to_micros(amount: Any) -> int:
+    """Convert a decimal amount ('49.99', 49.99) to Merchant API micros."""
+    return int((Decimal(str(amount).strip()) * 1_000_000).to_integral_value(ROUND_HALF_UP))
+
+
+def parse_price(value: Any, default_currency: Optional[str] = None) -> Dict[str, str]:
+    """Parse '49.99 EUR' / 'EUR 49.99' / '49.99' into {amountMicros, currencyCode}."""
+    amount, currency = value, default_currency
+    if isinstance(value, str):
+        parts = value.replace(",", ".").split()
+        amount = parts[0] if parts else ""
+        if len(parts) == 2:
+            amount, currency = (parts[1], parts[0]) if parts[0].isalpha() else parts
+    if not currency:
+        raise ValueError(f"Price {value!r} has no currency and no default currency was given")
+    try:
+        micros = to_micros(amount)
+    except InvalidOperation:
+        raise ValueError(f"Invalid price {value!r}") from None
+    return {"amountMicros": str(micros), "currencyCode": str(currency).upper()}
+
+
+def iter_json_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield dict records from a local .ndjson/.jsonl file (streamed) or .json array."""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as fh:
+            records = json.load(fh)
+        if not isinstance(records, list):
+            raise ValueError(f"{path}: expected a JSON array of objects")
+        yield from records
+        return
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+# ---------------------------------------------------------------------------
+# Fast message -> dict / JSON conversion
+# ---------------------------------------------------------------------------
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional dependency, stdlib json fallback
+    _orjson = None
+
+# (message full name, enums as ints, proto field names) -> converter
+_converters: Dict[tuple, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _scalar_converter(field: Any, use_integers_for_enums: bool) -> Callable[[Any], Any]:
+    import base64
+    import math
+
+    from google.protobuf import descriptor
+    from google.protobuf.internal import type_checkers
+
+    fd = descriptor.FieldDescriptor
+    cpp_type = field.cpp_type
+    if cpp_type == fd.CPPTYPE_ENUM:
+        if use_integers_for_enums:
+            return int
+        names = {v.number: v.name for v in field.enum_type.values}
+        return lambda v: names.get(v, v)
+    if field.type == fd.TYPE_BYTES:
+        return lambda v: base64.b64encode(v).decode("utf-8")
+    if cpp_type in (fd.CPPTYPE_INT64, fd.CPPTYPE_UINT64):
+        return str
+    if cpp_type in (fd.CPPTYPE_FLOAT, fd.CPPTYPE_DOUBLE):
+        shorten = type_checkers.ToShortestFloat if cpp_type == fd.CPPTYPE_FLOAT else (lambda v: v)
+
+        def convert_float(v: float) -> Any:
+            if math.isinf(v):
+                return "-Infinity" if v < 0 else "Infinity"
+            if math.isnan(v):
+                return "NaN"
+            return shorten(v)
+
+        return convert_float
+    if cpp_type == fd.CPPTYPE_BOOL:
+        return bool
+    return _identity
+
+
+def _message_converter(
+    descriptor: Any, use_integers_for_enums: bool, preserving_proto_field_name: bool
+) -> Callable[[Any], Dict[str, Any]]:
+    """Converter for one message type with all per-field decisions made up front.
+
+    Mirrors json_format.MessageToDict as called by proto-plus to_dict: fields
+    without presence are always printed, int64 values are strings.
+    """
+    key = (descriptor.full_name, use_integers_for_enums, preserving_proto_field_name)
+    converter = _converters.get(key)
+    if converter is not None:
+        return converter
+    from google.protobuf import json_format
+
+    if descriptor.full_name.startswith("google.protobuf."):  # well-known types have special JSON forms
+        def convert_wkt(message: Any) -> Any:
+            return json_format.MessageToDict(
+                message,
+                preserving_proto_field_name=preserving_proto_field_name,
+                use_integers_for_enums=use_integers_for_enums,
+                always_print_fields_with_no_presence=True,
+            )
+
+        _converters[key] = convert_wkt
+        return convert_wkt
+
+    fields: Dict[str, tuple] = {}  # proto field name -> (output name, converter)
+    defaults: List[tuple] = []  # (output name, default value, factory) for fields without presence
+
+    def convert(message: Any) -> Dict[str, Any]:
+        out = {}
+        for field, value in message.ListFields():
+            name, fn = fields[field.name]
+            out[name] = fn(value)
+        for name, default, factory in defaults:
+            if name not in out:
+                out[name] = factory() if factory else default
+        return out
+
+    # Registered before the fields are compiled so recursive types resolve to it.
+    _converters[key] = convert
+    options = (use_integers_for_enums, preserving_proto_field_name)
+    for field in descriptor.fields:
+        name = field.name if preserving_proto_field_name else field.json_name
+        repeated = getattr(field, "is_repeated", None)  # protobuf >= 5.28; older: label
+        if repeated is None:
+            repeated = field.label == field.LABEL_REPEATED
+        message_type = field.message_type
+        if repeated and message_type is not None and message_type.GetOptions().map_entry:
+            value_field = message_type.fields_by_name["value"]
+            if value_field.message_type is not None:
+                value_fn = _message_converter(value_field.message_type, *options)
+            else:
+                value_fn = _scalar_converter(value_field, use_integers_for_enums)
+            fn = lambda m, value_fn=value_fn: {  # noqa: E731
+                (("true" if k else "false") if isinstance(k, bool) else str(k)): value_fn(v)
+                for k, v in m.items()
+            }
+            defaults.append((name, None, dict))
+        else:
+            if message_type is not None:
+                item = _message_converter(message_type, *options)
+            else:
+                item = _scalar_converter(field, use_integers_for_enums)
+            if repeated:
+                fn = list if item is _identity else (lambda m, item=item: [item(v) for v in m])
+                defaults.append((name, None, list))
+            else:
+                fn = item
+                if message_type is None and not field.has_presence:
+                    defaults.append((name, item(field.default_value), None))
+        fields[field.name] = (name, fn)
+    return convert
+
+
+def message_to_dict(
+    message: Any,
+    *,
+    use_integers_for_enums: bool = True,
+    preserving_proto_field_name: bool = True,
+) -> Dict[str, Any]:
+    """Same dict as ``type(message).to_dict(message)``, via cached per-type converters.
+
+    Accepts proto-plus wrappers and raw protobuf messages.
+    """
+    pb = type(message).pb(message) if hasattr(type(message), "pb") else message
+    converter = _message_converter(pb.DESCRIPTOR, use_integers_for_enums, preserving_proto_field_name)
+    return converter(pb)
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "DESCRIPTOR") or hasattr(type(value), "pb"):
+        return message_to_dict(value)
+    return str(value)
+
+
+def to_json(value: Any) -> bytes:
+    """Compact UTF-8 JSON bytes; messages anywhere in *value* are converted inline.
+
+    Uses orjson when installed, the stdlib json module otherwise.
+    """
+    if _orjson is not None:
+        return _orjson.dumps(value, default=_json_default)
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Opt-in warm-up (imports, credentials, channels) while the MCP handshake runs
+# ---------------------------------------------------------------------------
+
+_warmup_enabled = False
+startup_report: Dict[str, Any] = {"enabled": False}
+
+
+def enable_warmup() -> None:
+    """Warm up all sub-service clients in the background once the server starts."""
+    global _warmup_enabled
+    _warmup_enabled = True
+
+
+async def _warm_up_client(key: str, connect_timeout: float) -> Dict[str, Any]:
+    timings: Dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(importlib.import_module, _CLIENT_SPECS[key][0])
+        timings["importMs"] = round((time.perf_counter() - started) * 1000, 1)
+        mark = time.perf_counter()
+        client = _get_client(key)
+        timings["clientMs"] = round((time.perf_counter() - mark) * 1000, 1)
+        mark = time.perf_counter()
+        await asyncio.wait_for(client.transport.grpc_channel.channel_ready(), connect_timeout)
+        timings["connectMs"] = round((time.perf_counter() - mark) * 1000, 1)
+    except Exception as exc:
+        timings["error"] = error_key(exc)
+    timings["totalMs"] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+
+async def warm_up_clients(connect_timeout: float = 10.0) -> Dict[str, Any]:
+    """Import, authenticate and connect every sub-service client concurrently.
+
+    Returns (and stores in ``startup_report``) a per-sub-service breakdown of
+    import, client construction and channel connect times.
+    """
+    started = time.perf_counter()
+    startup_report.update({"enabled": True, "status": "running", "services": {}})
+    auth = asyncio.create_task(asyncio.to_thread(get_access_token))
+    results = await asyncio.gather(
+        *(_warm_up_client(key, connect_timeout) for key in _CLIENT_SPECS)
     )
+    try:
+        await auth
+        auth_status: Any = "ok"
+    except Exception as exc:
+        auth_status = error_key(exc)
+    startup_report.update({
+        "status": "done",
+        "auth": auth_status,
+        "services": dict(zip(_CLIENT_SPECS, results)),
+        "totalMs": round((time.perf_counter() - started) * 1000, 1),
+    })
+    for key, timings in startup_report["services"].items():
+        logger.info("warm-up %-20s %s", key, timings)
+    logger.info("warm-up finished in %sms", startup_report["totalMs"])
+    return startup_report
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(server: Any) -> AsyncIterator[Dict[str, Any]]:
+    task = asyncio.create_task(warm_up_clients()) if _warmup_enabled else None
+    metrics_port = os.environ.get("GMC_METRICS_PORT", "").strip()
+    exporter = await start_prometheus(int(metrics_port)) if metrics_port else None
+    try:
+        yield {}
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+        if exporter is not None:
+            exporter.close()
+
+
+# ---------------------------------------------------------------------------
+# Shared REST transport (endpoints without a stable gRPC client)
+# ---------------------------------------------------------------------------
+#
+# One pooled httpx.AsyncClient per event loop: keep-alive connections are
+# reused across collections, recommendations and return-policy calls instead
+# of paying a TCP + TLS handshake per request. gzip is negotiated by default;
+# HTTP/2 is used when GMC_HTTP2=1 and the optional 'h2' package is installed.
+
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def rest_base_url() -> str:
+    """Merchant API REST root (GMC_REST_BASE_URL, default the public endpoint)."""
+    return os.environ.get("GMC_REST_BASE_URL", "").strip().rstrip("/") or (
+        "https://merchantapi.googleapis.com"
+    )
+
+
+def _http2_enabled() -> bool:
+    if os.environ.get("GMC_HTTP2", "").strip() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("GMC_HTTP2 is set but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def get_http_client() -> Any:
+    """Pooled keep-alive httpx.AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        import httpx
+        client = httpx.AsyncClient(
+            base_url=rest_base_url(),
+            http2=_http2_enabled(),
+            timeout=httpx.Timeout(float(os.environ.get("GMC_HTTP_TIMEOUT", "30")), connect=10.0),
+            limits=httpx.Limits(
+                max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0
+            ),
+            verify=os.environ.get("GMC_REST_CA_BUNDLE") or True,
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def rest_request(
+    method: str,
+    path: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    json_body: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Authenticated JSON request against the Merchant API REST root.
+
+    Args:
+        method: HTTP method.
+        path: Path below the REST root, e.g. 'collections/v1beta/accounts/1/collections'.
+        params: Query parameters (lists repeat the key).
+        json_body: Request body, sent as JSON.
+    """
+    token = await asyncio.to_thread(get_access_token)
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    client = get_http_client()
+
+    async def send() -> Any:
+        resp = await client.request(
+            method,
+            f"/{path.lstrip('/')}",
+            params=params,
+            json=json_body,
+            headers=headers,
+        )
+        resp.raise_for_status()
+        return resp
+
+    resp = await scheduler.call(
+        "rest", send, read=method.upper() == "GET", idempotent=method.upper() in ("PUT", "DELETE")
+    )
+    return resp.json() if resp.content else {}
+
+
+# ---------------------------------------------------------------------------
+# Bounded concurrency for bulk / fan-out tools
+# ---------------------------------------------------------------------------
+
+class Pacer:
+    """Spaces calls out to at most *qps* per second, shared by all workers."""
+
+    def __init__(self, qps: float):
+        self.qps = qps
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next)
+        self._next = start + 1.0 / self.qps
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def error_key(exc: Exception) -> str:
+    """Short error label (exception type and message), also used to group bulk failures."""
+    message = str(exc)[:200]
+    return f"{type(exc).__name__}: {message}" if message else type(exc).__name__
+
+
+def summarize_failures(failures: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    """Failed item ids grouped by error, most frequent first (5 sample ids each)."""
+    return [
+        {"error": error, "count": len(ids), "sampleIds": ids[:5]}
+        for error, ids in sorted(failures.items(), key=lambda kv: -len(kv[1]))
+    ]
+
+
+async def run_bounded(
+    items: Iterable[Any] | AsyncIterable[Any],
+    fn: Callable[[Any], Awaitable[Any]],
+    *,
+    concurrency: int = 8,
+    pacer: Optional[Pacer] = None,
+) -> AsyncIterator[tuple[Any, Any, Optional[Exception]]]:
+    """Run ``fn(item)`` with at most *concurrency* calls in flight.
+
+    Items are pulled lazily from *items* (sync or async iterable) through a
+    small queue, so memory stays bounded for arbitrarily long inputs. Yields
+    ``(item, result, error)`` tuples in completion order; a failing call never
+    stops the others.
+    """
+    concurrency = max(1, concurrency)
+    done = object()
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def produce() -> None:
+        error: Optional[Exception] = None
+        try:
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    await inbox.put(item)
+            else:
+                for item in items:
+                    await inbox.put(item)
+        except Exception as exc:
+            error = exc
+        for _ in range(concurrency):
+            await inbox.put(done)
+        if error is not None:
+            raise error
+
+    async def work() -> None:
+        write_priority.set(PRIORITY_BULK)  # queued behind interactive calls
+        while (item := await inbox.get()) is not done:
+            if pacer is not None:
+                await pacer.wait()
+            try:
+                result = await fn(item)
+            except Exception as exc:
+                await outbox.put((item, None, exc))
+            else:
+                await outbox.put((item, result, None))
+        await outbox.put(done)
+
+    producer = asyncio.create_task(produce())
+    workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        finished = 0
+        while finished < concurrency:
+            out = await outbox.get()
+            if out is done:
+                finished += 1
+            else:
+                yield out
+        await producer  # re-raise input errors (e.g. unreadable file)
+    finally:
+        for task in (producer, *workers):
+            task.cancel()
 
 
 # ---------------------------------------------------------------------------
@@ -193,4 +813,93 @@ def get_issueresolution_client():
 
 from mcp.server.fastmcp import FastMCP  # noqa: E402
 
-mcp = FastMCP("Google Merchant Center")
+if profiler.enabled:
+    # GMC_PROFILE=1: attribute time to phases; see tools/_profiling.py.
+    profiler.install_import_hook()
+    _import_module = timed_phase("import", _import_module)
+    _get_credentials = timed_phase("auth", _get_credentials)
+    get_access_token = timed_phase("auth", get_access_token)
+    message_to_dict = timed_phase("convert", message_to_dict)
+    to_json = timed_phase("convert", to_json)
+
+
+_ACCOUNT_PARAMETER_DOC = "Merchant Center (sub-)account ID to act on. Defaults to GMC_MERCHANT_ID."
+
+
+def account_independent(fn: Callable) -> Callable:
+    """Mark a tool that does not talk to a Merchant Center account (no ``account`` argument)."""
+    fn.account_independent = True  # type: ignore[attr-defined]
+    return fn
+
+
+def _with_account(fn: Callable) -> Callable:
+    """Add an optional keyword ``account`` to a tool; the call runs under use_account."""
+    from pydantic import Field
+
+    hints = typing.get_type_hints(fn, include_extras=True)
+    signature = inspect.signature(fn)
+    parameters = [p.replace(annotation=hints.get(p.name, p.annotation)) for p in signature.parameters.values()]
+    parameters.append(inspect.Parameter(
+        "account",
+        inspect.Parameter.KEYWORD_ONLY,
+        default=None,
+        annotation=typing.Annotated[Optional[str], Field(description=_ACCOUNT_PARAMETER_DOC)],
+    ))
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, account: Optional[str] = None, **kwargs: Any) -> Any:
+        with use_account(account):
+            return await fn(*args, **kwargs)
+
+    wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=parameters, return_annotation=hints.get("return", signature.return_annotation)
+    )
+    return wrapper
+
+
+def _rendered_bytes(rendered: Any) -> int:
+    """Size of the text content FastMCP rendered for a tool result (no re-encoding of the result)."""
+    blocks = rendered[0] if isinstance(rendered, tuple) else rendered
+    if isinstance(blocks, dict):
+        blocks = []
+    return sum(len(text.encode("utf-8")) for b in blocks if (text := getattr(b, "text", None)) is not None)
+
+
+class _InstrumentedFastMCP(FastMCP):
+    """FastMCP whose tools take an optional ``account`` and record metrics.
+
+    Every account-bound tool gets an ``account`` keyword (see use_account) and
+    records latency, errors and upstream RPCs; dispatch records the size of
+    the response FastMCP rendered. Only the
+    registered callable is wrapped; ``@mcp.tool()`` still returns the plain
+    function, so tools calling each other are not double counted.
+    ``tool_functions`` maps names to the registered callables for fan-out.
+    With GMC_PROFILE=1, dispatch also goes through the profiler.
+    See tools/_metrics.py and tools/_profiling.py.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.tool_functions: Dict[str, Callable[..., Awaitable[Any]]] = {}
+
+    def add_tool(self, fn: Any, name: Optional[str] = None, **kwargs: Any) -> None:
+        name = name or fn.__name__
+        if inspect.iscoroutinefunction(fn):
+            if not getattr(fn, "account_independent", False):
+                fn = _with_account(fn)
+            fn = instrument(name, fn)
+            if profiler.enabled:
+                fn = profiler.mark_returned(fn)
+            self.tool_functions[name] = fn
+        super().add_tool(fn, name=name, **kwargs)
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        if not profiler.enabled:
+            rendered = await super().call_tool(name, arguments)
+        else:
+            rendered = await profiler.call(name, functools.partial(super().call_tool, name, arguments))
+        metrics.record_size(name, _rendered_bytes(rendered))
+        return rendered
+
+
+mcp = _InstrumentedFastMCP("Google Merchant Center", lifespan=_lifespan)
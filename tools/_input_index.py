@@ -0,0 +1,105 @@
+"""Persistent index of product inputs pushed by sync_product_inputs.
+
+One row per (account, data source, product input) holds a hash of the
+normalized ProductInput as last pushed successfully. The next sync hashes
+the feed again and only sends inputs whose hash is new or different.
+Inputs that are indexed but missing from the feed are deleted.
+
+Inputs are normalized by parsing them into the ProductInput message and
+serializing it deterministically. Key order, camelCase vs. snake_case
+field names and numbers given as strings therefore do not count as
+changes.
+
+GMC_INPUT_INDEX_DB sets the file (default ./input_index.sqlite3).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS product_inputs (
+    account      TEXT NOT NULL,
+    data_source  TEXT NOT NULL,
+    input_id     TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    pushed_at    REAL NOT NULL,
+    PRIMARY KEY (account, data_source, input_id)
+);
+CREATE TEMP TABLE IF NOT EXISTS seen (input_id TEXT PRIMARY KEY);
+"""
+
+
+def index_path() -> str:
+    return os.environ.get("GMC_INPUT_INDEX_DB", "").strip() or "input_index.sqlite3"
+
+
+def content_hash(message: Any) -> str:
+    """Hash of a raw ProductInput message's deterministic serialization."""
+    return hashlib.blake2b(message.SerializeToString(deterministic=True), digest_size=16).hexdigest()
+
+
+class InputIndex:
+    """Last pushed hash per product input of one account and data source.
+
+    ``mark_seen`` records the inputs of the current feed in a temporary
+    table, so ``missing`` can list the deletions without holding every key
+    of a large feed in memory.
+    """
+
+    def __init__(self, account: str, data_source: str, path: Optional[str] = None):
+        self.account = account
+        self.data_source = data_source
+        self.path = path or index_path()
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute("DELETE FROM seen")
+
+    def hashes(self, input_ids: List[str]) -> Dict[str, str]:
+        placeholders = ",".join("?" * len(input_ids))
+        return dict(self.conn.execute(
+            f"SELECT input_id, content_hash FROM product_inputs WHERE account = ? AND data_source = ? "
+            f"AND input_id IN ({placeholders})",
+            (self.account, self.data_source, *input_ids),
+        ))
+
+    def mark_seen(self, input_ids: Iterable[str]) -> None:
+        self.conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)", ((i,) for i in input_ids))
+
+    def missing(self) -> List[str]:
+        """Indexed inputs that were not in the feed marked as seen."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT input_id FROM product_inputs WHERE account = ? AND data_source = ? "
+            "AND input_id NOT IN (SELECT input_id FROM seen)",
+            (self.account, self.data_source),
+        )]
+
+    def record(self, pushed: List[Tuple[str, str]]) -> None:
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO product_inputs VALUES (?, ?, ?, ?, ?)",
+            ((self.account, self.data_source, input_id, h, now) for input_id, h in pushed),
+        )
+        self.conn.commit()
+
+    def forget(self, input_ids: List[str]) -> None:
+        self.conn.executemany(
+            "DELETE FROM product_inputs WHERE account = ? AND data_source = ? AND input_id = ?",
+            ((self.account, self.data_source, i) for i in input_ids),
+        )
+        self.conn.commit()
+
+    def size(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM product_inputs WHERE account = ? AND data_source = ?",
+            (self.account, self.data_source),
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
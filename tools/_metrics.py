@@ -0,0 +1,280 @@
+"""Always-on tool and upstream RPC metrics.
+
+Every tool registered on ``mcp`` is wrapped by ``instrument`` (see the
+FastMCP subclass in tools/_common.py). The wrapper records call and error
+counts and a latency histogram; dispatch adds a response-size histogram of
+the text FastMCP already rendered for the client, so results are never
+encoded twice. Each upstream attempt made through the scheduler is recorded per
+sub-service, and is also counted against the tool that issued it. That tool
+is tracked in a contextvar, so run_bounded workers and coalesced calls are
+attributed correctly.
+
+Histograms use fixed buckets (one bisect per observation), so recording
+costs a few microseconds and can stay on in production. Quantiles in
+``stats()`` are interpolated within buckets.
+
+Exposed through the get_metrics tool, and as Prometheus text on
+127.0.0.1:GMC_METRICS_PORT when that variable is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextvars
+import functools
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from tools._profiling import add_phase
+
+# Seconds: 1 ms .. 2 min.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+# Bytes: 256 B .. 64 MiB, powers of four.
+SIZE_BUCKETS: Tuple[float, ...] = tuple(float(256 * 4 ** k) for k in range(10))
+
+# Tool whose call is running in this task; upstream RPCs are attributed to it.
+current_tool: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "gmc_current_tool", default=None
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the *q* quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, total = [], 0
+        for bound, n in zip((*self.bounds, math.inf), self.counts):
+            total += n
+            out.append(("+Inf" if bound == math.inf else repr(bound), total))
+        return out
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "latency", "size", "rpcs")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.rpcs: Dict[str, int] = {}
+
+
+class _RpcStats:
+    __slots__ = ("calls", "errors", "latency")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+class Metrics:
+    """Registry of per-tool and per-sub-service statistics."""
+
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.tools: Dict[str, _ToolStats] = {}
+        self.rpcs: Dict[str, _RpcStats] = {}
+
+    def tool(self, name: str) -> _ToolStats:
+        stats = self.tools.get(name)
+        if stats is None:
+            stats = self.tools[name] = _ToolStats()
+        return stats
+
+    def record_size(self, tool: str, nbytes: int) -> None:
+        self.tool(tool).size.observe(nbytes)
+
+    def record_rpc(self, service: str, seconds: float, ok: bool) -> None:
+        stats = self.rpcs.get(service)
+        if stats is None:
+            stats = self.rpcs[service] = _RpcStats()
+        stats.calls += 1
+        stats.errors += not ok
+        stats.latency.observe(seconds)
+        tool = current_tool.get()
+        if tool is not None:
+            per_tool = self.tool(tool).rpcs
+            per_tool[service] = per_tool.get(service, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        tools = {}
+        for name, s in sorted(self.tools.items()):
+            if not s.calls:
+                continue
+            tools[name] = {
+                "calls": s.calls,
+                "errors": s.errors,
+                "p50Ms": _ms(s.latency.quantile(0.5)),
+                "p95Ms": _ms(s.latency.quantile(0.95)),
+                "p99Ms": _ms(s.latency.quantile(0.99)),
+                "meanMs": _ms(s.latency.sum / s.latency.count) if s.latency.count else None,
+                "maxMs": _ms(s.latency.max),
+                "responseBytes": {
+                    "mean": round(s.size.sum / s.size.count) if s.size.count else None,
+                    "p95": round(s.size.quantile(0.95) or 0),
+                    "max": int(s.size.max),
+                },
+                "upstreamRpcs": dict(sorted(s.rpcs.items())),
+                "rpcsPerCall": round(sum(s.rpcs.values()) / s.calls, 2),
+            }
+        rpcs = {
+            service: {
+                "calls": s.calls,
+                "errors": s.errors,
+                "p50Ms": _ms(s.latency.quantile(0.5)),
+                "p99Ms": _ms(s.latency.quantile(0.99)),
+                "meanMs": _ms(s.latency.sum / s.latency.count) if s.latency.count else None,
+            }
+            for service, s in sorted(self.rpcs.items())
+        }
+        return {"uptimeSeconds": round(time.time() - self.started), "tools": tools, "rpc": rpcs}
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, labels: str, h: Histogram) -> None:
+            for le, n in h.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {n}')
+            lines.append(f"{name}_sum{{{labels}}} {h.sum!r}")
+            lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+        tools = sorted((n, s) for n, s in self.tools.items() if s.calls)
+        rpcs = sorted(self.rpcs.items())
+        family("gmc_tool_calls_total", "counter", "Tool calls.")
+        lines += [f'gmc_tool_calls_total{{tool="{n}"}} {s.calls}' for n, s in tools]
+        family("gmc_tool_errors_total", "counter", "Tool calls that raised.")
+        lines += [f'gmc_tool_errors_total{{tool="{n}"}} {s.errors}' for n, s in tools]
+        family("gmc_tool_duration_seconds", "histogram", "Tool call latency.")
+        for n, s in tools:
+            histogram("gmc_tool_duration_seconds", f'tool="{n}"', s.latency)
+        family("gmc_tool_response_bytes", "histogram", "Tool response size (rendered text content).")
+        for n, s in tools:
+            histogram("gmc_tool_response_bytes", f'tool="{n}"', s.size)
+        family("gmc_tool_upstream_rpcs_total", "counter", "Upstream RPC attempts issued by a tool.")
+        for n, s in tools:
+            lines += [
+                f'gmc_tool_upstream_rpcs_total{{tool="{n}",service="{svc}"}} {count}'
+                for svc, count in sorted(s.rpcs.items())
+            ]
+        family("gmc_rpc_calls_total", "counter", "Upstream RPC attempts per sub-service.")
+        lines += [f'gmc_rpc_calls_total{{service="{n}"}} {s.calls}' for n, s in rpcs]
+        family("gmc_rpc_errors_total", "counter", "Failed upstream RPC attempts per sub-service.")
+        lines += [f'gmc_rpc_errors_total{{service="{n}"}} {s.errors}' for n, s in rpcs]
+        family("gmc_rpc_duration_seconds", "histogram", "Upstream RPC attempt latency.")
+        for n, s in rpcs:
+            histogram("gmc_rpc_duration_seconds", f'service="{n}"', s.latency)
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+async def timed_rpc(service: str, fn: Callable[[], Any]) -> Any:
+    """Await ``fn()`` and record it as one upstream attempt for *service*."""
+    started = time.perf_counter()
+    try:
+        result = await fn()
+    except BaseException:
+        elapsed = time.perf_counter() - started
+        metrics.record_rpc(service, elapsed, ok=False)
+        add_phase("rpc", elapsed)
+        raise
+    elapsed = time.perf_counter() - started
+    metrics.record_rpc(service, elapsed, ok=True)
+    add_phase("rpc", elapsed)
+    return result
+
+
+def instrument(name: str, fn: Callable) -> Callable:
+    """Wrap async tool *fn* so each call is timed and counted."""
+    stats = metrics.tool(name)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = current_tool.set(name)
+        started = time.perf_counter()
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException:
+            stats.calls += 1
+            stats.errors += 1
+            stats.latency.observe(time.perf_counter() - started)
+            raise
+        finally:
+            current_tool.reset(token)
+        stats.calls += 1
+        stats.latency.observe(time.perf_counter() - started)
+        return result
+
+    return wrapper
+
+
+async def _serve_prometheus(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        path = request_line.split(b" ")[1] if request_line.count(b" ") >= 2 else b"/"
+        if path.split(b"?")[0] in (b"/", b"/metrics"):
+            body, status = metrics.prometheus().encode(), "200 OK"
+        else:
+            body, status = b"not found\n", "404 Not Found"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_prometheus(port: int, host: str = "127.0.0.1") -> asyncio.AbstractServer:
+    """Serve ``metrics.prometheus()`` at http://host:port/metrics."""
+    return await asyncio.start_server(_serve_prometheus, host, port)
@@ -0,0 +1,300 @@
+"""Opt-in profiling of tool calls: phase timings and sampled stacks.
+
+Enabled with GMC_PROFILE=1 (read at import). Every tool call is then split
+into phases:
+
+    import     ``import`` statements and client module loading
+    auth       credential loading and OAuth token refresh
+    rpc        upstream attempts (summed; parallel fan-out can exceed wall time)
+    convert    message -> dict / JSON conversion inside the tool
+    serialize  FastMCP result encoding after the tool returned
+    other      everything else (tool logic, scheduler waits, event loop)
+
+The slowest calls are kept for get_slowest_calls. A fraction of calls
+(GMC_PROFILE_RATE, default 0.05) is also stack-sampled by a background
+thread every GMC_PROFILE_INTERVAL_MS (default 5). When the call is on-CPU
+the sampler records the live stack; while it awaits, it records the
+coroutine await chain. The result is a wall-clock profile that shows where
+a call was waiting as well as where it computed. Samples are written per
+tool as collapsed stacks to GMC_PROFILE_DIR/<tool>.folded (default
+./profiles), ready for flamegraph.pl or speedscope. Tasks the call spawns
+(coalesced upstream calls, run_bounded workers) are tracked through a task
+factory and sampled too, under a "[task]" frame. A fan-out therefore adds
+one stack per concurrent task to each sample.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import builtins
+import contextvars
+import functools
+import heapq
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+PHASES = ("import", "auth", "rpc", "convert", "serialize")
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else default
+
+
+class Phases:
+    """Seconds spent per phase during one tool call (shared with its threads)."""
+
+    __slots__ = ("seconds", "rpcs", "returned_at")
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.rpcs = 0
+        self.returned_at: Optional[float] = None
+
+
+current_phases: contextvars.ContextVar[Optional[Phases]] = contextvars.ContextVar(
+    "gmc_phases", default=None
+)
+_active = threading.local()  # phases being timed on this thread (outermost wins)
+
+
+def add_phase(name: str, seconds: float) -> None:
+    phases = current_phases.get()
+    if phases is not None:
+        phases.seconds[name] += seconds
+        if name == "rpc":
+            phases.rpcs += 1
+
+
+def timed_phase(name: str, fn: Callable) -> Callable:
+    """Wrap synchronous *fn* so its time counts towards *name* (not nested twice)."""
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        phases = current_phases.get()
+        running = getattr(_active, "names", None)
+        if running is None:
+            running = _active.names = set()
+        if phases is None or name in running:
+            return fn(*args, **kwargs)
+        running.add(name)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            running.discard(name)
+            phases.seconds[name] += time.perf_counter() - started
+
+    return wrapper
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}".replace(";", ":")
+
+
+def _await_chain(coro: Any) -> List[str]:
+    """Labels of a suspended coroutine and everything it awaits, outermost first."""
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            labels.append("[await]")  # a Future: the work is in another task or thread
+            break
+        labels.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+class _Sampled:
+    """A stack-sampled call: its own coroutine plus the tasks it spawned."""
+
+    __slots__ = ("tool", "coro", "tasks", "stacks")
+
+    def __init__(self, tool: str, coro: Any):
+        self.tool = tool
+        self.coro = coro
+        self.tasks: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
+        self.stacks: Counter = Counter()
+
+    def sample(self, live: List[Any]) -> None:
+        """Add one stack per unfinished coroutine of this call."""
+        for label, coro in (("", self.coro), *(("[task];", t.get_coro()) for t in list(self.tasks))):
+            root = getattr(coro, "cr_frame", None)
+            if root is None:
+                continue
+            if root in live:
+                labels = [_frame_label(f) for f in live[live.index(root):]]
+            else:
+                labels = _await_chain(coro)
+            self.stacks[f"{self.tool};{label}" + ";".join(labels)] += 1
+
+
+class Profiler:
+    """Phase timing for every call, stack sampling for a fraction of them."""
+
+    def __init__(self) -> None:
+        self.enabled = os.environ.get("GMC_PROFILE", "").strip() in ("1", "true", "yes")
+        self.rate = min(1.0, max(0.0, _env_float("GMC_PROFILE_RATE", 0.05)))
+        self.interval = _env_float("GMC_PROFILE_INTERVAL_MS", 5.0) / 1000
+        self.directory = os.environ.get("GMC_PROFILE_DIR", "").strip() or "profiles"
+        self.keep = int(_env_float("GMC_PROFILE_SLOWEST", 50))
+        self.calls = 0
+        self.sampled_calls = 0
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []  # min-heap on total time
+        self._seq = itertools.count()
+        self._sampling: Dict[int, _Sampled] = {}
+        self._folded: Dict[str, Counter] = {}
+        self._loop_thread: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # -- hooks --------------------------------------------------------------
+
+    def install_import_hook(self) -> None:
+        """Count ``import`` statements executed during a call as the import phase."""
+        original = builtins.__import__
+        builtins.__import__ = timed_phase("import", original)
+
+    def mark_returned(self, fn: Callable) -> Callable:
+        """Wrap a tool so the serialize phase starts when it returns."""
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                phases = current_phases.get()
+                if phases is not None:
+                    phases.returned_at = time.perf_counter()
+
+        return wrapper
+
+    # -- dispatch -----------------------------------------------------------
+
+    async def call(self, name: str, run: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one tool dispatch with phase timing, maybe with stack sampling."""
+        phases = Phases()
+        token = current_phases.set(phases)
+        coro = run()
+        sampled = random.random() < self.rate
+        if sampled:
+            self._start_sampling(phases, _Sampled(name, coro))
+        started = time.perf_counter()
+        error = None
+        try:
+            return await coro
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            ended = time.perf_counter()
+            current_phases.reset(token)
+            if sampled:
+                self._finish_sampling(phases)
+            self._record(name, started, ended, phases, sampled, error)
+
+    def _record(self, name: str, started: float, ended: float, phases: Phases,
+                sampled: bool, error: Optional[str]) -> None:
+        self.calls += 1
+        total = ended - started
+        seconds = dict(phases.seconds)
+        if phases.returned_at is not None:
+            seconds["serialize"] = ended - phases.returned_at
+        seconds["other"] = max(0.0, total - sum(seconds.values()))
+        entry = {
+            "tool": name,
+            "startedAt": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - total)),
+            "totalMs": round(total * 1000, 2),
+            "phasesMs": {k: round(v * 1000, 2) for k, v in seconds.items()},
+            "rpcs": phases.rpcs,
+            "sampled": sampled,
+            "error": error,
+        }
+        item = (total, next(self._seq), entry)
+        if len(self._slowest) < self.keep:
+            heapq.heappush(self._slowest, item)
+        elif total > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def slowest(self, tool: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        entries = [e for _, _, e in sorted(self._slowest, reverse=True)]
+        if tool is not None:
+            entries = [e for e in entries if e["tool"] == tool]
+        return entries[:limit]
+
+    def reset(self) -> None:
+        self._slowest.clear()
+
+    # -- sampler ------------------------------------------------------------
+
+    def _start_sampling(self, phases: Phases, sampled: _Sampled) -> None:
+        self.sampled_calls += 1
+        loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        if getattr(loop.get_task_factory(), "_gmc_profiler", False) is False:
+            loop.set_task_factory(self._task_factory(loop.get_task_factory()))
+        with self._lock:
+            self._sampling[id(phases)] = sampled
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._sample_forever, name="gmc-profiler", daemon=True)
+            self._thread.start()
+
+    def _task_factory(self, previous: Optional[Callable]) -> Callable:
+        """Task factory that registers tasks created by a sampled call with it."""
+
+        def factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> asyncio.Task:
+            if previous is not None:
+                task = previous(loop, coro, **kwargs)
+            else:
+                task = asyncio.Task(coro, loop=loop, **kwargs)
+            phases = current_phases.get()
+            if phases is not None:
+                sampled = self._sampling.get(id(phases))
+                if sampled is not None:
+                    sampled.tasks.add(task)
+            return task
+
+        factory._gmc_profiler = True  # type: ignore[attr-defined]
+        return factory
+
+    def _finish_sampling(self, phases: Phases) -> None:
+        with self._lock:
+            sampled = self._sampling.pop(id(phases), None)
+        if sampled is None or not sampled.stacks:
+            return
+        folded = self._folded.setdefault(sampled.tool, Counter())
+        folded.update(sampled.stacks)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{sampled.tool}.folded")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            for stack, count in folded.most_common():
+                fh.write(f"{stack} {count}\n")
+        os.replace(tmp, path)
+
+    def _sample_forever(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            if not self._sampling:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            live: List[Any] = []
+            while frame is not None:
+                live.append(frame)
+                frame = frame.f_back
+            live.reverse()  # outermost first
+            with self._lock:
+                for call in self._sampling.values():
+                    call.sample(live)
+
+
+profiler = Profiler()
@@ -0,0 +1,91 @@
+"""Persistent, date-partitioned cache of report rows.
+
+Historical days in the performance views are effectively immutable once a
+short settle window has passed, so rows are stored per (account, normalized
+query, day). A repeated query only fetches days that are missing or still
+settling; everything else is read back from the local SQLite file.
+
+GMC_REPORT_CACHE_DB sets the file (default ./report_cache.sqlite3),
+GMC_REPORT_SETTLE_DAYS the window of recent days that are always refetched
+(default 3).
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from typing import Any, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_days (
+    account    TEXT NOT NULL,
+    query_key  TEXT NOT NULL,
+    day        TEXT NOT NULL,
+    rows       BLOB NOT NULL,
+    row_count  INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (account, query_key, day)
+);
+"""
+
+
+def cache_path() -> str:
+    return os.environ.get("GMC_REPORT_CACHE_DB", "").strip() or "report_cache.sqlite3"
+
+
+def settle_days() -> int:
+    return int(os.environ.get("GMC_REPORT_SETTLE_DAYS", "").strip() or 3)
+
+
+def is_closed(day: datetime.date, today: Optional[datetime.date] = None) -> bool:
+    """True once *day* is outside the settle window and its rows can be reused."""
+    today = today or datetime.date.today()
+    return day <= today - datetime.timedelta(days=settle_days())
+
+
+def query_key(query_template: str) -> str:
+    """Stable key for a query whose date range was replaced by a placeholder."""
+    normalized = re.sub(r"\s+", " ", query_template).strip()
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+class ReportCache:
+    """SQLite store of serialized ReportRow lists, one entry per day."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_path()
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def get(self, account: str, key: str, day: datetime.date) -> Optional[List[Any]]:
+        """Rows of *day*, or None unless they were fetched after its settle window."""
+        closed_at = datetime.datetime.combine(
+            day + datetime.timedelta(days=settle_days()), datetime.time()
+        ).timestamp()
+        row = self.conn.execute(
+            "SELECT rows FROM report_days WHERE account = ? AND query_key = ? AND day = ? "
+            "AND fetched_at >= ?",
+            (account, key, day.isoformat(), closed_at),
+        ).fetchone()
+        if row is None:
+            return None
+        from google.shopping import merchant_reports_v1beta
+        return list(merchant_reports_v1beta.SearchResponse.pb().FromString(row[0]).results)
+
+    def put(self, account: str, key: str, day: datetime.date, rows: List[Any]) -> None:
+        from google.shopping import merchant_reports_v1beta
+        response = merchant_reports_v1beta.SearchResponse.pb()()
+        response.results.extend(rows)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO report_days VALUES (?, ?, ?, ?, ?, ?)",
+            (account, key, day.isoformat(), response.SerializeToString(), len(rows), time.time()),
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,268 @@
+"""Quota-aware request scheduler shared by every gRPC client and the REST helper.
+
+Each sub-service gets an adaptive token bucket. Successful calls raise its
+rate up to a ceiling: quickly until the first throttle, additively after.
+RESOURCE_EXHAUSTED / UNAVAILABLE (HTTP 429 / 503) halve it, and Retry-After
+pauses the bucket.
+Throttled calls are retried with jittered exponential backoff, so a burst
+slows down instead of failing. UNAVAILABLE can come back after the server
+already applied the request, so it is only retried for reads and idempotent
+writes; a create that hits it fails rather than risk a duplicate. Waiting
+calls are released by priority: reads first, then interactive writes, then
+writes issued from bulk tools (anything running inside ``run_bounded``).
+
+Environment:
+    GMC_QPS               starting rate per sub-service (default 10)
+    GMC_QPS_<SERVICE>     starting rate for one sub-service, e.g. GMC_QPS_PRODUCTS
+    GMC_QPS_MAX           ceiling the rate may grow to (default 100)
+    GMC_RETRY_ATTEMPTS    attempts per call including the first (default 5)
+    GMC_SCHEDULER_DISABLED=1 bypasses pacing and retries
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from tools._metrics import timed_rpc
+
+PRIORITY_READ = 0
+PRIORITY_WRITE = 1
+PRIORITY_BULK = 2
+
+# Priority of writes issued from the current task; run_bounded workers set BULK.
+write_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "gmc_write_priority", default=PRIORITY_WRITE
+)
+
+_READ_PREFIXES = ("get_", "list_", "search", "render_", "retrieve_")
+# Writes that can be resent safely: upserts keyed by the resource, updates, deletes.
+_IDEMPOTENT_PREFIXES = ("update_", "delete_", "insert_product_input", "insert_local_inventory",
+                        "insert_regional_inventory")
+_MIN_RATE = 0.5
+_INCREASE = 1.0  # qps gained per second of uninterrupted success
+_SLOW_START_STEP = 0.25  # qps gained per success until the first throttle (~doubling every 3 s)
+_CUT_INTERVAL = 1.0  # at most one rate cut per second
+_BACKOFF_BASE = 0.5
+_BACKOFF_CAP = 30.0
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else default
+
+
+def retry_attempts() -> int:
+    return max(1, int(_env_float("GMC_RETRY_ATTEMPTS", 5)))
+
+
+def disabled() -> bool:
+    return os.environ.get("GMC_SCHEDULER_DISABLED", "").strip() in ("1", "true", "yes")
+
+
+def is_read(method_name: str) -> bool:
+    return method_name.startswith(_READ_PREFIXES)
+
+
+def is_idempotent(method_name: str) -> bool:
+    return is_read(method_name) or method_name.startswith(_IDEMPOTENT_PREFIXES)
+
+
+def _throttle_info(exc: BaseException) -> Tuple[Optional[str], Optional[float]]:
+    """(kind, retry_after_seconds) for gRPC and httpx errors.
+
+    kind is 'exhausted' (429: rejected, never applied), 'unavailable' (503:
+    may have been applied) or None for anything that is not a throttle.
+    """
+    from google.api_core import exceptions as api_exceptions
+
+    if isinstance(exc, api_exceptions.ResourceExhausted):
+        return "exhausted", None
+    if isinstance(exc, api_exceptions.ServiceUnavailable):
+        return "unavailable", None
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) if response is not None else None
+    if status not in (429, 503):
+        return None, None
+    kind = "exhausted" if status == 429 else "unavailable"
+    try:
+        return kind, float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return kind, None
+
+
+class TokenBucket:
+    """Adaptive token bucket with a priority queue of waiting callers."""
+
+    def __init__(self, name: str, rate: float, max_rate: float):
+        self.name = name
+        self.rate = max(_MIN_RATE, min(rate, max_rate))
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self.gave_up = 0
+        self.wait_seconds = 0.0
+        self._last_cut = 0.0
+        self._slow_start = True
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, priority: int) -> None:
+        self._refill()
+        if not self._waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is not None and self._dispatcher.get_loop() is not loop:
+            self._waiters, self._dispatcher = [], None  # left over from a closed loop
+        started = time.monotonic()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+        await future
+        self.wait_seconds += time.monotonic() - started
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():  # skip callers that were cancelled meanwhile
+                self.tokens -= 1
+                future.set_result(None)
+
+    def on_success(self) -> None:
+        step = _SLOW_START_STEP if self._slow_start else _INCREASE / self.rate
+        self.rate = min(self.max_rate, self.rate + step)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        self.throttled += 1
+        self._slow_start = False
+        now = time.monotonic()
+        if now - self._last_cut >= _CUT_INTERVAL:
+            self.rate = max(_MIN_RATE, self.rate / 2)
+            self._last_cut = now
+        self._refill()
+        # Spend the bucket (into debt for Retry-After) so queued calls hold off too.
+        self.tokens = min(self.tokens, 0.0, -(retry_after or 0.0) * self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 2),
+            "maxRate": self.max_rate,
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "gaveUp": self.gave_up,
+            "queued": sum(1 for *_, f in self._waiters if not f.done()),
+            "waitSeconds": round(self.wait_seconds, 3),
+        }
+
+
+class Scheduler:
+    """Per-sub-service buckets plus the retry loop around each call."""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, key: str) -> TokenBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            rate = _env_float(f"GMC_QPS_{key.upper()}", _env_float("GMC_QPS", 10.0))
+            bucket = self.buckets[key] = TokenBucket(key, rate, _env_float("GMC_QPS_MAX", 100.0))
+        return bucket
+
+    async def call(
+        self, key: str, fn: Callable[[], Awaitable[Any]], read: bool, idempotent: bool = False
+    ) -> Any:
+        """Run ``fn()`` under *key*'s bucket, retrying throttled attempts.
+
+        RESOURCE_EXHAUSTED is always retried; UNAVAILABLE only when *read* or
+        *idempotent* is set.
+        """
+        if disabled():
+            return await timed_rpc(key, fn)
+        bucket = self.bucket(key)
+        priority = PRIORITY_READ if read else write_priority.get()
+        attempts = retry_attempts()
+        for attempt in range(attempts):
+            await bucket.acquire(priority)
+            bucket.calls += 1
+            try:
+                result = await timed_rpc(key, fn)
+            except Exception as exc:
+                kind, retry_after = _throttle_info(exc)
+                if kind is None:
+                    raise
+                bucket.on_throttle(retry_after)
+                if kind == "unavailable" and not (read or idempotent):
+                    raise
+                if attempt + 1 >= attempts:
+                    bucket.gave_up += 1
+                    raise
+                bucket.retries += 1
+                backoff = random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+                await asyncio.sleep(max(backoff, retry_after or 0.0))
+            else:
+                bucket.on_success()
+                return result
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, Any]:
+        return {key: bucket.stats() for key, bucket in sorted(self.buckets.items())}
+
+
+scheduler = Scheduler()
+
+
+class ScheduledClient:
+    """Proxy around an async API client that routes every RPC through the scheduler.
+
+    Non-coroutine attributes (transport, paths helpers) pass straight through.
+    Async pagers fetch later pages through their private ``_method``; it is
+    re-wrapped so those pages are paced and retried as well.
+    """
+
+    __slots__ = ("_client", "_key")
+
+    def __init__(self, client: Any, key: str):
+        self._client = client
+        self._key = key
+
+    def _scheduled(
+        self, method: Callable[..., Awaitable[Any]], read: bool, idempotent: bool = False
+    ) -> Callable[..., Awaitable[Any]]:
+        key = self._key
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            result = await scheduler.call(key, lambda: method(*args, **kwargs), read, idempotent)
+            page_method = getattr(result, "_method", None)
+            if page_method is not None:
+                result._method = self._scheduled(page_method, read=True)
+            return result
+
+        return call
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+        return self._scheduled(attr, is_read(name), is_idempotent(name))
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
 
 from tools._common import (
     mcp,
     account_name,
+    error_key,
     merchant_id,
+    message_to_dict,
+    normalize_account,
+    run_bounded,
     get_accounts_client,
     get_accounts_issues_client,
     get_datasources_client,
     get_programs_client,
 )
+from tools._cache import cached, coalesced, invalidates
 
 
 # ---------------------------------------------------------------------------
@@ -20,15 +27,17 @@ from tools._common import (
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def get_account_info() -> Dict[str, Any]:
+@cached("account")
+async def get_account_info() -> Dict[str, Any]:
     """Get basic information about the GMC merchant account."""
     client = get_accounts_client()
-    account = client.get_account(name=account_name())
-    return type(account).to_dict(account)
+    account = await client.get_account(name=account_name())
+    return message_to_dict(account)
 
 
 @mcp.tool()
-def get_account_issues() -> Dict[str, Any]:
+@coalesced
+async def get_account_issues() -> Dict[str, Any]:
     """Get all account-level issues (policy violations, suspensions, Misrepresentation).
 
     Returns a list of issues with severity, documentation links, and impacted destinations.
@@ -37,8 +46,9 @@ def get_account_issues() -> Dict[str, Any]:
     from google.shopping import merchant_accounts_v1beta
     request = merchant_accounts_v1beta.ListAccountIssuesRequest(parent=account_name())
     issues = []
-    for issue in client.list_account_issues(request=request):
-        d = type(issue).to_dict(issue)
+    async for issue in await client.list_account_issues(request=request):
+        d = message_to_dict(issue)
+        d["severity"] = getattr(issue.severity, "name", str(issue.severity))  # enum name, not int
         issues.append(d)
     return {
         "accountName": account_name(),
@@ -55,13 +65,14 @@ def get_account_issues() -> Dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def list_data_sources() -> Dict[str, Any]:
+@cached("datasources")
+async def list_data_sources() -> Dict[str, Any]:
     """List all data sources (previously called datafeeds) for this GMC account."""
     client = get_datasources_client()
     from google.shopping import merchant_datasources_v1
     request = merchant_datasources_v1.ListDataSourcesRequest(parent=account_name())
-    response = client.list_data_sources(request=request)
-    sources = [type(ds).to_dict(ds) for ds in response.data_sources]
+    response = await client.list_data_sources(request=request)
+    sources = [message_to_dict(ds) for ds in response.data_sources]
     return {
         "dataSources": sources,
         "totalReturned": len(sources),
@@ -69,7 +80,7 @@ def list_data_sources() -> Dict[str, Any]:
 
 
 @mcp.tool()
-def get_data_source(data_source_id: str) -> Dict[str, Any]:
+async def get_data_source(data_source_id: str) -> Dict[str, Any]:
     """Get details of a single data source.
 
     Args:
@@ -79,12 +90,13 @@ def get_data_source(data_source_id: str) -> Dict[str, Any]:
     from google.shopping import merchant_datasources_v1
     name = f"{account_name()}/dataSources/{data_source_id}"
     request = merchant_datasources_v1.GetDataSourceRequest(name=name)
-    ds = client.get_data_source(request=request)
-    return type(ds).to_dict(ds)
+    ds = await client.get_data_source(request=request)
+    return message_to_dict(ds)
 
 
 @mcp.tool()
-def fetch_data_source(data_source_id: str) -> Dict[str, Any]:
+@invalidates("datasources")
+async def fetch_data_source(data_source_id: str) -> Dict[str, Any]:
     """Trigger an immediate manual fetch of a data source.
 
     Args:
@@ -94,12 +106,12 @@ def fetch_data_source(data_source_id: str) -> Dict[str, Any]:
     from google.shopping import merchant_datasources_v1
     name = f"{account_name()}/dataSources/{data_source_id}"
     request = merchant_datasources_v1.FetchDataSourceRequest(name=name)
-    client.fetch_data_source(request=request)
+    await client.fetch_data_source(request=request)
     return {"triggered": True, "dataSourceName": name}
 
 
 @mcp.tool()
-def get_data_source_file_upload(data_source_id: str) -> Dict[str, Any]:
+async def get_data_source_file_upload(data_source_id: str) -> Dict[str, Any]:
     """Get the latest file upload status for a data source (errors, item counts).
 
     Args:
@@ -110,8 +122,8 @@ def get_data_source_file_upload(data_source_id: str) -> Dict[str, Any]:
     # latest upload is addressed as: dataSources/{id}/fileUploads/latest
     name = f"{account_name()}/dataSources/{data_source_id}/fileUploads/latest"
     request = merchant_datasources_v1.GetFileUploadRequest(name=name)
-    upload = client.get_file_upload(request=request)
-    return type(upload).to_dict(upload)
+    upload = await client.get_file_upload(request=request)
+    return message_to_dict(upload)
 
 
 # ---------------------------------------------------------------------------
@@ -119,17 +131,19 @@ def get_data_source_file_upload(data_source_id: str) -> Dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 @mcp.tool()
-def list_programs() -> Dict[str, Any]:
+@cached("programs")
+async def list_programs() -> Dict[str, Any]:
     """List all programs (Shopping Ads, Free Listings, etc.) and their participation status."""
     client = get_programs_client()
     from google.shopping import merchant_accounts_v1beta
     request = merchant_accounts_v1beta.ListProgramsRequest(parent=account_name())
-    programs = [type(p).to_dict(p) for p in client.list_programs(request=request)]
+    programs = [message_to_dict(p) async for p in await client.list_programs(request=request)]
     return {"programs": programs, "totalReturned": len(programs)}
 
 
 @mcp.tool()
-def get_program(program_id: str) -> Dict[str, Any]:
+@cached("programs")
+async def get_program(program_id: str) -> Dict[str, Any]:
     """Get the status and requirements of a specific program.
 
     Args:
@@ -139,12 +153,13 @@ def get_program(program_id: str) -> Dict[str, Any]:
     from google.shopping import merchant_accounts_v1beta
     name = f"{account_name()}/programs/{program_id}"
     request = merchant_accounts_v1beta.GetProgramRequest(name=name)
-    program = client.get_program(request=request)
-    return type(program).to_dict(program)
+    program = await client.get_program(request=request)
+    return message_to_dict(program)
 
 
 @mcp.tool()
-def enable_program(program_id: str) -> Dict[str, Any]:
+@invalidates("programs")
+async def enable_program(program_id: str) -> Dict[str, Any]:
     """Enable / request re-review for a program.
 
     ⚠️ This triggers a real re-review request with Google.
@@ -157,5 +172,137 @@ def enable_program(program_id: str) -> Dict[str, Any]:
     from google.shopping import merchant_accounts_v1beta
     name = f"{account_name()}/programs/{program_id}"
     request = merchant_accounts_v1beta.EnableProgramRequest(name=name)
-    program = client.enable_program(request=request)
-    return type(program).to_dict(program)
+    program = await client.enable_program(request=request)
+    return message_to_dict(program)
+
+
+# ---------------------------------------------------------------------------
+# Multi-account (MCA) fan-out
+# ---------------------------------------------------------------------------
+
+# Read-only tools fan_out may run; writes are never fanned out.
+_FAN_OUT_PREFIXES = ("get_", "list_", "count_", "render_", "reports_search")
+_FAN_OUT_TOOLS = ("fan_out", "sweep_account_health", "list_sub_accounts")
+
+
+@mcp.tool()
+@cached("account")
+async def list_sub_accounts() -> Dict[str, Any]:
+    """List the sub-accounts of this advanced (multi-client) account."""
+    client = get_accounts_client()
+    from google.shopping import merchant_accounts_v1beta
+    request = merchant_accounts_v1beta.ListSubAccountsRequest(provider=account_name(), page_size=500)
+    accounts = [
+        {"accountId": str(a.account_id), "name": a.name, "accountName": a.account_name}
+        async for a in await client.list_sub_accounts(request=request)
+    ]
+    return {"subAccounts": accounts, "totalReturned": len(accounts)}
+
+
+async def _sub_account_ids(accounts: Optional[List[str]]) -> List[str]:
+    if accounts is not None:
+        return list(dict.fromkeys(normalize_account(a) for a in accounts))
+    listed = await list_sub_accounts()
+    return [a["accountId"] for a in listed["subAccounts"]]
+
+
+async def _fan_out(
+    tool: str,
+    accounts: Optional[List[str]],
+    arguments: Optional[Dict[str, Any]],
+    concurrency: int,
+) -> Dict[str, Any]:
+    fn = mcp.tool_functions.get(tool)
+    if (
+        fn is None
+        or getattr(fn, "account_independent", False)
+        or tool in _FAN_OUT_TOOLS
+        or not tool.startswith(_FAN_OUT_PREFIXES)
+    ):
+        readable = sorted(
+            n for n, f in mcp.tool_functions.items()
+            if n.startswith(_FAN_OUT_PREFIXES) and n not in _FAN_OUT_TOOLS
+            and not getattr(f, "account_independent", False)
+        )
+        raise ValueError(f"Cannot fan out {tool!r}; choose a read tool: {readable}")
+    arguments = dict(arguments or {})
+    arguments.pop("account", None)
+
+    started = time.perf_counter()
+    ids = await _sub_account_ids(accounts)
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    async for account, result, error in run_bounded(
+        ids, lambda a: fn(**arguments, account=a), concurrency=concurrency
+    ):
+        if error is None:
+            results[account] = result
+        else:
+            errors[account] = error_key(error)
+    return {
+        "tool": tool,
+        "accounts": len(ids),
+        "succeeded": len(results),
+        "failed": len(errors),
+        "results": {a: results[a] for a in ids if a in results},
+        "errors": {a: errors[a] for a in ids if a in errors},
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+@mcp.tool()
+async def fan_out(
+    tool: str,
+    accounts: Optional[List[str]] = None,
+    arguments: Optional[Dict[str, Any]] = None,
+    concurrency: int = 16,
+) -> Dict[str, Any]:
+    """Run one read tool against many sub-accounts concurrently, results per account.
+
+    For example get_account_issues, count_products_by_status or
+    get_product_performance across an advanced account. All calls share the
+    gRPC clients, the per-sub-service rate limiter and the response caches.
+    A failing account is reported under "errors" and does not stop the others.
+
+    Args:
+        tool: Name of a read tool (get_*, list_*, count_*, render_*, reports_search).
+        accounts: Sub-account IDs. Defaults to every sub-account (list_sub_accounts).
+        arguments: Arguments passed to the tool for every account.
+        concurrency: Max accounts in flight.
+    """
+    return await _fan_out(tool, accounts, arguments, concurrency)
+
+
+@mcp.tool()
+async def sweep_account_health(
+    accounts: Optional[List[str]] = None,
+    concurrency: int = 16,
+) -> Dict[str, Any]:
+    """Account issues for every sub-account, worst first.
+
+    Runs get_account_issues through fan_out and keeps one summary line per
+    account: issue counts by severity and whether anything is critical.
+
+    Args:
+        accounts: Sub-account IDs. Defaults to every sub-account.
+        concurrency: Max accounts in flight.
+    """
+    swept = await _fan_out("get_account_issues", accounts, None, concurrency)
+    summaries = []
+    for account, result in swept["results"].items():
+        severities = Counter(i.get("severity", "SEVERITY_UNSPECIFIED") for i in result["issues"])
+        summaries.append({
+            "accountId": account,
+            "totalIssues": result["totalIssues"],
+            "hasCriticalIssue": result["hasCriticalIssue"],
+            "bySeverity": dict(severities.most_common()),
+        })
+    summaries.sort(key=lambda s: (not s["hasCriticalIssue"], -s["totalIssues"], s["accountId"]))
+    return {
+        "accounts": swept["accounts"],
+        "withCriticalIssues": sum(s["hasCriticalIssue"] for s in summaries),
+        "withIssues": sum(s["totalIssues"] > 0 for s in summaries),
+        "health": summaries,
+        "errors": swept["errors"],
+        "elapsedMs": swept["elapsedMs"],
+    }
@@ -0,0 +1,395 @@
+"""Local report analytics — vectorized follow-up queries over loaded report rows.
+
+load_report runs an MQL query once (or reads a reports_export file) and keeps
+the rows as NumPy columns in memory. analyze_report then answers group-by,
+top-N, ratio, period-over-period and percentile questions in-process, without
+another Merchant API round-trip.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools._common import account_independent, mcp
+from tools.reports import _DATE_RANGE_RE, _column_readers, _fetch_rows, _run_sharded
+
+_MAX_DATASETS = 8
+_datasets: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_dataset_ids = itertools.count(1)
+
+_METRIC_RE = re.compile(r"^(?P<fn>\w+)\((?P<args>[^)]*)\)$")
+_PERCENTILE_RE = re.compile(r"^p(?P<q>\d{1,2}(?:\.\d+)?)$")
+_GRAINS = ("day", "week", "month")
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def _to_array(values: List[Any], kind: str) -> np.ndarray:
+    if kind in ("int64", "double"):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if kind == "bool":
+        return np.array([bool(v) for v in values], dtype=bool)
+    return np.array(["" if v is None else str(v) for v in values], dtype=object)
+
+
+def _infer_array(values: List[str]) -> np.ndarray:
+    """Numeric column if every non-empty value parses as a number, else strings."""
+    try:
+        return np.array([float(v) if v != "" else np.nan for v in values], dtype=np.float64)
+    except ValueError:
+        return np.array(values, dtype=object)
+
+
+def _load_file(path: str) -> Dict[str, np.ndarray]:
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # optional dependency
+            raise RuntimeError("Reading Parquet needs pyarrow: pip install pyarrow") from exc
+        table = pq.read_table(path)
+        columns = {}
+        for field in table.schema:
+            values = table.column(field.name).to_pylist()
+            numeric = str(field.type) in ("int64", "int32", "double", "float")
+            columns[field.name] = _to_array(values, "double" if numeric else "string")
+        return columns
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = next(reader)
+        raw = list(zip(*reader)) or [()] * len(header)
+    return {name: _infer_array(list(values)) for name, values in zip(header, raw)}
+
+
+def _factorize_strings(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct values and per-row codes of a string column.
+
+    One hash pass over the rows; only the distinct values are sorted, which
+    is much cheaper than np.unique over an object array.
+    """
+    index: Dict[Any, int] = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int64, count=len(values))
+    levels = np.array(list(index), dtype=object)
+    order = np.argsort(levels, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return levels[order], rank[codes]
+
+
+def _store(columns: Dict[str, np.ndarray], source: str) -> Dict[str, Any]:
+    dataset_id = f"ds{next(_dataset_ids)}"
+    rows = len(next(iter(columns.values()))) if columns else 0
+    # String columns are factorized once here; group keys reuse the codes.
+    levels = {name: _factorize_strings(c) for name, c in columns.items() if c.dtype == object}
+    _datasets[dataset_id] = {
+        "columns": columns, "rows": rows, "levels": levels, "source": source, "loadedAt": time.time(),
+    }
+    while len(_datasets) > _MAX_DATASETS:
+        _datasets.popitem(last=False)
+    return {
+        "datasetId": dataset_id,
+        "rows": rows,
+        "columns": {n: ("number" if c.dtype.kind in "fb" else "string") for n, c in columns.items()},
+        "memoryBytes": int(sum(c.nbytes for c in columns.values())),
+    }
+
+
+@mcp.tool()
+async def load_report(
+    query: Optional[str] = None,
+    path: Optional[str] = None,
+    use_cache: bool = False,
+    shard_by: Optional[str] = None,
+    max_in_flight: int = 8,
+) -> Dict[str, Any]:
+    """Load report rows once into in-memory columns for analyze_report.
+
+    Pass either an MQL query (all pages are fetched; with use_cache closed
+    days come from the report cache) or the path of a reports_export
+    Parquet/CSV file. The newest 8 datasets are kept.
+
+    Args:
+        query: MQL query; the selected fields become the columns.
+        path: Alternatively, a local .parquet or .csv file from reports_export.
+        use_cache: Reuse cached closed days (needs a date BETWEEN condition
+            and date among the selected columns).
+        shard_by: 'day' or 'week' to fetch date shards concurrently.
+        max_in_flight: Max concurrent shard requests.
+    """
+    if (query is None) == (path is None):
+        raise ValueError("Pass exactly one of query or path.")
+    started = time.perf_counter()
+    if path is not None:
+        columns = _load_file(path)
+        source = os.path.abspath(path)
+    else:
+        view, readers = _column_readers(query)
+        if (use_cache or shard_by) and _DATE_RANGE_RE.search(query):
+            rows, _ = await _run_sharded(query, shard_by or "day", max_in_flight, use_cache=use_cache)
+        else:
+            rows = await _fetch_rows(query)
+        messages = [getattr(row, view) for row in rows]
+        columns = {
+            name: _to_array([read(m) for m in messages], kind) for name, read, kind in readers
+        }
+        source = query
+    result = _store(columns, source)
+    result["elapsedMs"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+def _bucket(values: np.ndarray, grain: str) -> np.ndarray:
+    """Truncate 'YYYY-MM-DD' strings to the start of their week (Monday) or month."""
+    if grain == "day":
+        return values
+    if grain == "month":
+        return np.array([v[:7] for v in values], dtype=object)
+    days = np.array(values, dtype="datetime64[D]")
+    weekday = (days.astype("int64") - 4) % 7  # 1970-01-01 was a Thursday
+    return (days - weekday).astype(str).astype(object)
+
+
+def _levels(dataset: Dict[str, Any], spec: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct values and per-row codes of a group key, computed once per dataset.
+
+    A time grain buckets the column's distinct values, not its rows.
+    """
+    cache = dataset["levels"]
+    if spec not in cache:
+        name, _, grain = spec.partition(":")
+        if name not in dataset["columns"]:
+            raise ValueError(f"Unknown column {name!r}; have {sorted(dataset['columns'])}")
+        if grain and grain not in _GRAINS:
+            raise ValueError(f"Unknown time grain {grain!r}; choose from {_GRAINS}")
+        if name not in cache:
+            values, inverse = np.unique(dataset["columns"][name], return_inverse=True)
+            cache[name] = (values, inverse.reshape(-1))
+        if grain:
+            values, inverse = cache[name]
+            buckets, remap = np.unique(_bucket(values, grain), return_inverse=True)
+            cache[spec] = (buckets, remap.reshape(-1)[inverse])
+    return cache[spec]
+
+
+def _factorize(dataset: Dict[str, Any], specs: List[str]) -> Tuple[List[tuple], np.ndarray]:
+    """Dense group codes for the key columns plus each group's key values."""
+    if not specs:
+        return [()], np.zeros(dataset["rows"], dtype=np.int64)
+    levels, per_column = [], []
+    for spec in specs:
+        values, inverse = _levels(dataset, spec)
+        levels.append(values)
+        per_column.append(inverse)
+    combined = np.ravel_multi_index(per_column, [len(v) for v in levels])
+    present, codes = np.unique(combined, return_inverse=True)
+    index = np.unravel_index(present, [len(v) for v in levels])
+    uniques = list(zip(*(v[i] for v, i in zip(levels, index))))
+    return uniques, codes.reshape(-1)
+
+
+def _mask(columns: Dict[str, np.ndarray], rows: int, filter: Optional[Dict[str, Any]]) -> np.ndarray:
+    mask = np.ones(rows, dtype=bool)
+    for name, cond in (filter or {}).items():
+        if name not in columns:
+            raise ValueError(f"Unknown column {name!r}; have {sorted(columns)}")
+        col = columns[name]
+        if isinstance(cond, list):
+            mask &= np.isin(col, cond)
+        elif isinstance(cond, dict):
+            for op, value in cond.items():
+                if op == "gte":
+                    mask &= col >= value
+                elif op == "lte":
+                    mask &= col <= value
+                elif op == "gt":
+                    mask &= col > value
+                elif op == "lt":
+                    mask &= col < value
+                elif op == "ne":
+                    mask &= col != value
+                else:
+                    raise ValueError(f"Unknown operator {op!r}; choose from gt, gte, lt, lte, ne")
+        else:
+            mask &= col == cond
+    return mask
+
+
+def _aggregate(
+    metric: str,
+    columns: Dict[str, np.ndarray],
+    codes: np.ndarray,
+    n_groups: int,
+    mask: np.ndarray,
+) -> np.ndarray:
+    """Evaluate one metric expression per group over the rows selected by *mask*."""
+    match = _METRIC_RE.match(metric.replace(" ", ""))
+    if not match:
+        raise ValueError(f"Bad metric {metric!r}; use e.g. sum(clicks), ratio(clicks,impressions), p90(clicks)")
+    fn, args = match.group("fn").lower(), [a for a in match.group("args").split(",") if a]
+    for arg in args:
+        if arg not in columns:
+            raise ValueError(f"Unknown column {arg!r} in {metric!r}")
+    codes = codes[mask]
+    count = np.bincount(codes, minlength=n_groups).astype(np.float64)
+
+    def total(name: str) -> np.ndarray:
+        values = columns[name][mask].astype(np.float64)
+        return np.bincount(codes, weights=np.nan_to_num(values), minlength=n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if fn == "count":
+            return count
+        if fn == "sum" and len(args) == 1:
+            return total(args[0])
+        if fn in ("mean", "avg") and len(args) == 1:
+            present = ~np.isnan(columns[args[0]][mask].astype(np.float64))
+            return total(args[0]) / np.bincount(codes, weights=present, minlength=n_groups)
+        if fn == "ratio" and len(args) == 2:
+            return total(args[0]) / total(args[1])
+        percentile = _PERCENTILE_RE.match(fn)
+        if (fn in ("min", "max", "median") or percentile) and len(args) == 1:
+            values = columns[args[0]][mask].astype(np.float64)
+            present = ~np.isnan(values)
+            q = float(percentile.group("q")) if percentile else {"min": 0.0, "max": 100.0}.get(fn, 50.0)
+            return _order_statistic(codes[present], values[present], n_groups, q)
+    raise ValueError(f"Unsupported metric {metric!r}")
+
+
+def _order_statistic(codes: np.ndarray, values: np.ndarray, n_groups: int, q: float) -> np.ndarray:
+    """Per-group q-th percentile (linear interpolation, as np.percentile) of non-NaN *values*.
+
+    One sort by (group, value) puts every group in a sorted segment; min and
+    max are segment ends, other percentiles interpolate inside the segment.
+    """
+    out = np.full(n_groups, np.nan)
+    if q in (0.0, 100.0):
+        order = np.argsort(codes, kind="stable")
+        codes, values = codes[order], values[order]
+        if codes.size:
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+            reduce = np.minimum if q == 0.0 else np.maximum
+            out[codes[starts]] = reduce.reduceat(values, starts)
+        return out
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    bounds = np.searchsorted(codes, np.arange(n_groups + 1))
+    start, size = bounds[:-1], np.diff(bounds)
+    has = size > 0
+    position = (size[has] - 1) * (q / 100)
+    below = np.floor(position).astype(np.int64)
+    above = np.minimum(below + 1, size[has] - 1)
+    low, high = values[start[has] + below], values[start[has] + above]
+    out[has] = low + (high - low) * (position - below)
+    return out
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (np.floating, float)):
+        if np.isnan(value):
+            return None
+        return int(value) if float(value).is_integer() else round(float(value), 6)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.str_):
+        return str(value)
+    return value
+
+
+@mcp.tool()
+@account_independent
+async def analyze_report(
+    dataset_id: str,
+    metrics: List[str],
+    group_by: Optional[List[str]] = None,
+    filter: Optional[Dict[str, Any]] = None,
+    compare: Optional[Dict[str, Any]] = None,
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    top_n: int = 50,
+) -> Dict[str, Any]:
+    """Fast in-process aggregation over a dataset from load_report.
+
+    Args:
+        dataset_id: ID returned by load_report.
+        metrics: Expressions: count(), sum(col), mean(col), min(col),
+            max(col), median(col), p90(col) / p99(col) (any percentile),
+            ratio(a,b) = sum(a)/sum(b), e.g. ratio(clicks,impressions) for CTR.
+        group_by: Columns to group by. Date columns accept a time grain
+            suffix: 'date:week' (Monday start) or 'date:month'.
+        filter: Column -> value (equality), list (IN) or {gt,gte,lt,lte,ne: v}.
+        compare: Period-over-period, e.g. {"column": "date",
+            "current": ["2026-02-01", "2026-02-28"],
+            "previous": ["2026-01-01", "2026-01-31"]}. Each metric is
+            returned for both periods plus '<metric> delta' and '<metric> pct'.
+        sort_by: Output column to sort by (a metric, '<metric> delta', ...).
+            Defaults to the first metric (its delta when comparing).
+        descending: Sort direction.
+        top_n: Max groups returned, e.g. top 50 offers by click growth.
+    """
+    dataset = _datasets.get(dataset_id)
+    if dataset is None:
+        raise ValueError(f"Unknown dataset {dataset_id!r}; run load_report first (have {list(_datasets)})")
+    started = time.perf_counter()
+    columns, rows = dataset["columns"], dataset["rows"]
+    base = _mask(columns, rows, filter)
+
+    specs = list(group_by or [])
+    uniques, codes = _factorize(dataset, specs)
+    n_groups = len(uniques)
+
+    table: Dict[str, np.ndarray] = {}
+    if compare:
+        name = compare["column"]
+        if name not in columns:
+            raise ValueError(f"Unknown column {name!r}; have {sorted(columns)}")
+        column = columns[name]
+        periods = {}
+        for label in ("current", "previous"):
+            lo, hi = compare[label]
+            periods[label] = base & (column >= lo) & (column <= hi)
+        for metric in metrics:
+            current = _aggregate(metric, columns, codes, n_groups, periods["current"])
+            previous = _aggregate(metric, columns, codes, n_groups, periods["previous"])
+            table[metric] = current
+            table[f"{metric} previous"] = previous
+            table[f"{metric} delta"] = current - previous
+            with np.errstate(divide="ignore", invalid="ignore"):
+                table[f"{metric} pct"] = np.where(previous != 0, (current - previous) / previous * 100, np.nan)
+        present = (np.bincount(codes[periods["current"] | periods["previous"]], minlength=n_groups) > 0)
+    else:
+        for metric in metrics:
+            table[metric] = _aggregate(metric, columns, codes, n_groups, base)
+        present = np.bincount(codes[base], minlength=n_groups) > 0
+
+    sort_key = sort_by or (f"{metrics[0]} delta" if compare else metrics[0])
+    if sort_key not in table:
+        raise ValueError(f"Cannot sort by {sort_key!r}; choose from {list(table)}")
+    order_values = np.where(np.isnan(table[sort_key]), -np.inf if descending else np.inf, table[sort_key])
+    order = np.argsort(-order_values if descending else order_values, kind="stable")
+    order = order[present[order]][: max(top_n, 0)]
+
+    out = []
+    for g in order:
+        row = {spec: _plain(uniques[g][i]) for i, spec in enumerate(specs)}
+        row.update({name: _plain(values[g]) for name, values in table.items()})
+        out.append(row)
+    return {
+        "datasetId": dataset_id,
+        "rows": out,
+        "groups": int(present.sum()),
+        "rowsScanned": int(base.sum()),
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,320 @@
+"""Local catalog mirror — SQLite copy of the products list for indexed queries.
+
+sync_catalog pulls the catalog through ProductsService.list_products and only
+rewrites rows whose content hash changed; query_catalog answers from the local
+indexes without touching the Merchant API.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from tools._common import account_override, mcp, to_json
+from tools.products import _iter_products, _product_summary, _projector
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    name             TEXT PRIMARY KEY,
+    offer_id         TEXT,
+    title            TEXT,
+    brand            TEXT,
+    availability     TEXT,
+    status           TEXT,
+    feed_label       TEXT,
+    channel          TEXT,
+    content_language TEXT,
+    price_micros     INTEGER,
+    currency         TEXT,
+    content_hash     TEXT NOT NULL,
+    sync_id          INTEGER NOT NULL,
+    data             TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_offer_id ON products(offer_id);
+CREATE INDEX IF NOT EXISTS idx_products_brand ON products(brand);
+CREATE INDEX IF NOT EXISTS idx_products_availability ON products(availability);
+CREATE INDEX IF NOT EXISTS idx_products_status ON products(status);
+CREATE INDEX IF NOT EXISTS idx_products_feed_label ON products(feed_label);
+CREATE INDEX IF NOT EXISTS idx_products_price ON products(price_micros);
+CREATE INDEX IF NOT EXISTS idx_products_sync_id ON products(sync_id);
+CREATE TABLE IF NOT EXISTS sync_runs (
+    sync_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  REAL NOT NULL,
+    finished_at REAL
+);
+"""
+
+# Public filter/sort field -> indexed column.
+_COLUMNS = {
+    "name": "name",
+    "offerId": "offer_id",
+    "title": "title",
+    "brand": "brand",
+    "availability": "availability",
+    "status": "status",
+    "feedLabel": "feed_label",
+    "channel": "channel",
+    "contentLanguage": "content_language",
+    "price": "price_micros",
+    "currency": "currency",
+}
+
+# Bump when _row's output changes, so the next sync rewrites every row.
+_ROW_FORMAT = 2
+
+_OPERATORS = {"eq": "=", "ne": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "LIKE"}
+
+
+def catalog_path() -> str:
+    """Return the SQLite mirror path (GMC_CATALOG_DB, default ./catalog.sqlite3).
+
+    A call with an explicit ``account`` gets its own file next to it,
+    e.g. catalog-123.sqlite3, so sub-account mirrors never mix.
+    """
+    path = os.environ.get("GMC_CATALOG_DB", "").strip() or "catalog.sqlite3"
+    account = account_override()
+    if account is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{account}{ext}"
+
+
+def connect() -> sqlite3.Connection:
+    """Open the mirror database, creating the schema if needed."""
+    conn = sqlite3.connect(catalog_path())
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def lookup_product_name(
+    conn: sqlite3.Connection,
+    offer_id: str,
+    content_language: Optional[str] = None,
+    feed_label: Optional[str] = None,
+) -> Optional[str]:
+    """Resolve an offerId to its product resource name via the local mirror.
+
+    One offerId can exist under several content languages and feed labels;
+    those narrow the match when given. Raises ValueError, listing the
+    candidates, when more than one product still matches.
+    """
+    sql, params = "SELECT name FROM products WHERE offer_id = ?", [offer_id]
+    if content_language:
+        sql += " AND content_language = ?"
+        params.append(content_language)
+    if feed_label:
+        sql += " AND feed_label = ?"
+        params.append(feed_label)
+    names = [row[0] for row in conn.execute(f"{sql} ORDER BY name LIMIT 6", params)]
+    if len(names) > 1:
+        raise ValueError(
+            f"offerId {offer_id!r} matches several products {names[:5]}; "
+            "give content_language / feed_label (or a productName column)"
+        )
+    return names[0] if names else None
+
+
+def _overall_status(pb: Any) -> Optional[str]:
+    """Worst status across all destinations: DISAPPROVED > PENDING > APPROVED."""
+    statuses = pb.product_status.destination_statuses
+    if any(ds.disapproved_countries for ds in statuses):
+        return "DISAPPROVED"
+    if any(ds.pending_countries for ds in statuses):
+        return "PENDING"
+    if any(ds.approved_countries for ds in statuses):
+        return "APPROVED"
+    return None
+
+
+def _row(
+    product: Any, content_hash: str, sync_id: int, extra: Optional[Callable[[Any], Dict[str, Any]]] = None
+) -> tuple:
+    summary = _product_summary(product)
+    if extra is not None:
+        summary.update(extra(product))
+    price = summary["price"] or {}
+    return (
+        summary["name"],
+        summary["offerId"],
+        summary["title"],
+        summary["brand"],
+        summary["availability"],
+        _overall_status(product),
+        summary["feedLabel"],
+        summary["channel"],
+        summary["contentLanguage"],
+        int(price["amountMicros"]) if price else None,
+        price.get("currencyCode"),
+        content_hash,
+        sync_id,
+        to_json(summary).decode("utf-8"),
+    )
+
+
+def _hash_salt(fields: Optional[List[str]]) -> bytes:
+    """Row format and extra fields, folded into every content hash of a sync."""
+    return to_json([_ROW_FORMAT, sorted(fields or [])])
+
+
+def _sync_page(
+    conn: sqlite3.Connection,
+    page: List[Any],
+    sync_id: int,
+    extra: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    salt: bytes = b"",
+) -> Dict[str, int]:
+    def content_hash(p: Any) -> str:
+        h = hashlib.blake2b(salt, digest_size=16)
+        h.update(p.SerializeToString(deterministic=True))
+        return h.hexdigest()
+
+    hashes = {p.name: content_hash(p) for p in page}
+    placeholders = ",".join("?" * len(hashes))
+    known = dict(conn.execute(
+        f"SELECT name, content_hash FROM products WHERE name IN ({placeholders})",
+        list(hashes),
+    ))
+    changed = [p for p in page if known.get(p.name) != hashes[p.name]]
+    unchanged = [name for name, h in hashes.items() if known.get(name) == h]
+    conn.executemany(
+        "INSERT OR REPLACE INTO products VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+        [_row(p, hashes[p.name], sync_id, extra) for p in changed],
+    )
+    if unchanged:
+        conn.execute(
+            f"UPDATE products SET sync_id = ? WHERE name IN ({','.join('?' * len(unchanged))})",
+            [sync_id, *unchanged],
+        )
+    inserted = sum(1 for p in changed if p.name not in known)
+    return {"inserted": inserted, "updated": len(changed) - inserted, "unchanged": len(unchanged)}
+
+
+@mcp.tool()
+async def sync_catalog(page_size: int = 250, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Refresh the local SQLite catalog mirror from the Merchant API.
+
+    Incremental: rows are only rewritten when the product's content hash
+    changed. The hash covers `fields` as well, so a sync with different
+    fields rewrites every row once. Products no longer returned by the API
+    are removed once the full pass completes.
+
+    Args:
+        page_size: Products per API page (max 250).
+        fields: Extra Product field paths to keep in each mirrored row next to
+            the summary keys, e.g. ['product_attributes.gtins'].
+    """
+    extra = _projector(fields) if fields else None
+    salt = _hash_salt(fields)
+    started = time.perf_counter()
+    conn = connect()
+    try:
+        sync_id = conn.execute(
+            "INSERT INTO sync_runs (started_at) VALUES (?)", (time.time(),)
+        ).lastrowid
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+        page: List[Any] = []
+        async for product in _iter_products(page_size, raw=True):
+            page.append(product)
+            if len(page) >= page_size:
+                for key, n in _sync_page(conn, page, sync_id, extra, salt).items():
+                    totals[key] += n
+                conn.commit()
+                page = []
+        if page:
+            for key, n in _sync_page(conn, page, sync_id, extra, salt).items():
+                totals[key] += n
+        deleted = conn.execute("DELETE FROM products WHERE sync_id != ?", (sync_id,)).rowcount
+        conn.execute("UPDATE sync_runs SET finished_at = ? WHERE sync_id = ?", (time.time(), sync_id))
+        conn.commit()
+    finally:
+        conn.close()
+    return {
+        **totals,
+        "deleted": deleted,
+        "path": os.path.abspath(catalog_path()),
+        "elapsedSeconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _where(filter: Dict[str, Any]) -> tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    for field, cond in filter.items():
+        column = _COLUMNS.get(field)
+        if column is None:
+            raise ValueError(f"Cannot filter on {field!r}; choose from {sorted(_COLUMNS)}")
+        if isinstance(cond, list):
+            clauses.append(f"{column} IN ({','.join('?' * len(cond))})")
+            params.extend(cond)
+        elif isinstance(cond, dict):
+            for op, value in cond.items():
+                if op not in _OPERATORS:
+                    raise ValueError(f"Unknown operator {op!r}; choose from {sorted(_OPERATORS)}")
+                clauses.append(f"{column} {_OPERATORS[op]} ?")
+                params.append(value)
+        elif cond is None:
+            clauses.append(f"{column} IS NULL")
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(cond)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _select(row: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    return {f: row.get(f) for f in fields} if fields else row
+
+
+@mcp.tool()
+async def query_catalog(
+    filter: Optional[Dict[str, Any]] = None,
+    sort: Optional[str] = None,
+    limit: int = 100,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Query the local catalog mirror (run sync_catalog first).
+
+    Args:
+        filter: Field -> condition. A scalar means equality, a list means IN,
+            a dict applies operators (eq, ne, gt, gte, lt, lte, like).
+            Fields: offerId, title, brand, availability, status, feedLabel,
+            channel, contentLanguage, price (micros), currency, name.
+            Example: {"brand": "MyBrand", "status": "DISAPPROVED",
+                      "price": {"gte": 10000000}}
+        sort: Field to sort by; prefix with '-' for descending, e.g. '-price'.
+        limit: Max rows returned (max 1000).
+        fields: Only return these keys of each mirrored row (summary keys or
+            the extra paths given to sync_catalog).
+    """
+    started = time.perf_counter()
+    where, params = _where(filter or {})
+    order = ""
+    if sort:
+        column = _COLUMNS.get(sort.lstrip("-"))
+        if column is None:
+            raise ValueError(f"Cannot sort on {sort!r}; choose from {sorted(_COLUMNS)}")
+        order = f" ORDER BY {column} {'DESC' if sort.startswith('-') else 'ASC'}"
+    conn = connect()
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM products{where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT data FROM products{where}{order} LIMIT ?",
+            [*params, max(0, min(limit, 1000))],
+        ).fetchall()
+        last_sync = conn.execute(
+            "SELECT MAX(finished_at) FROM sync_runs WHERE finished_at IS NOT NULL"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return {
+        "products": [_select(json.loads(data), fields) for (data,) in rows],
+        "totalMatched": total,
+        "totalReturned": len(rows),
+        "lastSyncedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(last_sync)) if last_sync else None,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -9,45 +9,30 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from tools._common import mcp, account_name, merchant_id, _get_credentials
+from tools._common import mcp, account_name, merchant_id, rest_request
 
 
-def _collections_http_request(method: str, path: str, body: Optional[Dict] = None) -> Dict[str, Any]:
-    """Make an authenticated HTTP request to the Merchant API collections endpoint."""
-    import google.auth.transport.requests
-    import urllib.request
-    import json
-
-    credentials = _get_credentials()
-    auth_req = google.auth.transport.requests.Request()
-    credentials.refresh(auth_req)
-
-    base = f"https://merchantapi.googleapis.com/collections/v1beta/{path}"
-    data = json.dumps(body).encode() if body else None
-    req = urllib.request.Request(
-        base,
-        data=data,
-        method=method,
-        headers={
-            "Authorization": f"Bearer {credentials.token}",
-            "Content-Type": "application/json",
-        },
+async def _collections_http_request(
+    method: str,
+    path: str,
+    body: Optional[Dict] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Make an authenticated request to the Merchant API collections endpoint."""
+    return await rest_request(
+        method, f"collections/v1beta/{path}", params=params, json_body=body
     )
-    with urllib.request.urlopen(req) as resp:
-        return json.loads(resp.read())
 
 
 @mcp.tool()
-def list_collections(page_token: Optional[str] = None) -> Dict[str, Any]:
+async def list_collections(page_token: Optional[str] = None) -> Dict[str, Any]:
     """List product collections for this GMC account.
 
     Note: Uses Merchant API v1beta REST endpoint (no stable Python client yet).
     """
-    acct = account_name()
-    path = f"{acct}/collections"
-    if page_token:
-        path += f"?pageToken={page_token}"
-    result = _collections_http_request("GET", path)
+    path = f"{account_name()}/collections"
+    params = {"pageToken": page_token} if page_token else None
+    result = await _collections_http_request("GET", path, params=params)
     return {
         "collections": result.get("collections", []),
         "nextPageToken": result.get("nextPageToken"),
@@ -56,18 +41,18 @@ def list_collections(page_token: Optional[str] = None) -> Dict[str, Any]:
 
 
 @mcp.tool()
-def get_collection(collection_id: str) -> Dict[str, Any]:
+async def get_collection(collection_id: str) -> Dict[str, Any]:
     """Get details of a single collection.
 
     Args:
         collection_id: Collection ID.
     """
     path = f"{account_name()}/collections/{collection_id}"
-    return _collections_http_request("GET", path)
+    return await _collections_http_request("GET", path)
 
 
 @mcp.tool()
-def create_collection(
+async def create_collection(
     collection_id: str,
     headline: str,
     link: str,
@@ -95,4 +80,4 @@ def create_collection(
     if featured_product_ids:
         body["featuredProduct"] = [{"offerId": oid} for oid in featured_product_ids]
     path = f"{account_name()}/collections"
-    return _collections_http_request("POST", path, body)
+    return await _collections_http_request("POST", path, body)
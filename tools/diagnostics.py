@@ -0,0 +1,109 @@
+"""Server diagnostics — auth, caching and runtime stats for this MCP server."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional
+
+from tools._common import account_independent, mcp, startup_report, token_manager
+from tools._cache import response_cache, singleflight
+from tools._metrics import metrics
+from tools._profiling import profiler
+from tools._scheduler import scheduler
+
+
+@mcp.tool()
+@account_independent
+async def get_auth_stats() -> Dict[str, Any]:
+    """Show OAuth token manager stats: refreshes done vs. avoided by the shared cache."""
+    return token_manager.stats()
+
+
+@mcp.tool()
+@account_independent
+async def get_startup_report() -> Dict[str, Any]:
+    """Per-sub-service warm-up timings (import, client, connect) from server start.
+
+    Only populated when the server runs with --warmup or GMC_WARMUP=1.
+    """
+    return startup_report
+
+
+@mcp.tool()
+@account_independent
+async def get_cache_stats() -> Dict[str, Any]:
+    """Response cache stats for the read-mostly account tools (hits, misses, TTLs).
+
+    Also reports request coalescing for get_product, render_product_issues and
+    get_account_issues: upstream calls made vs. concurrent duplicates served
+    from an in-flight call.
+    """
+    return {**response_cache.stats(), "coalescing": singleflight.stats()}
+
+
+@mcp.tool()
+@account_independent
+async def get_scheduler_stats() -> Dict[str, Any]:
+    """Per-sub-service rate limiter state: current qps, throttles, retries, queue depth."""
+    return scheduler.stats()
+
+
+@mcp.tool()
+@account_independent
+async def get_metrics(tool: Optional[str] = None) -> Dict[str, Any]:
+    """Per-tool latency (p50/p95/p99), call and error counts, response sizes and
+    upstream RPCs per sub-service, plus per-sub-service RPC latency since start.
+
+    Set GMC_METRICS_PORT to also serve these in Prometheus text format at
+    http://127.0.0.1:<port>/metrics.
+
+    Args:
+        tool: Only return this tool's entry.
+    """
+    stats = metrics.stats()
+    if tool is not None:
+        stats["tools"] = {tool: stats["tools"].get(tool)}
+    return stats
+
+
+@mcp.tool()
+@account_independent
+async def get_slowest_calls(
+    tool: Optional[str] = None, limit: int = 20, reset: bool = False
+) -> Dict[str, Any]:
+    """Slowest tool calls with time split into import, auth, rpc, convert,
+    serialize and other phases. Needs GMC_PROFILE=1.
+
+    Sampled calls also add collapsed stacks to <GMC_PROFILE_DIR>/<tool>.folded
+    (render with flamegraph.pl or speedscope).
+
+    Args:
+        tool: Only calls of this tool.
+        limit: Maximum entries returned.
+        reset: Clear the list after reading it.
+    """
+    if not profiler.enabled:
+        return {"enabled": False, "hint": "Start the server with GMC_PROFILE=1."}
+    calls = profiler.slowest(tool, limit)
+    if reset:
+        profiler.reset()
+    return {
+        "enabled": True,
+        "sampleRate": profiler.rate,
+        "profileDir": os.path.abspath(profiler.directory),
+        "callsSeen": profiler.calls,
+        "callsSampled": profiler.sampled_calls,
+        "calls": calls,
+    }
+
+
+@mcp.tool()
+@account_independent
+async def clear_cache(resource: Optional[str] = None) -> Dict[str, Any]:
+    """Drop cached responses so the next read goes to the Merchant API.
+
+    Args:
+        resource: One of account, programs, datasources, shipping,
+            return_policies, promotions. None clears everything.
+    """
+    return {"cleared": response_cache.invalidate(resource), "resource": resource}
@@ -0,0 +1,394 @@
+"""Streaming readers for local product feed files (Google feed format).
+
+Reads Google-format TSV / CSV files (header row of attribute names such as
+id, title, price, image_link) and RSS 2.0 / Atom XML feeds (g: namespace)
+and yields product_input dicts in the shape documented on
+insert_product_input. Rows are read one at a time: XML is parsed with
+iterparse and every finished item is detached from the tree, so memory
+stays flat however large the file is. Files ending in .gz are decompressed
+on the fly.
+
+Prices ('15.00 USD') become {amountMicros, currencyCode}. Enum values
+('in stock') become API names ('IN_STOCK'). Attributes without a
+ProductAttributes field are kept as customAttributes. Each record is checked
+for the required fields before it is yielded; see iter_feed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import datetime
+import functools
+import gzip
+import io
+import os
+import time
+from collections import defaultdict
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from tools._common import (
+    account_independent,
+    iter_json_records,
+    mcp,
+    parse_price,
+    summarize_failures,
+)
+
+FEED_EXTENSIONS = (".tsv", ".txt", ".csv", ".xml")
+
+_G_NS = "http://base.google.com/ns/1.0"
+_ATOM_NS = "http://www.w3.org/2005/Atom"
+# Atom elements that carry product data; everything else in Atom (id, updated) is metadata.
+_ATOM_FIELDS = {"title": "title", "summary": "description", "content": "description", "link": "link"}
+_RSS_METADATA = {"guid", "pubdate", "author", "comments", "source", "enclosure", "category"}
+
+_STRING = {
+    "title", "description", "link", "mobile_link", "canonical_link", "image_link", "brand", "color",
+    "google_product_category", "item_group_id", "item_group_title", "material", "mpn", "pattern", "size",
+    "shipping_label", "return_policy_label", "transit_time_label", "ads_redirect", "ads_grouping",
+    "link_template", "mobile_link_template", "external_seller_id", "short_title", "display_ads_id",
+    "display_ads_title", "display_ads_link", "virtual_model_link",
+    "custom_label_0", "custom_label_1", "custom_label_2", "custom_label_3", "custom_label_4",
+}
+# Feed attribute (singular) -> repeated ProductAttributes field.
+_REPEATED = {
+    "additional_image_link": "additional_image_links",
+    "lifestyle_image_link": "lifestyle_image_links",
+    "gtin": "gtins",
+    "product_type": "product_types",
+    "product_highlight": "product_highlights",
+    "promotion_id": "promotion_ids",
+    "ads_label": "ads_labels",
+    "shopping_ads_excluded_country": "shopping_ads_excluded_countries",
+    "video_link": "video_links",
+    "display_ads_similar_id": "display_ads_similar_ids",
+}
+# Repeated attributes whose TSV/CSV cells may hold several comma-separated values.
+_COMMA_SEPARATED = {
+    "additional_image_link", "lifestyle_image_link", "gtin", "promotion_id", "ads_label",
+    "shopping_ads_excluded_country", "video_link", "display_ads_similar_id",
+    "included_destination", "excluded_destination", "size_type", "shipping",
+}
+_ENUM = {
+    "availability", "condition", "gender", "age_group", "size_system", "energy_efficiency_class",
+    "min_energy_efficiency_class", "max_energy_efficiency_class", "pause", "pickup_method", "pickup_sla",
+}
+_REPEATED_ENUM = {
+    "size_type": "size_types",
+    "included_destination": "included_destinations",
+    "excluded_destination": "excluded_destinations",
+}
+_BOOL = {"identifier_exists", "is_bundle", "adult"}
+_INT = {"multipack", "max_handling_time", "min_handling_time", "sell_on_google_quantity"}
+_PRICE = {"price", "sale_price", "cost_of_goods_sold", "auto_pricing_min_price", "maximum_retail_price"}
+_WEIGHT = {"shipping_weight", "product_weight"}
+_TIMESTAMP = {"availability_date", "expiration_date"}
+_TOP_LEVEL = {"id": "offerId", "offer_id": "offerId", "content_language": "contentLanguage",
+              "feed_label": "feedLabel"}
+
+_REQUIRED_ATTRIBUTES = ("title", "link", "imageLink", "availability", "price")
+
+
+class FeedError(ValueError):
+    """An invalid feed row; ``reason`` omits the row so errors can be grouped."""
+
+    def __init__(self, row: int, reason: str, offer_id: Optional[str] = None):
+        super().__init__(f"row {row}: {reason}")
+        self.row = row
+        self.reason = reason
+        self.offer_id = offer_id
+
+
+@functools.lru_cache(maxsize=1024)
+def _camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+@functools.lru_cache(maxsize=None)
+def _enum_names(attribute: str) -> frozenset:
+    from google.shopping import merchant_products_v1
+
+    field = _REPEATED_ENUM.get(attribute, attribute)
+    enum = merchant_products_v1.ProductAttributes.meta.fields[field].enum
+    return frozenset(enum.__members__)
+
+
+@functools.lru_cache(maxsize=4096)
+def _enum(attribute: str, value: str) -> str:
+    name = value.strip().upper().replace(" ", "_").replace("-", "_")
+    if name not in _enum_names(attribute):
+        raise ValueError(f"invalid {attribute} {value!r}")
+    return name
+
+
+def _bool(attribute: str, value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ("yes", "true", "1", "y"):
+        return True
+    if lowered in ("no", "false", "0", "n"):
+        return False
+    raise ValueError(f"invalid {attribute} {value!r}")
+
+
+def _weight(value: str) -> Dict[str, Any]:
+    number, _, unit = value.strip().partition(" ")
+    return {"value": float(number), "unit": unit.strip() or "kg"}
+
+
+def _timestamp(value: str) -> str:
+    """ISO 8601 date / datetime (any offset) -> RFC 3339 UTC."""
+    text = value.strip().replace("Z", "+00:00")
+    parsed = datetime.datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _shipping(value: Any, currency: Optional[str]) -> Dict[str, Any]:
+    """'US:CA:Express:16.00 USD' (country:region:service:price) or an XML sub-element dict."""
+    if isinstance(value, str):
+        parts = value.split(":")
+        if len(parts) != 4:
+            raise ValueError(f"invalid shipping {value!r}; expected country:region:service:price")
+        value = dict(zip(("country", "region", "service", "price"), parts))
+    out: Dict[str, Any] = {k: v.strip() for k, v in value.items() if k in ("country", "region", "service") and v}
+    if value.get("price"):
+        out["price"] = parse_price(value["price"], currency)
+    return out
+
+
+def _to_product_input(
+    fields: Dict[str, List[Any]],
+    content_language: Optional[str],
+    feed_label: Optional[str],
+    currency: Optional[str],
+) -> Dict[str, Any]:
+    """Map attribute -> values (as read from the feed) onto the product_input shape."""
+    product: Dict[str, Any] = {}
+    attributes: Dict[str, Any] = {}
+    custom: List[Dict[str, str]] = []
+    for name, values in fields.items():
+        first = values[0]
+        if name in _TOP_LEVEL:
+            product[_TOP_LEVEL[name]] = first.strip()
+        elif name in _STRING:
+            attributes[_camel(name)] = first
+        elif name in _REPEATED:
+            attributes[_camel(_REPEATED[name])] = values
+        elif name in _ENUM:
+            attributes[_camel(name)] = _enum(name, first)
+        elif name in _REPEATED_ENUM:
+            attributes[_camel(_REPEATED_ENUM[name])] = [_enum(name, v) for v in values]
+        elif name in _BOOL:
+            attributes[_camel(name)] = _bool(name, first)
+        elif name in _INT:
+            attributes[_camel(name)] = str(int(first))
+        elif name in _PRICE:
+            attributes[_camel(name)] = parse_price(first, currency)
+        elif name in _WEIGHT:
+            attributes[_camel(name)] = _weight(first)
+        elif name in _TIMESTAMP:
+            attributes[_camel(name)] = _timestamp(first)
+        elif name == "shipping":
+            attributes["shipping"] = [_shipping(v, currency) for v in values]
+        else:
+            custom.extend({"name": name, "value": v} for v in values if isinstance(v, str))
+    product.setdefault("contentLanguage", content_language)
+    product.setdefault("feedLabel", feed_label)
+    missing = [k for k in ("offerId", "contentLanguage", "feedLabel") if not product.get(k)]
+    missing += [k for k in _REQUIRED_ATTRIBUTES if k not in attributes]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    product["productAttributes"] = attributes
+    if custom:
+        product["customAttributes"] = custom
+    return product
+
+
+def _open(path: str) -> Tuple[IO[Any], str]:
+    """Binary file handle (gunzipped for .gz) and the extension of the feed inside."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb"), os.path.splitext(path[:-3])[1].lower()
+    return open(path, "rb"), os.path.splitext(path)[1].lower()
+
+
+def _attribute_name(header: str) -> str:
+    name = header.strip().lower().replace(" ", "_").replace("-", "_")
+    return name[2:] if name.startswith("g:") else name
+
+
+def _delimited_rows(fh: IO[bytes], delimiter: Optional[str]) -> Iterator[Tuple[int, Dict[str, List[Any]]]]:
+    text = io.TextIOWrapper(fh, encoding="utf-8-sig", newline="")
+    header_line = text.readline()
+    if delimiter is None:
+        delimiter = "\t" if "\t" in header_line else ","
+    csv.field_size_limit(max(csv.field_size_limit(), 16 * 1024 * 1024))
+    names = [_attribute_name(h) for h in next(csv.reader([header_line], delimiter=delimiter))]
+    reader = csv.reader(text, delimiter=delimiter)
+    for cells in reader:
+        if not any(cells):
+            continue
+        fields: Dict[str, List[Any]] = {}
+        for name, cell in zip(names, cells):
+            cell = cell.strip()
+            if not cell or not name:
+                continue
+            if name in _COMMA_SEPARATED:
+                values = [v.strip() for v in cell.split(",") if v.strip()]
+            else:
+                values = [cell]
+            fields.setdefault(name, []).extend(values)
+        yield reader.line_num + 1, fields
+
+
+_ITEM_TAGS = {"item", "entry", f"{{{_ATOM_NS}}}entry", f"{{{_G_NS}}}item"}
+
+
+@functools.lru_cache(maxsize=1024)
+def _xml_name(tag: str) -> Optional[str]:
+    """Attribute name of an item child element, or None to ignore it."""
+    ns, _, local = tag[1:].partition("}") if tag.startswith("{") else ("", "", tag)
+    local = local.lower()
+    if ns == _G_NS:
+        return local
+    if ns == _ATOM_NS:
+        return _ATOM_FIELDS.get(local)
+    if ns == "" and local not in _RSS_METADATA:
+        return local
+    return None
+
+
+def _xml_items(fh: IO[bytes]) -> Iterator[Tuple[int, Dict[str, List[Any]]]]:
+    from xml.etree.ElementTree import iterparse
+
+    stack: List[Any] = []
+    count = 0
+    for event, elem in iterparse(fh, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag not in _ITEM_TAGS:
+            continue
+        count += 1
+        fields: Dict[str, List[Any]] = {}
+        for child in elem:
+            name = _xml_name(child.tag)
+            if name is None:
+                continue
+            if len(child):
+                value: Any = {_xml_name(c.tag): (c.text or "").strip() for c in child}
+            elif name == "link" and child.get("href"):
+                value = child.get("href")
+            else:
+                value = (child.text or "").strip()
+            if value:
+                fields.setdefault(name, []).append(value)
+        # Detach the finished item so the tree never grows past one item.
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+        yield count, fields
+
+
+def iter_feed(
+    path: str,
+    content_language: Optional[str] = None,
+    feed_label: Optional[str] = None,
+    currency: Optional[str] = None,
+    on_error: Optional[Callable[[FeedError], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield product_input dicts from a TSV/CSV/XML feed file, one row at a time.
+
+    content_language / feed_label apply to rows that do not carry their own
+    content_language / feed_label column. currency is used for prices
+    without one. An invalid row raises FeedError, or is passed to
+    *on_error* and skipped when given.
+    """
+    fh, extension = _open(path)
+    with fh:
+        if extension == ".xml":
+            rows = _xml_items(fh)
+        elif extension in (".tsv", ".txt", ".csv"):
+            rows = _delimited_rows(fh, "," if extension == ".csv" else None)
+        else:
+            raise ValueError(f"{path}: unsupported feed type; use one of {FEED_EXTENSIONS} (optionally .gz)")
+        for row, fields in rows:
+            try:
+                yield _to_product_input(fields, content_language, feed_label, currency)
+            except ValueError as exc:
+                ids = fields.get("id") or fields.get("offer_id")
+                error = FeedError(row, str(exc), ids[0] if ids else None)
+                if on_error is None:
+                    raise error from None
+                on_error(error)
+
+
+def is_feed_file(path: str) -> bool:
+    return path.lower().removesuffix(".gz").endswith(FEED_EXTENSIONS)
+
+
+def read_product_inputs(
+    path: str,
+    content_language: Optional[str] = None,
+    feed_label: Optional[str] = None,
+    currency: Optional[str] = None,
+    on_error: Optional[Callable[[FeedError], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """product_input dicts from a feed file (iter_feed) or a JSON / NDJSON file."""
+    if is_feed_file(path):
+        return iter_feed(path, content_language, feed_label, currency, on_error)
+    return iter_json_records(path)
+
+
+@mcp.tool()
+@account_independent
+async def validate_feed(
+    file_path: str,
+    content_language: Optional[str] = None,
+    feed_label: Optional[str] = None,
+    currency: Optional[str] = None,
+    sample: int = 3,
+) -> Dict[str, Any]:
+    """Parse a local TSV/CSV/XML product feed and report what it would send.
+
+    Streams the whole file (memory stays flat) without calling the API.
+    Returns valid / invalid row counts, errors grouped by reason with sample
+    offer IDs or row numbers, and the first product_input dicts as mapped for
+    insert_product_input / bulk_insert_product_inputs / sync_product_inputs.
+
+    Args:
+        file_path: Local .tsv/.txt/.csv/.xml feed, optionally .gz compressed.
+        content_language: For rows without a content_language column, e.g. 'de'.
+        feed_label: For rows without a feed_label column, e.g. 'DE'.
+        currency: For prices without a currency code, e.g. 'EUR'.
+        sample: Number of mapped records to return.
+    """
+    failures: Dict[str, List[str]] = defaultdict(list)
+
+    def invalid(error: FeedError) -> None:
+        failures[error.reason].append(error.offer_id or f"row {error.row}")
+
+    def scan() -> Tuple[int, List[Dict[str, Any]]]:
+        valid, head = 0, []
+        for record in iter_feed(file_path, content_language, feed_label, currency, invalid):
+            valid += 1
+            if len(head) < sample:
+                head.append(record)
+        return valid, head
+
+    started = time.perf_counter()
+    valid, head = await asyncio.to_thread(scan)
+    elapsed = time.perf_counter() - started
+    rows = valid + sum(len(ids) for ids in failures.values())
+    return {
+        "rows": rows,
+        "valid": valid,
+        "invalid": rows - valid,
+        "errors": summarize_failures(failures),
+        "sample": head,
+        "elapsedSeconds": round(elapsed, 3),
+        "rowsPerSecond": round(rows / elapsed) if elapsed else None,
+    }
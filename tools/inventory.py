@@ -2,18 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from tools._common import (
     mcp,
+    Pacer,
     account_name,
+    error_key,
+    iter_json_records,
+    message_to_dict,
+    merchant_id,
+    parse_price,
+    run_bounded,
+    summarize_failures,
+    to_message,
     get_local_inventory_client,
     get_regional_inventory_client,
 )
+from tools.catalog import connect as catalog_connect, lookup_product_name
 
 
 @mcp.tool()
-def insert_local_inventory(
+async def insert_local_inventory(
     product_name: str,
     store_code: str,
     quantity: int,
@@ -32,26 +47,39 @@ def insert_local_inventory(
         availability: 'IN_STOCK', 'OUT_OF_STOCK', or 'LIMITED_AVAILABILITY'.
     """
     client = get_local_inventory_client()
+    request = _local_inventory_request(
+        product_name, store_code, quantity,
+        {"amountMicros": price_amount_micros, "currencyCode": price_currency},
+        availability,
+    )
+    result = await client.insert_local_inventory(request=request)
+    return message_to_dict(result)
+
+
+def _local_inventory_request(
+    product_name: str,
+    store_code: str,
+    quantity: Optional[int],
+    price: Optional[Dict[str, str]],
+    availability: str,
+) -> Any:
     from google.shopping import merchant_inventories_v1beta
-    local_inventory = {
+    local_inventory: Dict[str, Any] = {
         "storeCode": store_code,
         "availability": availability,
-        "quantity": quantity,
-        "price": {
-            "amountMicros": price_amount_micros,
-            "currencyCode": price_currency,
-        },
     }
-    request = merchant_inventories_v1beta.InsertLocalInventoryRequest(
+    if quantity is not None:
+        local_inventory["quantity"] = quantity
+    if price:
+        local_inventory["price"] = price
+    return merchant_inventories_v1beta.InsertLocalInventoryRequest(
         parent=product_name,
-        local_inventory=local_inventory,
+        local_inventory=to_message(merchant_inventories_v1beta.LocalInventory, local_inventory),
     )
-    result = client.insert_local_inventory(request=request)
-    return type(result).to_dict(result)
 
 
 @mcp.tool()
-def insert_regional_inventory(
+async def insert_regional_inventory(
     product_name: str,
     region: str,
     price_amount_micros: str,
@@ -72,23 +100,240 @@ def insert_regional_inventory(
         sale_price_amount_micros: Optional sale price in micros.
     """
     client = get_regional_inventory_client()
+    request = _regional_inventory_request(
+        product_name, region,
+        {"amountMicros": price_amount_micros, "currencyCode": price_currency},
+        availability,
+        {"amountMicros": sale_price_amount_micros, "currencyCode": price_currency}
+        if sale_price_amount_micros else None,
+    )
+    result = await client.insert_regional_inventory(request=request)
+    return message_to_dict(result)
+
+
+def _regional_inventory_request(
+    product_name: str,
+    region: str,
+    price: Optional[Dict[str, str]],
+    availability: str,
+    sale_price: Optional[Dict[str, str]] = None,
+) -> Any:
     from google.shopping import merchant_inventories_v1beta
     regional_inventory: Dict[str, Any] = {
         "region": region,
         "availability": availability,
-        "price": {
-            "amountMicros": price_amount_micros,
-            "currencyCode": price_currency,
-        },
     }
-    if sale_price_amount_micros:
-        regional_inventory["salePrice"] = {
-            "amountMicros": sale_price_amount_micros,
-            "currencyCode": price_currency,
-        }
-    request = merchant_inventories_v1beta.InsertRegionalInventoryRequest(
+    if price:
+        regional_inventory["price"] = price
+    if sale_price:
+        regional_inventory["salePrice"] = sale_price
+    return merchant_inventories_v1beta.InsertRegionalInventoryRequest(
         parent=product_name,
-        regional_inventory=regional_inventory,
+        regional_inventory=to_message(
+            merchant_inventories_v1beta.RegionalInventory, regional_inventory
+        ),
     )
-    result = client.insert_regional_inventory(request=request)
-    return type(result).to_dict(result)
+
+
+# ---------------------------------------------------------------------------
+# Bulk pipeline (CSV / NDJSON of store or region stock)
+# ---------------------------------------------------------------------------
+
+_CHECKPOINT_EVERY = 1000
+
+
+def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Lower-case keys without separators: 'storeCode'/'store_code' -> 'storecode'."""
+    return {
+        k.replace("_", "").replace("-", "").lower(): v
+        for k, v in row.items()
+        if k is not None and v not in (None, "")
+    }
+
+
+def _iter_rows(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Stream (row_index, normalized_row) from a CSV/TSV or NDJSON file."""
+    if path.endswith((".ndjson", ".jsonl", ".json")):
+        rows: Iterable[Dict[str, Any]] = iter_json_records(path)
+        yield from ((i, _normalize_row(r)) for i, r in enumerate(rows))
+        return
+    with open(path, newline="", encoding="utf-8") as fh:
+        delimiter = "\t" if path.endswith(".tsv") else ","
+        for i, row in enumerate(csv.DictReader(fh, delimiter=delimiter)):
+            yield i, _normalize_row(row)
+
+
+class _Checkpoint:
+    """Resumable progress marker for a bulk run over one input file.
+
+    Rows complete out of order, so only the contiguous prefix of finished rows
+    (the watermark) is persisted, together with the indices of rows that
+    failed. A rerun redoes the rows past the watermark, which is safe because
+    inventory inserts are upserts, and retries the failed rows.
+    """
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        stat = os.stat(source)
+        self.fingerprint = {
+            "account": account_name(),
+            "source": os.path.abspath(source),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+        self.watermark = 0
+        self.failed: set[int] = set()
+        self._pending: set[int] = set()
+        self._since_save = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                saved = json.load(fh)
+            if saved.get("fingerprint") == self.fingerprint:
+                self.watermark = saved.get("completedRows", 0)
+                self.failed = set(saved.get("failedRows", []))
+
+    def wanted(self, index: int) -> bool:
+        """True if row *index* still has to be written."""
+        return index >= self.watermark or index in self.failed
+
+    def done(self, index: int, ok: bool = True) -> None:
+        if ok:
+            self.failed.discard(index)
+        else:
+            self.failed.add(index)
+        if index >= self.watermark:
+            self._pending.add(index)
+        while self.watermark in self._pending:
+            self._pending.discard(self.watermark)
+            self.watermark += 1
+        self._since_save += 1
+        if self._since_save >= _CHECKPOINT_EVERY:
+            self.save()
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({
+                "fingerprint": self.fingerprint,
+                "completedRows": self.watermark,
+                "failedRows": sorted(self.failed),
+            }, fh)
+        os.replace(tmp, self.path)
+        self._since_save = 0
+
+
+@mcp.tool()
+async def bulk_update_inventory(
+    file_path: str,
+    price_currency: str = "EUR",
+    content_language: Optional[str] = None,
+    feed_label: Optional[str] = None,
+    concurrency: int = 16,
+    max_per_second: float = 50.0,
+    checkpoint_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Push local/regional inventory for many products from a CSV or NDJSON file.
+
+    Each row needs offerId (or productName) plus storeCode (local inventory)
+    or region (regional inventory); optional columns: quantity, price,
+    salePrice, availability, contentLanguage, feedLabel. Prices may be '4.99' or '4.99 EUR'.
+
+    The file is streamed, writes fan out with at most `concurrency` in flight,
+    and progress is checkpointed so a rerun after a crash resumes where it
+    stopped. Rows that failed are recorded and retried by the next run; a
+    file that went through cleanly is skipped until it changes.
+
+    Args:
+        file_path: Local .csv, .tsv, .ndjson or .jsonl file.
+        price_currency: Currency for prices without one.
+        content_language: With feed_label, build product names directly as
+            accounts/{id}/products/{content_language}~{feed_label}~{offerId}.
+            Otherwise offerIds are resolved through the local catalog mirror
+            (run sync_catalog first), narrowed by whichever of the two is
+            given or by contentLanguage / feedLabel columns. A row whose
+            offerId still matches several products fails.
+        feed_label: See content_language.
+        concurrency: Max in-flight writes.
+        max_per_second: Write pacing, to stay within the API quota.
+        checkpoint_path: Defaults to '<file_path>.<merchant id>.checkpoint.json',
+            so each account keeps its own progress for the same file.
+    """
+    checkpoint = _Checkpoint(
+        checkpoint_path or f"{file_path}.{merchant_id()}.checkpoint.json", file_path
+    )
+    resumed_from = checkpoint.watermark
+    retried = len(checkpoint.failed)
+    catalog = None if content_language and feed_label else catalog_connect()
+    local_client = get_local_inventory_client()
+    regional_client = get_regional_inventory_client()
+    pacer = Pacer(max_per_second)
+
+    def product_name(row: Dict[str, Any]) -> str:
+        if "productname" in row:
+            return row["productname"]
+        offer_id = row.get("offerid")
+        if not offer_id:
+            raise ValueError("row has neither offerId nor productName")
+        if catalog is None:
+            return f"{account_name()}/products/{content_language}~{feed_label}~{offer_id}"
+        name = lookup_product_name(
+            catalog,
+            offer_id,
+            row.get("contentlanguage", content_language),
+            row.get("feedlabel", feed_label),
+        )
+        if name is None:
+            raise LookupError(f"offerId {offer_id!r} not in catalog mirror")
+        return name
+
+    async def write(indexed: Tuple[int, Dict[str, Any]]) -> None:
+        _, row = indexed
+        availability = str(row.get("availability", "IN_STOCK")).upper()
+        price = parse_price(row["price"], price_currency) if "price" in row else None
+        if "storecode" in row:
+            quantity = int(row["quantity"]) if "quantity" in row else None
+            request = _local_inventory_request(
+                product_name(row), row["storecode"], quantity, price, availability
+            )
+            call = local_client.insert_local_inventory
+        elif "region" in row:
+            sale_price = parse_price(row["saleprice"], price_currency) if "saleprice" in row else None
+            request = _regional_inventory_request(
+                product_name(row), row["region"], price, availability, sale_price
+            )
+            call = regional_client.insert_regional_inventory
+        else:
+            raise ValueError("row has neither storeCode nor region")
+        await call(request=request)
+
+    started = time.perf_counter()
+    rows = ((i, r) for i, r in _iter_rows(file_path) if checkpoint.wanted(i))
+    succeeded = 0
+    failures: Dict[str, List[str]] = defaultdict(list)
+    try:
+        async for (index, row), _, error in run_bounded(
+            rows, write, concurrency=concurrency, pacer=pacer
+        ):
+            if error is None:
+                succeeded += 1
+            else:
+                label = row.get("offerid") or row.get("productname") or f"row {index}"
+                failures[error_key(error)].append(str(label))
+            checkpoint.done(index, ok=error is None)
+    finally:
+        checkpoint.save()
+        if catalog is not None:
+            catalog.close()
+    elapsed = time.perf_counter() - started
+    failed = sum(len(ids) for ids in failures.values())
+    return {
+        "succeeded": succeeded,
+        "failed": failed,
+        "failures": summarize_failures(failures),
+        "resumedFromRow": resumed_from,
+        "retriedFailedRows": retried,
+        "completedRows": checkpoint.watermark,
+        "checkpointPath": checkpoint.path,
+        "elapsedSeconds": round(elapsed, 3),
+        "rowsPerSecond": round((succeeded + failed) / elapsed, 1) if elapsed else None,
+    }
@@ -2,27 +2,202 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import functools
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 
 from tools._common import (
     mcp,
+    Pacer,
     account_name,
+    error_key,
+    export_dir,
+    message_to_dict,
+    run_bounded,
+    summarize_failures,
+    to_json,
+    to_message,
     get_products_client,
     get_product_inputs_client,
 )
+from tools._cache import coalesced
+from tools.feeds import FeedError, read_product_inputs
+
+
+def _price(price: Any) -> Optional[Dict[str, Any]]:
+    if not price.currency_code:
+        return None
+    return {"amountMicros": str(price.amount_micros), "currencyCode": price.currency_code}
+
+
+def _raw(message: Any) -> Any:
+    """The protobuf message behind a proto-plus wrapper (no copy)."""
+    return type(message).pb(message) if hasattr(type(message), "pb") else message
+
+
+def _availability(p: Any) -> Optional[str]:
+    value = p.product_attributes.availability
+    if not value:
+        return None
+    enum = p.product_attributes.DESCRIPTOR.fields_by_name["availability"].enum_type
+    return enum.values_by_number[value].name if value in enum.values_by_number else str(value)
+
+
+def _product_status(p: Any) -> Optional[Dict[str, Any]]:
+    if not p.HasField("product_status"):
+        return None
+    return message_to_dict(p.product_status)
+
+
+# list_products projection: summary key -> reader over the raw Product message.
+_SUMMARY_READERS: Dict[str, Callable[[Any], Any]] = {
+    "name": lambda p: p.name,
+    "productId": lambda p: p.name.rsplit("/", 1)[-1] or None,
+    "title": lambda p: p.product_attributes.title or None,
+    "brand": lambda p: p.product_attributes.brand or None,
+    "availability": _availability,
+    "price": lambda p: _price(p.product_attributes.price),
+    "link": lambda p: p.product_attributes.link or None,
+    "imageLink": lambda p: p.product_attributes.image_link or None,
+    "channel": lambda p: "LOCAL" if p.legacy_local else "ONLINE",
+    "contentLanguage": lambda p: p.content_language or None,
+    "feedLabel": lambda p: p.feed_label or None,
+    "offerId": lambda p: p.offer_id or None,
+    "productStatus": _product_status,
+}
+
+_PRODUCT_SUMMARY_FIELDS = tuple(_SUMMARY_READERS)
+
+
+def _snake(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _value_reader(field: Any) -> Callable[[Any], Any]:
+    """Plain-Python converter for one value of *field*, matching get_product's full response.
+
+    Messages go through message_to_dict (proto field names, enums as
+    integers); enum and scalar values are returned as stored.
+    """
+    if field.message_type is not None:
+        return message_to_dict
+    return lambda v: v
+
+
+@functools.lru_cache(maxsize=256)
+def _path_reader(path: str) -> Callable[[Any], Any]:
+    """Compile a field path into a reader over the raw Product message.
+
+    *path* is either a list_products summary key ('title', 'price') or a
+    dotted Product field path, e.g. 'product_attributes.gtins' or
+    'product_status.item_level_issues' (camelCase is accepted as well). Only
+    the requested sub-tree is converted, with the same field names and enum
+    integers as the full response; unset fields read as None.
+    """
+    if path in _SUMMARY_READERS:
+        return _SUMMARY_READERS[path]
+    from google.shopping import merchant_products_v1
+
+    descriptor = merchant_products_v1.Product.pb().DESCRIPTOR
+    chain = []
+    for part in path.split("."):
+        if descriptor is None:
+            raise ValueError(f"Cannot select {path!r}: {chain[-1].name} has no sub-fields")
+        field = descriptor.fields_by_name.get(_snake(part))
+        if field is None:
+            raise ValueError(f"Product has no field {part!r} (in {path!r})")
+        chain.append(field)
+        repeated = getattr(field, "is_repeated", None)  # protobuf >= 5.28; older: label
+        if repeated is None:
+            repeated = field.label == field.LABEL_REPEATED
+        descriptor = None if repeated else field.message_type
+
+    *parents, leaf = chain
+    leaf_repeated = repeated
+    convert = _value_reader(leaf)
+    if leaf_repeated and leaf.message_type is not None and leaf.message_type.GetOptions().map_entry:
+        convert_value = _value_reader(leaf.message_type.fields_by_name["value"])
+        read_leaf = lambda m: {k: convert_value(v) for k, v in getattr(m, leaf.name).items()}  # noqa: E731
+    elif leaf_repeated:
+        read_leaf = lambda m: [convert(v) for v in getattr(m, leaf.name)]  # noqa: E731
+    elif leaf.has_presence:
+        read_leaf = lambda m: convert(getattr(m, leaf.name)) if m.HasField(leaf.name) else None  # noqa: E731
+    else:
+        read_leaf = lambda m: convert(getattr(m, leaf.name))  # noqa: E731
+
+    def read(p: Any) -> Any:
+        for field in parents:
+            if not p.HasField(field.name):
+                return None
+            p = getattr(p, field.name)
+        return read_leaf(p)
+
+    return read
+
+
+def _projector(fields: Optional[List[str]]) -> Callable[[Any], Dict[str, Any]]:
+    """Build a Product -> dict projection over *fields* (default: the list_products summary).
+
+    Paths are validated up front, so a typo fails before any API call.
+    """
+    readers = [(f, _path_reader(f)) for f in (fields or _PRODUCT_SUMMARY_FIELDS)]
+
+    def project(product: Any) -> Dict[str, Any]:
+        pb = _raw(product)
+        return {name: read(pb) for name, read in readers}
+
+    return project
+
+
+_project_summary = _projector(None)
+
+
+def _product_summary(p: Any) -> Dict[str, Any]:
+    """Flat projection of a Product read straight from the proto message."""
+    return _project_summary(p)
+
+
+async def _iter_products(page_size: int = 250, raw: bool = False) -> AsyncIterator[Any]:
+    """Yield every Product of the account, one page in memory at a time.
+
+    With raw=True the underlying protobuf messages are yielded instead of
+    proto-plus wrappers, which is much cheaper for hot aggregation loops.
+    """
+    client = get_products_client()
+    from google.shopping import merchant_products_v1
+    request = merchant_products_v1.ListProductsRequest(
+        parent=account_name(), page_size=min(page_size, 250)
+    )
+    pager = await client.list_products(request=request)
+    async for page in pager.pages:
+        products = type(page).pb(page).products if raw else page.products
+        for p in products:
+            yield p
 
 
 @mcp.tool()
-def list_products(
+async def list_products(
     page_size: int = 250,
     page_token: Optional[str] = None,
+    fields: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
-    """List products in GMC (read-only view).
+    """List one page of products in GMC (read-only view).
+
+    For the full catalog use export_products, which streams to a local file.
 
     Args:
         page_size: Max products per page (max 250).
-        page_token: Pagination token from a previous call.
+        page_token: Pagination token from a previous call (nextPageToken).
+        fields: Only return these fields: summary keys (name, title, brand,
+            availability, price, offerId, productStatus, ...) or Product field
+            paths as in get_product's response, such as
+            'product_attributes.gtins' or 'product_status.item_level_issues'.
+            Defaults to the summary keys.
     """
+    project = _projector(fields)
     client = get_products_client()
     from google.shopping import merchant_products_v1
     request = merchant_products_v1.ListProductsRequest(
@@ -30,48 +205,132 @@ def list_products(
         page_size=min(page_size, 250),
         **({"page_token": page_token} if page_token else {}),
     )
-    response = client.list_products(request=request)
-    products = []
-    for p in response:
-        d = type(p).to_dict(p)
-        products.append({
-            "name": d.get("name"),
-            "productId": d.get("productId"),
-            "title": d.get("title"),
-            "brand": d.get("brand"),
-            "availability": d.get("attributes", {}).get("availability"),
-            "price": d.get("attributes", {}).get("price"),
-            "link": d.get("attributes", {}).get("link"),
-            "imageLink": d.get("attributes", {}).get("imageLink"),
-            "channel": d.get("channel"),
-            "contentLanguage": d.get("contentLanguage"),
-            "feedLabel": d.get("feedLabel"),
-            "offerId": d.get("offerId"),
-            "productStatus": d.get("productStatus"),
-        })
+    response = await client.list_products(request=request)
+    products = [project(p) for p in response.products]
     return {
         "products": products,
+        "nextPageToken": response.next_page_token or None,
         "totalReturned": len(products),
     }
 
 
+_EXPORT_FORMATS = ("ndjson", "parquet")
+_PARQUET_BATCH_ROWS = 5000
+
+
+async def _write_ndjson(rows: AsyncIterator[Dict[str, Any]], path: str) -> int:
+    count = 0
+    with open(path, "wb") as fh:
+        async for row in rows:
+            fh.write(to_json(row))
+            fh.write(b"\n")
+            count += 1
+    return count
+
+
+async def _write_parquet(
+    rows: AsyncIterator[Dict[str, Any]], path: str, fields: tuple = _PRODUCT_SUMMARY_FIELDS
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # optional dependency
+        raise RuntimeError(
+            "Parquet export needs pyarrow: pip install pyarrow (or use format='ndjson')."
+        ) from exc
+
+    # Nested values (price, productStatus, ...) are stored as JSON strings so every
+    # batch shares one flat, all-string schema.
+    schema = pa.schema([(key, pa.string()) for key in fields])
+
+    def encode(value: Any) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        return to_json(value).decode("utf-8")
+
+    def flush(batch: List[Dict[str, Any]]) -> None:
+        columns = {key: [encode(r[key]) for r in batch] for key in fields}
+        writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+    count = 0
+    batch: List[Dict[str, Any]] = []
+    with pq.ParquetWriter(path, schema) as writer:
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= _PARQUET_BATCH_ROWS:
+                flush(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            flush(batch)
+            count += len(batch)
+    return count
+
+
+@mcp.tool()
+async def export_products(
+    format: str = "ndjson",
+    path: Optional[str] = None,
+    page_size: int = 250,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Stream the full product catalog to a local NDJSON or Parquet file.
+
+    Pages are fetched and written one at a time, so memory stays bounded
+    regardless of catalog size. Each row uses the list_products projection,
+    or only *fields* when given.
+
+    Args:
+        format: 'ndjson' or 'parquet' (parquet requires pyarrow).
+        path: Output file path. Defaults to GMC_EXPORT_DIR/products-<timestamp>.<ext>.
+        page_size: Products per API page (max 250).
+        fields: Summary keys or Product field paths to write (see list_products).
+    """
+    project = _projector(fields)
+    if format not in _EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {_EXPORT_FORMATS}, got {format!r}")
+    if not path:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(export_dir(), f"products-{stamp}.{format}")
+
+    started = time.perf_counter()
+    rows = (project(p) async for p in _iter_products(page_size, raw=True))
+    if format == "ndjson":
+        count = await _write_ndjson(rows, path)
+    else:
+        count = await _write_parquet(rows, path, tuple(fields or _PRODUCT_SUMMARY_FIELDS))
+    return {
+        "path": os.path.abspath(path),
+        "format": format,
+        "rowCount": count,
+        "bytesWritten": os.path.getsize(path),
+        "elapsedSeconds": round(time.perf_counter() - started, 3),
+    }
+
+
 @mcp.tool()
-def get_product(product_name: str) -> Dict[str, Any]:
+@coalesced
+async def get_product(product_name: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """Get full details of a single product.
 
     Args:
         product_name: Full resource name, e.g. 'accounts/12345/products/online~de~DE~SKU-001'.
                       Use list_products to discover product names.
+        fields: Only return these fields (summary keys or Product field paths,
+            see list_products) instead of the full resource.
     """
+    project = _projector(fields) if fields else None
     client = get_products_client()
     from google.shopping import merchant_products_v1
     request = merchant_products_v1.GetProductRequest(name=product_name)
-    product = client.get_product(request=request)
-    return type(product).to_dict(product)
+    product = await client.get_product(request=request)
+    if project is not None:
+        return project(product)
+    return message_to_dict(product)
 
 
 @mcp.tool()
-def insert_product_input(
+async def insert_product_input(
     data_source_id: str,
     product_input: Dict[str, Any],
 ) -> Dict[str, Any]:
@@ -79,43 +338,118 @@ def insert_product_input(
 
     Args:
         data_source_id: Numeric ID of the primary data source to associate with.
-        product_input: Product input resource dict. Required fields:
-            offerId, title, description, link, imageLink,
-            contentLanguage, feedLabel, channel (ONLINE/LOCAL),
-            attributes.availability, attributes.price, attributes.brand.
+        product_input: Product input resource dict (JSON or proto field names).
+            Required fields: offerId, contentLanguage, feedLabel,
+            productAttributes.title, .description, .link, .imageLink,
+            .availability, .price, .brand.
 
     Example product_input:
         {
           "offerId": "SKU-001",
-          "title": "My Product",
-          "description": "Description text",
-          "link": "https://example.com/products/my-product",
-          "imageLink": "https://cdn.example.com/image.jpg",
           "contentLanguage": "de",
           "feedLabel": "DE",
-          "channel": "ONLINE",
-          "attributes": {
-            "availability": "in_stock",
+          "productAttributes": {
+            "title": "My Product",
+            "description": "Description text",
+            "link": "https://example.com/products/my-product",
+            "imageLink": "https://cdn.example.com/image.jpg",
+            "availability": "IN_STOCK",
             "price": {"amountMicros": "4999000000", "currencyCode": "EUR"},
             "brand": "MyBrand",
-            "condition": "new"
+            "condition": "NEW"
           }
         }
     """
     client = get_product_inputs_client()
+    request = _insert_product_input_request(data_source_id, product_input)
+    result = await client.insert_product_input(request=request)
+    return message_to_dict(result)
+
+
+def _insert_product_input_request(data_source_id: str, product_input: Any) -> Any:
     from google.shopping import merchant_products_v1
-    data_source_name = f"{account_name()}/dataSources/{data_source_id}"
-    request = merchant_products_v1.InsertProductInputRequest(
+    return merchant_products_v1.InsertProductInputRequest(
         parent=account_name(),
-        product_input=product_input,
-        data_source=data_source_name,
+        product_input=to_message(merchant_products_v1.ProductInput, product_input),
+        data_source=f"{account_name()}/dataSources/{data_source_id}",
     )
-    result = client.insert_product_input(request=request)
-    return type(result).to_dict(result)
+
+
+def _inserter(data_source_id: str) -> Callable[[Any], Awaitable[Any]]:
+    """Insert one product input (quota retries are left to the scheduler)."""
+    client = get_product_inputs_client()
+
+    async def insert(product_input: Any) -> Any:
+        return await client.insert_product_input(
+            request=_insert_product_input_request(data_source_id, product_input)
+        )
+
+    return insert
+
+
+@mcp.tool()
+async def bulk_insert_product_inputs(
+    data_source_id: str,
+    product_inputs: Optional[List[Dict[str, Any]]] = None,
+    file_path: Optional[str] = None,
+    concurrency: int = 8,
+    max_per_second: float = 20.0,
+    content_language: Optional[str] = None,
+    feed_label: Optional[str] = None,
+    currency: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Insert many product inputs in one call with bounded concurrency.
+
+    Items are sent through the shared ProductInputs client with at most
+    `concurrency` requests in flight and paced to `max_per_second`. Quota
+    errors are retried by the shared scheduler (see tools/_scheduler.py).
+
+    Args:
+        data_source_id: Numeric ID of the primary data source.
+        product_inputs: List of product_input dicts (see insert_product_input).
+        file_path: Alternatively, a local .ndjson/.jsonl (streamed) or .json
+            array file of product_input dicts, or a Google-format
+            .tsv/.csv/.xml feed (optionally .gz; see validate_feed).
+        concurrency: Max in-flight requests.
+        max_per_second: Request pacing, to stay within the API quota.
+        content_language: Feed files: for rows without a content_language column.
+        feed_label: Feed files: for rows without a feed_label column.
+        currency: Feed files: for prices without a currency code.
+    """
+    if (product_inputs is None) == (file_path is None):
+        raise ValueError("Pass exactly one of product_inputs or file_path.")
+    pacer = Pacer(max_per_second)
+    insert = _inserter(data_source_id)
+
+    started = time.perf_counter()
+    succeeded = 0
+    failures: Dict[str, List[str]] = defaultdict(list)
+
+    def invalid(error: FeedError) -> None:
+        failures[error.reason].append(error.offer_id or f"row {error.row}")
+
+    if product_inputs is not None:
+        items: Iterable[Dict[str, Any]] = product_inputs
+    else:
+        items = read_product_inputs(file_path, content_language, feed_label, currency, invalid)
+    async for item, _, error in run_bounded(items, insert, concurrency=concurrency, pacer=pacer):
+        if error is None:
+            succeeded += 1
+        else:
+            failures[error_key(error)].append(str(item.get("offerId") or item.get("offer_id")))
+    elapsed = time.perf_counter() - started
+    failed = sum(len(ids) for ids in failures.values())
+    return {
+        "succeeded": succeeded,
+        "failed": failed,
+        "failures": summarize_failures(failures),
+        "elapsedSeconds": round(elapsed, 3),
+        "itemsPerSecond": round((succeeded + failed) / elapsed, 1) if elapsed else None,
+    }
 
 
 @mcp.tool()
-def delete_product_input(
+async def delete_product_input(
     product_input_name: str,
     data_source_id: str,
 ) -> Dict[str, Any]:
@@ -133,36 +467,250 @@ def delete_product_input(
         name=product_input_name,
         data_source=data_source_name,
     )
-    client.delete_product_input(request=request)
+    await client.delete_product_input(request=request)
     return {"deleted": True, "productInputName": product_input_name}
 
 
+_SYNC_BATCH = 500
+
+
+def _input_id(product_input: Any) -> str:
+    """'{contentLanguage}~{feedLabel}~{offerId}', the productInputs/ resource ID."""
+    parts = (product_input.content_language, product_input.feed_label, product_input.offer_id)
+    if not all(parts):
+        raise ValueError("product input needs offerId, contentLanguage and feedLabel")
+    return "~".join(parts)
+
+
 @mcp.tool()
-def count_products_by_status() -> Dict[str, Any]:
-    """Summarize product counts by approval status from productStatus embedded field.
+async def sync_product_inputs(
+    data_source_id: str,
+    file_path: str,
+    delete_missing: bool = True,
+    dry_run: bool = False,
+    force: bool = False,
+    concurrency: int = 8,
+    max_per_second: float = 20.0,
+    content_language: Optional[str] = None,
+    feed_label: Optional[str] = None,
+    currency: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Push only the product inputs of a feed file that changed since the last sync.
 
-    Fetches up to 250 products and tallies statuses from their productStatus field.
+    The file is streamed and each product input is hashed after
+    normalization. Hashes are compared with a persistent index of what the
+    previous syncs pushed successfully (GMC_INPUT_INDEX_DB). New and changed
+    inputs are inserted. Inputs pushed before but missing from the file are
+    deleted with delete_product_input. Failed inserts stay unindexed, so the
+    next sync retries them.
+
+    Args:
+        data_source_id: Numeric ID of the primary data source.
+        file_path: Local .ndjson/.jsonl (streamed) or .json array file of
+            product_input dicts (see insert_product_input), or a
+            Google-format .tsv/.csv/.xml feed (optionally .gz).
+        delete_missing: Delete indexed inputs that are not in the file.
+            Skipped when any record in the file is invalid.
+        dry_run: Only count new / changed / unchanged / deleted; send nothing.
+        force: Push every input, ignoring the index (e.g. after edits made
+            outside this tool).
+        concurrency: Max in-flight requests.
+        max_per_second: Request pacing, to stay within the API quota.
+        content_language: Feed files: for rows without a content_language column.
+        feed_label: Feed files: for rows without a feed_label column.
+        currency: Feed files: for prices without a currency code.
     """
-    client = get_products_client()
+    from google.protobuf import json_format
     from google.shopping import merchant_products_v1
-    request = merchant_products_v1.ListProductsRequest(
-        parent=account_name(), page_size=250
-    )
-    approved = pending = disapproved = 0
-    for p in client.list_products(request=request):
-        d = type(p).to_dict(p)
-        status = d.get("productStatus", {})
-        for ds in status.get("destinationStatuses", []):
-            s = ds.get("status", "")
-            if s == "APPROVED":
-                approved += 1
-            elif s == "DISAPPROVED":
-                disapproved += 1
-            elif s == "PENDING":
-                pending += 1
+    from tools._input_index import InputIndex, content_hash
+
+    started = time.perf_counter()
+    index = InputIndex(account_name(), data_source_id)
+    counts: Counter = Counter()
+    failures: Dict[str, List[str]] = defaultdict(list)
+    pushed: List[Tuple[str, str]] = []
+
+    def classify(batch: List[Tuple[str, str, Any]]) -> List[Tuple[str, str, Any]]:
+        ids = [input_id for input_id, _, _ in batch]
+        index.mark_seen(ids)
+        known = {} if force else index.hashes(ids)
+        send = []
+        for input_id, digest, message in batch:
+            previous = known.get(input_id)
+            kind = "new" if previous is None else "changed" if previous != digest else "unchanged"
+            counts[kind] += 1
+            if kind != "unchanged" and not dry_run:
+                send.append((input_id, digest, message))
+        return send
+
+    def invalid(error: FeedError) -> None:
+        counts["invalid"] += 1
+        failures[error.reason].append(error.offer_id or f"row {error.row}")
+
+    async def pending() -> AsyncIterator[Tuple[str, str, Any]]:
+        batch: List[Tuple[str, str, Any]] = []
+        for record in read_product_inputs(file_path, content_language, feed_label, currency, invalid):
+            try:
+                message = to_message(merchant_products_v1.ProductInput, record)
+                batch.append((_input_id(message), content_hash(type(message).pb(message)), message))
+            except (json_format.ParseError, ValueError) as exc:
+                counts["invalid"] += 1
+                failures[error_key(exc)].append(str(record.get("offerId") or record.get("offer_id")))
+            if len(batch) >= _SYNC_BATCH:
+                for item in classify(batch):
+                    yield item
+                batch = []
+        for item in classify(batch):
+            yield item
+
+    pacer = Pacer(max_per_second)
+    insert = _inserter(data_source_id)
+
+    push_seconds = 0.0
+
+    async def push(item: Tuple[str, str, Any]) -> Any:
+        nonlocal push_seconds
+        sent_at = time.perf_counter()
+        try:
+            return await insert(item[2])
+        finally:
+            push_seconds += time.perf_counter() - sent_at
+
+    try:
+        async for (input_id, digest, _), _, error in run_bounded(
+            pending(), push, concurrency=concurrency, pacer=pacer
+        ):
+            if error is None:
+                pushed.append((input_id, digest))
+                if len(pushed) >= _SYNC_BATCH:
+                    index.record(pushed)
+                    counts["pushed"] += len(pushed)
+                    pushed = []
+            else:
+                counts["failed"] += 1
+                failures[error_key(error)].append(input_id)
+        index.record(pushed)
+        counts["pushed"] += len(pushed)
+        pushed = []
+
+        missing = index.missing() if delete_missing else []
+        deletions_skipped = bool(missing) and counts["invalid"] > 0
+        if missing and not dry_run and not deletions_skipped:
+            async def delete(input_id: str) -> Any:
+                return await delete_product_input(f"{account_name()}/productInputs/{input_id}", data_source_id)
+
+            deleted = []
+            async for input_id, _, error in run_bounded(missing, delete, concurrency=concurrency, pacer=pacer):
+                if error is None:
+                    deleted.append(input_id)
+                else:
+                    counts["failed"] += 1
+                    failures[error_key(error)].append(input_id)
+            index.forget(deleted)
+            counts["deleted"] = len(deleted)
+        indexed = index.size()
+    finally:
+        index.record(pushed)
+        index.close()
+
+    elapsed = time.perf_counter() - started
+    sent = counts["new"] + counts["changed"]
+    # Unchanged inputs cost nothing; estimate their push time from this run's
+    # mean insert latency at full concurrency, capped by the pacing.
+    rate = max_per_second
+    if counts["pushed"] and push_seconds:
+        rate = min(concurrency * counts["pushed"] / push_seconds, max_per_second)
     return {
-        "approved": approved,
-        "disapproved": disapproved,
-        "pending": pending,
-        "total": approved + disapproved + pending,
+        "dryRun": dry_run,
+        "unchanged": counts["unchanged"],
+        "changed": counts["changed"],
+        "new": counts["new"],
+        "deleted": (0 if deletions_skipped else len(missing)) if dry_run else counts["deleted"],
+        "deletionsSkipped": deletions_skipped,
+        "invalid": counts["invalid"],
+        "pushed": counts["pushed"],
+        "failed": counts["failed"],
+        "failures": summarize_failures(failures),
+        "indexedInputs": indexed,
+        "upstreamCallsSaved": counts["unchanged"],
+        "estimatedSecondsSaved": round(counts["unchanged"] / rate, 1),
+        "elapsedSeconds": round(elapsed, 3),
+        "changeRatio": round(sent / (sent + counts["unchanged"]), 4) if sent + counts["unchanged"] else None,
+    }
+
+
+_STATUS_GROUP_KEYS = ("destination", "country", "status", "channel", "feedLabel")
+
+
+def _reporting_context_names() -> Dict[int, str]:
+    from google.shopping.type import ReportingContext
+    return {e.value: e.name for e in ReportingContext.ReportingContextEnum}
+
+
+@mcp.tool()
+async def count_products_by_status(
+    group_by: Optional[List[str]] = None,
+    top_issues: int = 0,
+    page_size: int = 250,
+) -> Dict[str, Any]:
+    """Aggregate approval status over the full catalog in a single streaming pass.
+
+    Every (product, destination, country) status is counted once. Products are
+    read as raw protobuf messages, without converting them to dicts.
+
+    Args:
+        group_by: Any of 'destination', 'country', 'status', 'channel',
+            'feedLabel'. Defaults to ['destination', 'status'].
+        top_issues: If > 0, also return the N most frequent item-level issue
+            codes with the number of products affected.
+        page_size: Products per API page (max 250).
+    """
+    group_by = list(group_by or ["destination", "status"])
+    unknown = [k for k in group_by if k not in _STATUS_GROUP_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown group_by keys {unknown}; choose from {_STATUS_GROUP_KEYS}")
+    indices = [_STATUS_GROUP_KEYS.index(k) for k in group_by]
+
+    started = time.perf_counter()
+    destinations = _reporting_context_names()
+    groups: Counter = Counter()
+    totals: Counter = Counter()
+    issues: Counter = Counter()
+    product_count = 0
+    async for pb in _iter_products(page_size, raw=True):
+        product_count += 1
+        channel = "LOCAL" if pb.legacy_local else "ONLINE"
+        status = pb.product_status
+        for ds in status.destination_statuses:
+            destination = destinations.get(ds.reporting_context, str(ds.reporting_context))
+            for state, countries in (
+                ("APPROVED", ds.approved_countries),
+                ("PENDING", ds.pending_countries),
+                ("DISAPPROVED", ds.disapproved_countries),
+            ):
+                if not countries:
+                    continue
+                totals[state] += len(countries)
+                for country in countries:
+                    row = (destination, country, state, channel, pb.feed_label)
+                    groups[tuple(row[i] for i in indices)] += 1
+        if top_issues > 0:
+            issues.update({issue.code for issue in status.item_level_issues})
+
+    result: Dict[str, Any] = {
+        "approved": totals["APPROVED"],
+        "disapproved": totals["DISAPPROVED"],
+        "pending": totals["PENDING"],
+        "total": sum(totals.values()),
+        "products": product_count,
+        "groupBy": group_by,
+        "groups": [
+            {**dict(zip(group_by, key)), "count": n} for key, n in groups.most_common()
+        ],
     }
+    if top_issues > 0:
+        result["topIssues"] = [
+            {"code": code, "products": n} for code, n in issues.most_common(top_issues)
+        ]
+    result["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+    return result
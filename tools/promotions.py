@@ -4,21 +4,23 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from tools._common import mcp, account_name, get_promotions_client
+from tools._common import mcp, account_name, message_to_dict, to_message, get_promotions_client
+from tools._cache import cached, invalidates
 
 
 @mcp.tool()
-def list_promotions() -> Dict[str, Any]:
+@cached("promotions")
+async def list_promotions() -> Dict[str, Any]:
     """List all promotions for this GMC account."""
     client = get_promotions_client()
     from google.shopping import merchant_promotions_v1
     request = merchant_promotions_v1.ListPromotionsRequest(parent=account_name())
-    promotions = [type(p).to_dict(p) for p in client.list_promotions(request=request)]
+    promotions = [message_to_dict(p) async for p in await client.list_promotions(request=request)]
     return {"promotions": promotions, "totalReturned": len(promotions)}
 
 
 @mcp.tool()
-def get_promotion(promotion_name: str) -> Dict[str, Any]:
+async def get_promotion(promotion_name: str) -> Dict[str, Any]:
     """Get details of a single promotion.
 
     Args:
@@ -27,12 +29,13 @@ def get_promotion(promotion_name: str) -> Dict[str, Any]:
     client = get_promotions_client()
     from google.shopping import merchant_promotions_v1
     request = merchant_promotions_v1.GetPromotionRequest(name=promotion_name)
-    promo = client.get_promotion(request=request)
-    return type(promo).to_dict(promo)
+    promo = await client.get_promotion(request=request)
+    return message_to_dict(promo)
 
 
 @mcp.tool()
-def create_promotion(
+@invalidates("promotions")
+async def create_promotion(
     promotion_id: str,
     content_language: str,
     target_country: str,
@@ -68,7 +71,8 @@ def create_promotion(
     }
     request = merchant_promotions_v1.InsertPromotionRequest(
         parent=account_name(),
-        promotion=promotion,
+        promotion=to_message(merchant_promotions_v1.Promotion, promotion),
+        data_source=data_source_name,
     )
-    result = client.insert_promotion(request=request)
-    return type(result).to_dict(result)
+    result = await client.insert_promotion(request=request)
+    return message_to_dict(result)
@@ -2,16 +2,26 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import csv
+import datetime
+import json
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from tools._common import mcp, account_name, get_reports_client
+from tools._common import mcp, account_name, export_dir, message_to_dict, run_bounded, get_reports_client
+from tools._report_cache import ReportCache, is_closed, query_key as report_query_key
 
 
 @mcp.tool()
-def reports_search(
+async def reports_search(
     query: str,
     page_size: int = 1000,
     page_token: Optional[str] = None,
+    shard_by: Optional[str] = None,
+    max_in_flight: int = 8,
+    use_cache: bool = False,
 ) -> Dict[str, Any]:
     """Query GMC performance reports using the Merchant Query Language (MQL).
 
@@ -21,12 +31,36 @@ def reports_search(
 
     Args:
         query: MQL query string. Examples:
-            "SELECT segments.date, metrics.clicks, metrics.impressions
+            "SELECT date, offer_id, clicks, impressions
              FROM product_performance_view
-             WHERE segments.date BETWEEN '2026-01-01' AND '2026-02-23'"
+             WHERE date BETWEEN '2026-01-01' AND '2026-02-23'"
         page_size: Max rows (max 1000).
-        page_token: Pagination token.
+        page_token: Pagination token (nextPageToken of the previous call).
+            Use reports_export to fetch every page into a local file.
+        shard_by: 'day' or 'week' to split the query's date BETWEEN range into
+            shards that are fetched concurrently (all pages each) and merged
+            in date order. Needs date among the selected columns: without it
+            the API sums metrics over each shard's range, and the shards
+            would return one partial row per key instead of the total.
+            ORDER BY <column> + LIMIT are re-applied to the merged rows.
+        max_in_flight: Max concurrent shard requests when shard_by is set.
+        use_cache: Reuse closed historical days from the persistent report
+            cache and only fetch missing or still-settling days (implies
+            shard_by='day'). Needs a date BETWEEN condition and date among
+            the selected columns.
     """
+    if shard_by or use_cache:
+        if page_token:
+            raise ValueError("page_token cannot be combined with shard_by / use_cache")
+        started = time.perf_counter()
+        rows, stats = await _run_sharded(query, shard_by or "day", max_in_flight, page_size, use_cache)
+        results = [message_to_dict(r) for r in rows]
+        return {
+            "results": results,
+            "totalReturned": len(results),
+            **stats,
+            "elapsedSeconds": round(time.perf_counter() - started, 3),
+        }
     client = get_reports_client()
     from google.shopping import merchant_reports_v1beta
     request = merchant_reports_v1beta.SearchRequest(
@@ -35,33 +69,382 @@ def reports_search(
         page_size=min(page_size, 1000),
         **({"page_token": page_token} if page_token else {}),
     )
-    response = client.search(request=request)
-    results = [type(r).to_dict(r) for r in response.results]
+    response = await client.search(request=request)
+    results = [message_to_dict(r) for r in response.results]
     return {
         "results": results,
+        "nextPageToken": response.next_page_token or None,
         "totalReturned": len(results),
     }
 
 
 @mcp.tool()
-def get_product_performance(
+async def get_product_performance(
     start_date: str = "2026-01-01",
     end_date: str = "2026-02-23",
     limit: int = 100,
+    shard_by: Optional[str] = None,
+    max_in_flight: int = 8,
+    use_cache: bool = False,
 ) -> Dict[str, Any]:
     """Get click and impression performance for products by date range.
 
+    With use_cache, closed days are served from the persistent report cache,
+    so a rolling 30/90-day window only fetches the newest, still-settling days.
+
     Args:
         start_date: YYYY-MM-DD format.
         end_date: YYYY-MM-DD format.
         limit: Max rows.
+        shard_by: 'day' or 'week' to fetch the range as concurrent date shards
+            (recommended for long ranges).
+        max_in_flight: Max concurrent shard requests when shard_by is set.
+        use_cache: Reuse cached closed days (fetches per day). The default
+            queries the full range live.
     """
     query = (
-        f"SELECT segments.date, segments.program, metrics.clicks, "
-        f"metrics.impressions, metrics.click_through_rate "
+        f"SELECT date, marketing_method, clicks, "
+        f"impressions, click_through_rate "
         f"FROM product_performance_view "
-        f"WHERE segments.date BETWEEN '{start_date}' AND '{end_date}' "
-        f"ORDER BY metrics.clicks DESC "
+        f"WHERE date BETWEEN '{start_date}' AND '{end_date}' "
+        f"ORDER BY clicks DESC "
         f"LIMIT {limit}"
     )
-    return reports_search(query, page_size=limit)
+    return await reports_search(
+        query,
+        page_size=limit,
+        shard_by=shard_by,
+        max_in_flight=max_in_flight,
+        use_cache=use_cache,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Date-range sharding
+# ---------------------------------------------------------------------------
+
+_DATE_RANGE_RE = re.compile(
+    r"(?P<field>[\w.]*\bdate)\s+BETWEEN\s+'(?P<start>\d{4}-\d{2}-\d{2})'"
+    r"\s+AND\s+'(?P<end>\d{4}-\d{2}-\d{2})'",
+    re.I,
+)
+_ORDER_BY_RE = re.compile(r"\bORDER\s+BY\s+(?P<column>[\w.]+)(?:\s+(?P<dir>ASC|DESC))?", re.I)
+_LIMIT_RE = re.compile(r"\bLIMIT\s+(?P<n>\d+)", re.I)
+_SHARD_DAYS = {"day": 1, "week": 7}
+
+
+def _date_range(query: str) -> Tuple[datetime.date, datetime.date]:
+    match = _DATE_RANGE_RE.search(query)
+    if not match:
+        raise ValueError("Sharding needs a \"date BETWEEN 'YYYY-MM-DD' AND 'YYYY-MM-DD'\" condition")
+    return (
+        datetime.date.fromisoformat(match.group("start")),
+        datetime.date.fromisoformat(match.group("end")),
+    )
+
+
+def _with_date_range(query: str, start: datetime.date, end: datetime.date) -> str:
+    """Return *query* with its date BETWEEN range replaced by [start, end]."""
+    return _DATE_RANGE_RE.sub(
+        lambda m: f"{m.group('field')} BETWEEN '{start.isoformat()}' AND '{end.isoformat()}'",
+        query,
+        count=1,
+    )
+
+
+def _shard_ranges(
+    start: datetime.date, end: datetime.date, shard_by: str
+) -> List[Tuple[datetime.date, datetime.date]]:
+    if shard_by not in _SHARD_DAYS:
+        raise ValueError(f"shard_by must be one of {tuple(_SHARD_DAYS)}, got {shard_by!r}")
+    step = datetime.timedelta(days=_SHARD_DAYS[shard_by])
+    ranges = []
+    while start <= end:
+        ranges.append((start, min(start + step - datetime.timedelta(days=1), end)))
+        start += step
+    return ranges
+
+
+async def _fetch_rows(query: str, page_size: int = 1000) -> List[Any]:
+    """All raw ReportRow messages of *query*, following every page."""
+    rows: List[Any] = []
+    async for page in _iter_report_pages(query, page_size):
+        rows.extend(page)
+    return rows
+
+
+def _merge_order(query: str) -> Tuple[Optional[Callable[[Any], Any]], bool, Optional[int]]:
+    """(sort key over raw rows, descending, limit) to re-apply after merging shards."""
+    order = _ORDER_BY_RE.search(query)
+    limit = _LIMIT_RE.search(query)
+    key = None
+    descending = False
+    if order:
+        view, readers = _column_readers(f"SELECT {order.group('column')} FROM {_parse_select(query)[1]}")
+        read = readers[0][1]
+        key = lambda row: read(getattr(row, view))  # noqa: E731
+        descending = (order.group("dir") or "ASC").upper() == "DESC"
+    return key, descending, int(limit.group("n")) if limit else None
+
+
+async def _run_sharded(
+    query: str,
+    shard_by: str,
+    max_in_flight: int,
+    page_size: int = 1000,
+    use_cache: bool = False,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """Run *query* as concurrent date shards and merge them in date order.
+
+    With use_cache, shards are single days: closed days come from the
+    persistent report cache and only missing or still-settling days are
+    fetched (and stored). Returns the merged raw rows and shard stats.
+    """
+    if use_cache:
+        shard_by = "day"
+    if not any(c.rsplit(".", 1)[-1].lower() == "date" for c in _parse_select(query)[0]):
+        raise ValueError(
+            "shard_by / use_cache need date among the selected columns; without it "
+            "each shard aggregates over its own range and rows would not merge"
+        )
+    ranges = _shard_ranges(*_date_range(query), shard_by)
+    by_shard: Dict[int, List[Any]] = {}
+    stats: Dict[str, Any] = {"shards": len(ranges)}
+
+    cache = None
+    if use_cache:
+        cache = ReportCache()
+        account = account_name()
+        key = report_query_key(_DATE_RANGE_RE.sub("<date range>", query, count=1))
+        for index, (day, _) in enumerate(ranges):
+            if is_closed(day):
+                rows = cache.get(account, key, day)
+                if rows is not None:
+                    by_shard[index] = rows
+        stats.update({"cachedDays": len(by_shard), "fetchedDays": len(ranges) - len(by_shard)})
+
+    async def fetch(indexed: Tuple[int, Tuple[datetime.date, datetime.date]]) -> List[Any]:
+        _, (start, end) = indexed
+        return await _fetch_rows(_with_date_range(query, start, end), page_size)
+
+    try:
+        pending = ((i, r) for i, r in enumerate(ranges) if i not in by_shard)
+        async for (index, (day, _)), rows, error in run_bounded(
+            pending, fetch, concurrency=max_in_flight
+        ):
+            if error is not None:
+                raise error
+            by_shard[index] = rows
+            if cache is not None and is_closed(day):
+                # Still-settling days are refetched next time, never stored.
+                cache.put(account, key, day, rows)
+    finally:
+        if cache is not None:
+            cache.close()
+    merged = [row for index in range(len(ranges)) for row in by_shard[index]]
+
+    key_fn, descending, limit = _merge_order(query)
+    if key_fn is not None:
+        # Stable sort keeps date order among ties; rows without a value go last.
+        present = [r for r in merged if key_fn(r) is not None]
+        missing = [r for r in merged if key_fn(r) is None]
+        merged = sorted(present, key=key_fn, reverse=descending) + missing
+    if limit is not None:
+        merged = merged[:limit]
+    return merged, stats
+
+
+# ---------------------------------------------------------------------------
+# Columnar access to report rows
+# ---------------------------------------------------------------------------
+
+_SELECT_RE = re.compile(r"^\s*SELECT\s+(?P<columns>.+?)\s+FROM\s+(?P<view>\w+)", re.I | re.S)
+
+
+def _parse_select(query: str) -> Tuple[List[str], str]:
+    """Return (selected columns, view name) of an MQL query."""
+    match = _SELECT_RE.match(query)
+    if not match:
+        raise ValueError("Could not parse 'SELECT <columns> FROM <view>' from the query")
+    columns = [c.strip() for c in match.group("columns").split(",") if c.strip()]
+    return columns, match.group("view").lower()
+
+
+_INT_TYPES = {3, 4, 5, 6, 7, 13, 15, 16, 17, 18}  # FieldDescriptor.TYPE_*INT*/FIXED*
+_FLOAT_TYPES = {1, 2}  # TYPE_DOUBLE, TYPE_FLOAT
+_BOOL_TYPE = 8
+
+
+def _field_reader(field: Any) -> Tuple[Callable[[Any], Any], str]:
+    """Plain-Python reader and column type for one field of a raw view message.
+
+    Dates become 'YYYY-MM-DD', prices a float amount, enums their name,
+    anything else nested a JSON string. Unset fields read as None. The type
+    is one of 'int64', 'double', 'bool', 'string'.
+    """
+    from google.protobuf import json_format
+
+    name = field.name
+    present = (lambda m: m.HasField(name)) if field.has_presence else (lambda m: True)
+    message_type = field.message_type.full_name if field.message_type is not None else None
+    kind = "string"
+    repeated = getattr(field, "is_repeated", None)  # protobuf >= 5.28; older: label
+    if repeated is None:
+        repeated = field.label == field.LABEL_REPEATED
+    if repeated:
+        convert = lambda v: json.dumps(list(v), default=str)  # noqa: E731
+    elif message_type == "google.type.Date":
+        convert = lambda v: f"{v.year:04d}-{v.month:02d}-{v.day:02d}"  # noqa: E731
+    elif message_type == "google.shopping.type.Price":
+        convert, kind = (lambda v: v.amount_micros / 1_000_000), "double"
+    elif message_type is not None:
+        convert = lambda v: json.dumps(json_format.MessageToDict(v))  # noqa: E731
+    elif field.enum_type is not None:
+        convert = {v.number: v.name for v in field.enum_type.values}.get
+    else:
+        convert = lambda v: v  # noqa: E731
+        if field.type in _INT_TYPES:
+            kind = "int64"
+        elif field.type in _FLOAT_TYPES:
+            kind = "double"
+        elif field.type == _BOOL_TYPE:
+            kind = "bool"
+
+    def read(message: Any) -> Any:
+        return convert(getattr(message, name)) if present(message) else None
+
+    return read, kind
+
+
+def _column_readers(query: str) -> Tuple[str, List[Tuple[str, Callable[[Any], Any], str]]]:
+    """Map each selected column to a (name, reader, type) over a row's view message.
+
+    Legacy dotted names ('segments.date', 'metrics.clicks') resolve to their
+    last component, which is how the v1beta views name their fields.
+    """
+    from google.shopping import merchant_reports_v1beta
+    columns, view = _parse_select(query)
+    view_field = merchant_reports_v1beta.ReportRow.pb().DESCRIPTOR.fields_by_name.get(view)
+    if view_field is None:
+        raise ValueError(f"Unknown report view {view!r}")
+    fields = view_field.message_type.fields_by_name
+    readers = []
+    for column in columns:
+        field = fields.get(column.split(".")[-1])
+        if field is None:
+            raise ValueError(f"{view} has no field {column!r}")
+        readers.append((column, *_field_reader(field)))
+    return view, readers
+
+
+async def _iter_report_pages(query: str, page_size: int = 1000) -> AsyncIterator[Any]:
+    """Yield raw ReportRow protobuf messages page by page, following every page."""
+    client = get_reports_client()
+    from google.shopping import merchant_reports_v1beta
+    request = merchant_reports_v1beta.SearchRequest(
+        parent=account_name(), query=query, page_size=min(page_size, 1000)
+    )
+    pager = await client.search(request=request)
+    async for page in pager.pages:
+        yield type(page).pb(page).results
+
+
+_EXPORT_FORMATS = ("parquet", "csv")
+_BATCH_ROWS = 10_000
+
+
+class _CsvSink:
+    def __init__(self, path: str, schema: Dict[str, str]):
+        self._fh = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        self._writer.writerow(schema)
+
+    def write(self, columns: Dict[str, List[Any]]) -> None:
+        self._writer.writerows(zip(*columns.values()))
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class _ParquetSink:
+    def __init__(self, path: str, schema: Dict[str, str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # optional dependency
+            raise RuntimeError(
+                "Parquet export needs pyarrow: pip install pyarrow (or use format='csv')."
+            ) from exc
+        self._schema = pa.schema([(name, pa.type_for_alias(kind)) for name, kind in schema.items()])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, columns: Dict[str, List[Any]]) -> None:
+        import pyarrow as pa
+        self._writer.write_table(pa.table(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+@mcp.tool()
+async def reports_export(
+    query: str,
+    format: str = "parquet",
+    path: Optional[str] = None,
+    max_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run an MQL query across all pages and stream the rows to a local file.
+
+    Rows are written in column batches of 10k, so memory stays bounded. One
+    column per selected field; dates become 'YYYY-MM-DD', prices a float.
+
+    Args:
+        query: MQL query, e.g. "SELECT date, offer_id, clicks, impressions
+            FROM product_performance_view
+            WHERE date BETWEEN '2026-01-01' AND '2026-03-31'".
+        format: 'parquet' (requires pyarrow) or 'csv'.
+        path: Output file. Defaults to GMC_EXPORT_DIR/report-<view>-<timestamp>.<ext>.
+        max_rows: Write at most this many rows; truncated=True in the
+            response when the query had more.
+    """
+    if format not in _EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {_EXPORT_FORMATS}, got {format!r}")
+    view, readers = _column_readers(query)
+    schema = {name: kind for name, _, kind in readers}
+    if not path:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(export_dir(), f"report-{view}-{stamp}.{format}")
+
+    started = time.perf_counter()
+    sink = _ParquetSink(path, schema) if format == "parquet" else _CsvSink(path, schema)
+    count = 0
+    truncated = False
+    batch: Dict[str, List[Any]] = {name: [] for name in schema}
+    try:
+        async for rows in _iter_report_pages(query):
+            for row in rows:
+                if max_rows is not None and count >= max_rows:
+                    truncated = True  # a row beyond the limit exists
+                    break
+                message = getattr(row, view)
+                for name, read, _ in readers:
+                    batch[name].append(read(message))
+                count += 1
+                if count % _BATCH_ROWS == 0:
+                    sink.write(batch)
+                    batch = {name: [] for name in schema}
+            if truncated:
+                break
+        if count % _BATCH_ROWS:
+            sink.write(batch)
+    finally:
+        sink.close()
+    return {
+        "path": os.path.abspath(path),
+        "format": format,
+        "rowCount": count,
+        "truncated": truncated,
+        "schema": schema,
+        "bytesWritten": os.path.getsize(path),
+        "elapsedSeconds": round(time.perf_counter() - started, 3),
+    }
@@ -4,24 +4,29 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from tools._common import mcp, account_name, get_return_policy_client, _get_credentials_and_token
+from tools._common import mcp, account_name, message_to_dict, get_return_policy_client, rest_request
+from tools._cache import cached, invalidates
 
 
 
 @mcp.tool()
-def list_return_policies() -> Dict[str, Any]:
+@cached("return_policies")
+async def list_return_policies() -> Dict[str, Any]:
     """List all online return policies configured in GMC."""
     client = get_return_policy_client()
     from google.shopping import merchant_accounts_v1beta
     request = merchant_accounts_v1beta.ListOnlineReturnPoliciesRequest(
         parent=account_name()
     )
-    policies = [type(p).to_dict(p) for p in client.list_online_return_policies(request=request)]
+    policies = [
+        message_to_dict(p)
+        async for p in await client.list_online_return_policies(request=request)
+    ]
     return {"returnPolicies": policies, "totalReturned": len(policies)}
 
 
 @mcp.tool()
-def get_return_policy(return_policy_name: str) -> Dict[str, Any]:
+async def get_return_policy(return_policy_name: str) -> Dict[str, Any]:
     """Get details of a single return policy.
 
     Args:
@@ -30,12 +35,13 @@ def get_return_policy(return_policy_name: str) -> Dict[str, Any]:
     client = get_return_policy_client()
     from google.shopping import merchant_accounts_v1beta
     request = merchant_accounts_v1beta.GetOnlineReturnPolicyRequest(name=return_policy_name)
-    policy = client.get_online_return_policy(request=request)
-    return type(policy).to_dict(policy)
+    policy = await client.get_online_return_policy(request=request)
+    return message_to_dict(policy)
 
 
 @mcp.tool()
-def create_return_policy(
+@invalidates("return_policies")
+async def create_return_policy(
     label: str,
     countries: List[str],
     return_window_days: int = 30,
@@ -59,10 +65,6 @@ def create_return_policy(
         return_policy_uri: URL to the return/refund policy page on your store.
         item_conditions: e.g. ['NEW', 'USED']. Defaults to ['NEW'].
     """
-    import requests as http
-    token = _get_credentials_and_token()
-    mid = account_name().split("/")[1]
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     payload: Dict[str, Any] = {
         "label": label,
         "countries": countries,
@@ -78,17 +80,16 @@ def create_return_policy(
     }
     if return_policy_uri:
         payload["returnPolicyUri"] = return_policy_uri
-    r = http.post(
-        f"https://merchantapi.googleapis.com/accounts/v1beta/accounts/{mid}/onlineReturnPolicies",
-        headers=headers,
-        json=payload,
+    return await rest_request(
+        "POST",
+        f"accounts/v1beta/{account_name()}/onlineReturnPolicies",
+        json_body=payload,
     )
-    r.raise_for_status()
-    return r.json()
 
 
 @mcp.tool()
-def delete_return_policy(return_policy_name: str) -> Dict[str, Any]:
+@invalidates("return_policies")
+async def delete_return_policy(return_policy_name: str) -> Dict[str, Any]:
     """Delete a return policy from GMC.
 
     Args:
@@ -99,5 +100,5 @@ def delete_return_policy(return_policy_name: str) -> Dict[str, Any]:
     request = merchant_accounts_v1beta.DeleteOnlineReturnPolicyRequest(
         name=return_policy_name
     )
-    client.delete_online_return_policy(request=request)
+    await client.delete_online_return_policy(request=request)
     return {"deleted": True, "returnPolicyName": return_policy_name}
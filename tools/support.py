@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import hashlib
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from tools._common import mcp, account_name, get_issueresolution_client
+from tools._common import (
+    mcp,
+    account_name,
+    error_key,
+    message_to_dict,
+    run_bounded,
+    summarize_failures,
+    get_issueresolution_client,
+    get_products_client,
+)
+from tools._cache import coalesced
 
 
 @mcp.tool()
-def render_account_issues(language_code: str = "de") -> Dict[str, Any]:
+async def render_account_issues(language_code: str = "de") -> Dict[str, Any]:
     """Get human-readable account issues with actionable fix steps.
 
     This surfaces the same issues as the GMC UI Policy tab, including
@@ -20,15 +33,16 @@ def render_account_issues(language_code: str = "de") -> Dict[str, Any]:
     client = get_issueresolution_client()
     from google.shopping import merchant_issueresolution_v1beta
     request = merchant_issueresolution_v1beta.RenderAccountIssuesRequest(
-        parent=account_name(),
+        name=account_name(),
         language_code=language_code,
     )
-    response = client.render_account_issues(request=request)
-    return type(response).to_dict(response)
+    response = await client.render_account_issues(request=request)
+    return message_to_dict(response)
 
 
 @mcp.tool()
-def render_product_issues(product_name: str, language_code: str = "de") -> Dict[str, Any]:
+@coalesced
+async def render_product_issues(product_name: str, language_code: str = "de") -> Dict[str, Any]:
     """Get human-readable issues for a single product with fix steps.
 
     Args:
@@ -38,15 +52,17 @@ def render_product_issues(product_name: str, language_code: str = "de") -> Dict[
     client = get_issueresolution_client()
     from google.shopping import merchant_issueresolution_v1beta
     request = merchant_issueresolution_v1beta.RenderProductIssuesRequest(
-        parent=product_name,
+        name=product_name,
         language_code=language_code,
     )
-    response = client.render_product_issues(request=request)
-    return type(response).to_dict(response)
+    response = await client.render_product_issues(request=request)
+    issues = _summarize(response)
+    _index(language_code).put(product_name, None, issues, _terms(issues))
+    return message_to_dict(response)
 
 
 @mcp.tool()
-def trigger_issue_action(action_id: str) -> Dict[str, Any]:
+async def trigger_issue_action(action_id: str) -> Dict[str, Any]:
     """Trigger a predefined issue resolution action (e.g. appeal, verification).
 
     ⚠️ This triggers a real action on your GMC account.
@@ -61,5 +77,239 @@ def trigger_issue_action(action_id: str) -> Dict[str, Any]:
         parent=account_name(),
         action=merchant_issueresolution_v1beta.BuiltInUserAction(action_id=action_id),
     )
-    response = client.trigger_action(request=request)
-    return type(response).to_dict(response)
+    response = await client.trigger_action(request=request)
+    return message_to_dict(response)
+
+
+# ---------------------------------------------------------------------------
+# Batch rendering & issue index
+# ---------------------------------------------------------------------------
+
+class _IssueIndex:
+    """Rendered product issues of one account and language, inverted by term.
+
+    Terms are rendered issue titles and item-level issue codes (case-folded).
+    ``terms[term][product]`` holds the region codes the issue applies to.
+    ``products[product]`` keeps the fingerprint the issues were rendered for,
+    so a refresh re-renders only products whose item-level issues changed.
+    """
+
+    def __init__(self) -> None:
+        self.products: Dict[str, Tuple[Optional[str], List[Dict[str, Any]], List[str]]] = {}
+        self.terms: Dict[str, Dict[str, Tuple[str, ...]]] = defaultdict(dict)
+        self.labels: Dict[str, str] = {}  # term -> title / code as rendered
+
+    def put(self, product: str, fingerprint: Optional[str], issues: List[Dict[str, Any]],
+            terms: Iterable[Tuple[str, Tuple[str, ...]]]) -> None:
+        self.drop(product)
+        keys = []
+        for label, regions in terms:
+            key = label.casefold()
+            self.labels.setdefault(key, label)
+            self.terms[key][product] = tuple(sorted({*self.terms[key].get(product, ()), *regions}))
+            keys.append(key)
+        self.products[product] = (fingerprint, issues, keys)
+
+    def drop(self, product: str) -> None:
+        entry = self.products.pop(product, None)
+        if entry is None:
+            return
+        for key in entry[2]:
+            holders = self.terms.get(key)
+            if holders is not None:
+                holders.pop(product, None)
+                if not holders:
+                    del self.terms[key]
+                    self.labels.pop(key, None)
+
+    def fresh(self, product: str, fingerprint: Optional[str]) -> bool:
+        """True when *product* is indexed for *fingerprint* and its issues have not changed since."""
+        entry = self.products.get(product)
+        return entry is not None and fingerprint is not None and entry[0] == fingerprint
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        ranked = sorted(self.terms.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+        return [{"issue": self.labels[k], "products": len(v)} for k, v in ranked[:limit]]
+
+
+_indexes: Dict[Tuple[str, str], _IssueIndex] = {}
+
+
+def _index(language_code: str) -> _IssueIndex:
+    key = (account_name(), language_code)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = _IssueIndex()
+    return index
+
+
+def _summarize(response: Any) -> List[Dict[str, Any]]:
+    """Compact form of a RenderProductIssuesResponse (no prerendered HTML)."""
+    issues = []
+    for issue in response.rendered_issues:
+        impact = issue.impact
+        regions = sorted({r.code for b in impact.breakdowns for r in b.regions if r.code})
+        issues.append({
+            "title": issue.title,
+            "severity": impact.severity.name if impact.severity else None,
+            "message": impact.message or None,
+            "regions": regions,
+        })
+    return issues
+
+
+def _terms(issues: List[Dict[str, Any]]) -> List[Tuple[str, Tuple[str, ...]]]:
+    return [(i["title"], tuple(i["regions"])) for i in issues if i["title"]]
+
+
+def _fingerprint(product: Any) -> str:
+    """Hash of a raw Product's item-level issues; changes when its issues do."""
+    digest = hashlib.blake2b(digest_size=16)
+    for issue in product.product_status.item_level_issues:
+        digest.update(issue.SerializeToString(deterministic=True))
+    return digest.hexdigest()
+
+
+def _codes(product: Any) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Item-level issue codes of a raw Product with the countries they apply to."""
+    return [(i.code, tuple(i.applicable_countries)) for i in product.product_status.item_level_issues if i.code]
+
+
+async def _products_with_issues(page_size: int = 250) -> Dict[str, Tuple[str, List[Tuple[str, Tuple[str, ...]]]]]:
+    """Catalog products that have item-level issues -> (fingerprint, code terms)."""
+    from tools.products import _iter_products
+
+    found = {}
+    async for p in _iter_products(page_size=page_size, raw=True):
+        if p.product_status.item_level_issues:
+            found[p.name] = (_fingerprint(p), _codes(p))
+    return found
+
+
+async def _named_products(
+    names: List[str], concurrency: int, failures: Dict[str, List[str]]
+) -> Dict[str, Tuple[str, List[Tuple[str, Tuple[str, ...]]]]]:
+    """(fingerprint, code terms) of the given products, read with GetProduct.
+
+    Products that cannot be read are recorded in *failures* and left out.
+    """
+    from google.shopping import merchant_products_v1
+    from tools.products import _raw
+
+    client = get_products_client()
+
+    async def fetch(name: str) -> Any:
+        return _raw(await client.get_product(request=merchant_products_v1.GetProductRequest(name=name)))
+
+    found = {}
+    async for name, product, error in run_bounded(names, fetch, concurrency=concurrency):
+        if error is not None:
+            failures[error_key(error)].append(name)
+        else:
+            found[name] = (_fingerprint(product), _codes(product))
+    return {name: found[name] for name in names if name in found}
+
+
+@mcp.tool()
+async def render_product_issues_batch(
+    product_names: Optional[List[str]] = None,
+    language_code: str = "de",
+    concurrency: int = 16,
+    refresh: bool = False,
+    top: int = 20,
+) -> Dict[str, Any]:
+    """Render issues for many products concurrently and index them by issue.
+
+    Without product_names the whole catalog is scanned and every product with
+    item-level issues is rendered; named products are read with GetProduct.
+    On later runs only products whose issues changed are rendered again;
+    after a catalog scan, products that no longer have issues leave the
+    index. Results are kept per product and language and answered from memory
+    by find_products_by_issue.
+
+    Args:
+        product_names: Full product resource names. Defaults to every product
+            with item-level issues.
+        language_code: BCP 47 language code.
+        concurrency: Max render requests in flight.
+        refresh: Re-render every selected product, even when unchanged.
+        top: Return the N issues affecting the most indexed products.
+    """
+    started = time.perf_counter()
+    index = _index(language_code)
+    failures: Dict[str, List[str]] = defaultdict(list)
+    if product_names is None:
+        selected = await _products_with_issues()
+        for gone in [name for name in index.products if name not in selected]:
+            index.drop(gone)
+    else:
+        selected = await _named_products(list(dict.fromkeys(product_names)), concurrency, failures)
+    stale = [name for name, (fp, _) in selected.items() if refresh or not index.fresh(name, fp)]
+
+    async def render(name: str) -> None:
+        await render_product_issues(name, language_code)
+        fingerprint, codes = selected[name]
+        issues = index.products[name][1]
+        index.put(name, fingerprint, issues, [*_terms(issues), *codes])
+
+    unreadable = sum(len(names) for names in failures.values())
+    async for name, _, error in run_bounded(stale, render, concurrency=concurrency):
+        if error is not None:
+            failures[error_key(error)].append(name)
+    failed = sum(len(names) for names in failures.values())
+    return {
+        "languageCode": language_code,
+        "selected": len(selected),
+        "rendered": len(stale) - (failed - unreadable),
+        "reused": len(selected) - len(stale),
+        "failed": failed,
+        "failures": summarize_failures(failures),
+        "indexedProducts": len(index.products),
+        "topIssues": index.top(top),
+        "elapsedSeconds": round(time.perf_counter() - started, 3),
+    }
+
+
+@mcp.tool()
+async def find_products_by_issue(
+    issue: str,
+    country: Optional[str] = None,
+    language_code: str = "de",
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """Products affected by an issue, answered from the render_product_issues_batch index.
+
+    Makes no API calls. Run render_product_issues_batch first (and again to
+    pick up changes).
+
+    Args:
+        issue: Case-insensitive substring of a rendered issue title
+            (e.g. 'missing gtin') or an item-level issue code.
+        country: Only products where the issue applies to this region code, e.g. 'DE'.
+        language_code: Language the issues were rendered in.
+        limit: Max product names returned per matching issue.
+    """
+    index = _index(language_code)
+    needle = issue.casefold()
+    country = country.upper() if country else None
+    matches = []
+    affected = set()
+    for key, holders in index.terms.items():
+        if needle not in key:
+            continue
+        products = sorted(p for p, regions in holders.items() if country is None or country in regions)
+        if products:
+            affected.update(products)
+            matches.append({"issue": index.labels[key], "productCount": len(products),
+                            "products": products[:limit]})
+    matches.sort(key=lambda m: -m["productCount"])
+    result: Dict[str, Any] = {
+        "issue": issue,
+        "country": country,
+        "indexedProducts": len(index.products),
+        "totalProducts": len(affected),
+        "matches": matches,
+    }
+    if not index.products:
+        result["hint"] = "Index is empty; run render_product_issues_batch first."
+    return result